@@ -1,11 +1,92 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 
+from utils.cache import BoundedCache, content_hash
+from utils.decimation import decimate
+from utils.figures import figure_key, render_png
 from utils.i18n import map_display_to_code, load_section  # <-- новый i18n
+from utils.ingestion import iter_table_chunks, upload_bytes
+from utils.temp_humidity import (
+    LoggerAccumulator,
+    normalize_logger_frame,
+    rolling_mkt,
+    rolling_mkt_bins,
+    summarize_bins,
+)
 
 __all__ = ["show"]
 
+# Результаты потокового разбора: ключ = (хэш файла, имя, лимиты).
+# Перезапуск страницы (выбор окна MKT, периода) не перечитывает файл.
+LOGGER_CACHE = BoundedCache(max_entries=8, max_bytes=256 * 1024 * 1024, name="loggers")
+
+
+def _read_logger(uploaded_file, limits, t):
+    """
+    Потоковое чтение выгрузки логгера: части файла сразу идут в
+    LoggerAccumulator, промежуточная статистика показывается по ходу чтения.
+    """
+    data = upload_bytes(uploaded_file)
+    name = getattr(uploaded_file, "name", "")
+    key = (content_hash(data), name.lower().rsplit(".", 1)[-1], tuple(sorted(limits.items())))
+    cached = LOGGER_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    acc = LoggerAccumulator(limits)
+    progress = st.empty()
+    for chunk in iter_table_chunks(data, name=name):
+        try:
+            acc.update(normalize_logger_frame(chunk))
+        except ValueError:
+            if not acc.unsorted:
+                raise
+            progress.empty()
+            raise ValueError(t["streaming"]["unsorted_too_large"].format(rows=acc.keep_rows)) from None
+        temp = acc.current_stats()["temperature"]
+        progress.info(
+            f"{t['streaming']['rows_read']}: {acc.rows:,} — "
+            f"{t['statistics']['mean']} {temp['mean']:.2f} °C, "
+            f"{t['statistics']['min']} {temp['min']:.2f}, {t['statistics']['max']} {temp['max']:.2f}"
+        )
+    progress.empty()
+    result = acc.finish()
+    LOGGER_CACHE.put(key, result)
+    return result
+
+
+def _localize(frame, t):
+    """
+    Таблицы результатов — с переведёнными заголовками и значениями
+    (parameter: temperature/humidity, limit: lower/upper; столбцы вида
+    temperature_mean — «Температура: среднее»).
+    """
+    tb = t["tables"]
+    names = {"temperature": t["thresholds"]["temperature"], "humidity": t["thresholds"]["humidity"]}
+    out = frame.copy()
+    if "parameter" in out:
+        out["parameter"] = out["parameter"].map(names).fillna(out["parameter"])
+    if "limit" in out:
+        out["limit"] = out["limit"].map(tb["sides"]).fillna(out["limit"])
+    columns = {}
+    for col in out.columns:
+        param, _, stat = str(col).partition("_")
+        if col in names:
+            columns[col] = names[col]
+        elif isinstance(tb.get(col), str):
+            columns[col] = tb[col]
+        elif param in names and isinstance(tb.get(stat), str):
+            columns[col] = f"{names[param]}: {tb[stat]}"
+    return out.rename(columns=columns)
+
+
+def _write_stats(stats, unit, t):
+    st.write(f"- **{t['statistics']['mean']} ({unit})**: {stats['mean']:.2f}")
+    st.write(f"- **{t['statistics']['min']} ({unit})**: {stats['min']:.2f}")
+    st.write(f"- **{t['statistics']['max']} ({unit})**: {stats['max']:.2f}")
+    rsd = stats["rsd"]
+    st.write(f"- **{t['statistics']['rsd']} (%)**: {rsd:.2f}" if rsd is not None else f"- **{t['statistics']['rsd']} (%)**: —")
+
+
 def show(language_display: str) -> None:
     """
     Страница анализа температуры и влажности.
@@ -30,97 +111,123 @@ def show(language_display: str) -> None:
     hum_lower = st.slider(t["settings"]["hum_lower"], min_value=0, max_value=100, value=55)
     hum_upper = st.slider(t["settings"]["hum_upper"], min_value=0, max_value=100, value=65)
 
+    limits = {
+        "temperature": (temp_lower, temp_upper),
+        "humidity": (hum_lower, hum_upper),
+    }
+
     # Загрузка файла
-    uploaded_file = st.file_uploader(t["file_handling"]["choose_file"], type=["xlsx", "xls"])
+    uploaded_file = st.file_uploader(t["file_handling"]["choose_file"], type=["xlsx", "xls", "csv"])
 
     if uploaded_file is None:
         st.info(t["file_handling"]["no_file_uploaded"])
         return
 
     try:
-        # Чтение и приведение столбцов
-        df = pd.read_excel(uploaded_file, header=None, skiprows=1)
-        df.columns = ["time", "temperature", "humidity"]
-
-        df["time"] = pd.to_datetime(df["time"], errors="coerce")
-        df.dropna(subset=["time"], inplace=True)
-        df["temperature"] = pd.to_numeric(df["temperature"], errors="coerce")
-        df["humidity"] = pd.to_numeric(df["humidity"], errors="coerce")
-        df.dropna(subset=["temperature", "humidity"], how="any", inplace=True)
+        result = _read_logger(uploaded_file, limits, t)
+        if result["rows"] == 0:
+            st.info(t["file_handling"]["no_file_uploaded"])
+            return
+        df = result["frame"]           # None для больших файлов — тогда работаем по почасовым суммам
+        bins = result["bins"]
 
         # Превью данных
         st.subheader(t["file_handling"]["data_preview"])
-        st.dataframe(df.head(10))
+        st.dataframe(_localize(result["preview"], t))
+        st.caption(f"{t['streaming']['rows_read']}: {result['rows']:,}")
+        if result["unsorted"]:
+            st.warning(t["streaming"]["unsorted"])
 
-        # --------- Статистика: температура ---------
+        # --------- Статистика ---------
         st.subheader(t["statistics"]["temp_stats"])
-        mean_temp = df["temperature"].mean()
-        min_temp  = df["temperature"].min()
-        max_temp  = df["temperature"].max()
-        std_temp  = df["temperature"].std()
-        rsd_temp  = (std_temp / mean_temp * 100) if mean_temp else None
-
-        st.write(f"- **{t['statistics']['mean']} (°C)**: {mean_temp:.2f}")
-        st.write(f"- **{t['statistics']['min']} (°C)**: {min_temp:.2f}")
-        st.write(f"- **{t['statistics']['max']} (°C)**: {max_temp:.2f}")
-        st.write(f"- **{t['statistics']['rsd']} (%)**: {rsd_temp:.2f}" if rsd_temp is not None else f"- **{t['statistics']['rsd']} (%)**: —")
-
-        # --------- Статистика: влажность ---------
+        _write_stats(result["stats"]["temperature"], "°C", t)
         st.subheader(t["statistics"]["hum_stats"])
-        mean_hum = df["humidity"].mean()
-        min_hum  = df["humidity"].min()
-        max_hum  = df["humidity"].max()
-        std_hum  = df["humidity"].std()
-        rsd_hum  = (std_hum / mean_hum * 100) if mean_hum else None
-
-        st.write(f"- **{t['statistics']['mean']} (%)**: {mean_hum:.2f}")
-        st.write(f"- **{t['statistics']['min']} (%)**: {min_hum:.2f}")
-        st.write(f"- **{t['statistics']['max']} (%)**: {max_hum:.2f}")
-        st.write(f"- **{t['statistics']['rsd']} (%)**: {rsd_hum:.2f}" if rsd_hum is not None else f"- **{t['statistics']['rsd']} (%)**: —")
+        _write_stats(result["stats"]["humidity"], "%", t)
 
         # --------- Точки пересечения порогов ---------
-        threshold_crossings = []
-        for i in range(1, len(df)):
-            prev_temp = df["temperature"].iloc[i-1]
-            curr_temp = df["temperature"].iloc[i]
-            prev_hum  = df["humidity"].iloc[i-1]
-            curr_hum  = df["humidity"].iloc[i]
-
-            crossed = (
-                (prev_temp < temp_lower <= curr_temp) or (prev_temp >= temp_lower > curr_temp) or
-                (prev_temp < temp_upper <= curr_temp) or (prev_temp >  temp_upper >= curr_temp) or
-                (prev_hum  < hum_lower  <= curr_hum)  or (prev_hum  >= hum_lower  > curr_hum)  or
-                (prev_hum  < hum_upper  <= curr_hum)  or (prev_hum  >  hum_upper  >= curr_hum)
-            )
-            if crossed:
-                threshold_crossings.append({
-                    "time": df["time"].iloc[i],
-                    "temperature": curr_temp,
-                    "humidity": curr_hum,
-                })
-
+        crossings_df = result["crossings"]
         st.subheader(t["thresholds"]["crossings"])
-        if threshold_crossings:
-            st.dataframe(pd.DataFrame(threshold_crossings))
+        if not crossings_df.empty:
+            st.dataframe(_localize(crossings_df, t))
+            if result["crossing_count"] > len(crossings_df):
+                st.caption(t["streaming"]["truncated"].format(shown=len(crossings_df), total=result["crossing_count"]))
         else:
             st.write(t["thresholds"]["no_crossings"])
 
+        # --------- События выхода за лимиты ---------
+        events_df = result["events"]
+        if not events_df.empty:
+            st.subheader(t["thresholds"]["events"])
+            st.dataframe(_localize(events_df, t))
+            if result["event_count"] > len(events_df):
+                st.caption(t["streaming"]["truncated"].format(shown=len(events_df), total=result["event_count"]))
+
+        # --------- GDP: MKT, время вне диапазона, агрегаты ---------
+        gdp = t["gdp"]
+        st.subheader(gdp["header"])
+        mkt = result["mkt"]
+        window = st.selectbox(gdp["rolling_window"], list(gdp["windows"]), index=2,
+                              format_func=lambda w: gdp["windows"][w])
+        mkt_rolling = rolling_mkt(df, window) if df is not None else rolling_mkt_bins(bins, window)
+        st.write(
+            f"- **{gdp['mkt_total']}**: {mkt:.2f}  \n"
+            f"- **{gdp['rolling_max']}**: {mkt_rolling.max():.2f}"
+        )
+        st.caption(gdp["mkt_note"])
+
+        st.write(f"**{gdp['time_out']}**")
+        st.dataframe(_localize(result["time_out_of_range"], t))
+
+        freq = st.radio(gdp["aggregation"], list(gdp["periods"]), horizontal=True,
+                        format_func=lambda p: gdp["periods"][p])
+        st.write(f"**{gdp['period_table']}**")
+        st.dataframe(_localize(summarize_bins(bins, limits, freq=freq).round(2), t))
+
+        def draw_mkt():
+            import matplotlib.pyplot as plt
+
+            fig, ax = plt.subplots(figsize=(10, 3))
+            ax.plot(*decimate(mkt_rolling.index, mkt_rolling.to_numpy()), color="darkred", label=gdp["rolling_title"])
+            ax.axhline(y=temp_upper, color="red", linestyle="--", label=t["plot"]["temp_upper_limit"])
+            ax.set_xlabel(t["plot"]["x_label"])
+            ax.set_ylabel("°C")
+            ax.set_title(f"{gdp['rolling_title']} ({gdp['windows'][window]})")
+            ax.legend()
+            ax.grid(True)
+            return fig
+
+        key = figure_key("temp_humidity_mkt", mkt_rolling, window, temp_upper, lang)
+        st.image(render_png(key, draw_mkt), use_container_width=True)
+
         # --------- График ---------
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.plot(df["time"], df["temperature"], label=t["plot"]["temp"], color="red")
-        ax.plot(df["time"], df["humidity"],    label=t["plot"]["hum"],  color="blue")
-
-        ax.axhline(y=temp_lower, color="red",  linestyle="--", label=t["plot"]["temp_lower_limit"])
-        ax.axhline(y=temp_upper, color="red",  linestyle="--", label=t["plot"]["temp_upper_limit"])
-        ax.axhline(y=hum_lower,  color="blue", linestyle="--", label=t["plot"]["hum_lower_limit"])
-        ax.axhline(y=hum_upper,  color="blue", linestyle="--", label=t["plot"]["hum_upper_limit"])
-
-        ax.set_xlabel(t["plot"]["x_label"])
-        ax.set_ylabel(t["plot"]["y_label"])
-        ax.set_title(t["plot"]["title"])
-        ax.legend()
-        ax.grid(True)
-        st.pyplot(fig)
+        def draw():
+            import matplotlib.pyplot as plt
+
+            fig, ax = plt.subplots(figsize=(10, 5))
+            if df is not None:
+                ax.plot(*decimate(df["time"], df["temperature"]), label=t["plot"]["temp"], color="red")
+                ax.plot(*decimate(df["time"], df["humidity"]),    label=t["plot"]["hum"],  color="blue")
+            else:
+                # Большой файл: почасовое среднее и полоса min–max
+                hourly = summarize_bins(bins, limits, freq="h")
+                for col, color, label in (("temperature", "red", t["plot"]["temp"]), ("humidity", "blue", t["plot"]["hum"])):
+                    ax.fill_between(hourly["period"], hourly[f"{col}_min"], hourly[f"{col}_max"], color=color, alpha=0.2)
+                    ax.plot(hourly["period"], hourly[f"{col}_mean"], label=label, color=color)
+
+            ax.axhline(y=temp_lower, color="red",  linestyle="--", label=t["plot"]["temp_lower_limit"])
+            ax.axhline(y=temp_upper, color="red",  linestyle="--", label=t["plot"]["temp_upper_limit"])
+            ax.axhline(y=hum_lower,  color="blue", linestyle="--", label=t["plot"]["hum_lower_limit"])
+            ax.axhline(y=hum_upper,  color="blue", linestyle="--", label=t["plot"]["hum_upper_limit"])
+
+            ax.set_xlabel(t["plot"]["x_label"])
+            ax.set_ylabel(t["plot"]["y_label"])
+            ax.set_title(t["plot"]["title"])
+            ax.legend()
+            ax.grid(True)
+            return fig
+
+        key = figure_key("temp_humidity", df if df is not None else bins, limits, lang)
+        st.image(render_png(key, draw), use_container_width=True)
 
     except Exception as e:
         st.error(f"{t['file_handling']['error_processing_file']}: {e}")
@@ -1,9 +1,10 @@
 # AppPages/BoxPlot.py
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from utils.data_processing import calculate_descriptive_stats
+from utils.figures import figure_key, render_png
+from utils.ingestion import read_excel_cached
 from utils.i18n import map_display_to_code, load_section  # <-- новый i18n
 
 __all__ = ["show"]
@@ -34,7 +35,7 @@ def show(language_display: str) -> None:
         return
 
     try:
-        df = pd.read_excel(uploaded_file).convert_dtypes()
+        df = read_excel_cached(uploaded_file).convert_dtypes()
 
         st.write(f"**{t['file_handling']['data_preview']}**")
         st.dataframe(df.head())
@@ -59,12 +60,18 @@ def show(language_display: str) -> None:
 
         # --- Построение BoxPlot ---
         st.subheader(t["title"])
-        fig, ax = plt.subplots(figsize=(10, 6))
-        cleaned.boxplot(ax=ax)
-        ax.set_title(t["plot"]["title"])
-        ax.set_ylabel(t["plot"]["y_label"])
-        ax.grid(True)
-        st.pyplot(fig)
+        def draw():
+            import matplotlib.pyplot as plt
+
+            fig, ax = plt.subplots(figsize=(10, 6))
+            cleaned.boxplot(ax=ax)
+            ax.set_title(t["plot"]["title"])
+            ax.set_ylabel(t["plot"]["y_label"])
+            ax.grid(True)
+            return fig
+
+        png = render_png(figure_key("boxplot", cleaned, t["plot"]["title"], t["plot"]["y_label"]), draw)
+        st.image(png, use_container_width=True)
 
         # --- Статистика описательная ---
         st.subheader(t["statistics"]["title"])
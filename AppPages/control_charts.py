@@ -1,19 +1,247 @@
 # AppPages/control_charts.py
+import os
+
+import numpy as np
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-
-# Импорт классов ImRControlChart и правил SPC
-from SPC import ImRControlChart, Rule01, Rule02, Rule03, Rule04, Rule05, Rule06, Rule07, Rule08
 
 # Новый i18n-лоадер
+from utils.figures import figure_key, render_png
 from utils.i18n import map_display_to_code, load_section
+from utils.ingestion import read_excel_cached
+from utils.memo import cached_call
+from utils.spc import (
+    compute_imr,
+    compute_imr_columns,
+    compute_cusum,
+    compute_ewma,
+    compute_xbar,
+    imr_summary_table,
+    numeric_columns,
+    plot_cusum,
+    plot_ewma,
+    plot_imr,
+    plot_xbar,
+)
+from utils.spc.ewma import mr_sigma
+from utils.spc.monitor import ImRMonitor, find_monitor, monitor_path
 
 __all__ = ["show"]
 
+# Порядок типов карт в переключателе (каталог переводов хранит ключи отсортированными)
+CHART_TYPES = ("imr", "xbar_r", "xbar_s", "ewma", "cusum")
+
+
+def _chart_labels(t):
+    return (
+        t["chart_labels"]["observation"],
+        t["chart_labels"]["individual_values"],
+        t["chart_labels"]["moving_range"],
+    )
+
+
+def _imr_png(chart, labels):
+    """PNG карты I-MR из кэша (тот же ключ, что и в режиме одного столбца)."""
+    return render_png(
+        figure_key("imr", chart.values, labels),
+        lambda: plot_imr(chart, xlabel=labels[0], ylabel_top=labels[1], ylabel_bottom=labels[2]),
+    )
+
+
+def _show_all_columns(df: pd.DataFrame, t) -> None:
+    """
+    Режим «все столбцы»: I-MR по каждому числовому столбцу (параллельно),
+    сводная таблица стабильности и графики только для открытых столбцов.
+    """
+    ar, ac = t["analysis_results"], t["all_columns"]
+    id_col = t["chart_labels"]["time_series"]
+    charts = cached_call(compute_imr_columns, df, numeric_columns(df[df.columns[1:]]))
+    if not charts:
+        st.error(ac["no_numeric_columns"])
+        return
+
+    table = imr_summary_table(charts)
+    st.subheader(ac["summary_header"])
+    st.write(f"{ac['unstable_count']}: **{int((~table['stable']).sum())} / {len(table)}**")
+    unstable = ~table["stable"].to_numpy()
+    display = table.rename(columns={
+        "column": ac["column"],
+        "stable": ac["stable"],
+        "MR": ac["mr_violations"],
+        **{f"rule_{r}": f"R{r}" for r in range(1, 9)},
+    })
+    st.dataframe(
+        display.style.apply(
+            lambda row: ["background-color: #f8d7da" if unstable[row.name] else ""] * len(row), axis=1
+        ).format(precision=4),
+        hide_index=True,
+    )
+    st.caption(ac["rules_legend"] + ": " + "; ".join(f"R{r} — {name}" for r, name in ar["rule_names"].items()))
+
+    # Графики рисуются только для выбранных столбцов
+    opened = st.multiselect(ac["drilldown"], list(charts), help=ac["drilldown_help"])
+    labels = _chart_labels(t)
+    for col in opened:
+        chart = charts[col]
+        ids = df.loc[pd.to_numeric(df[col], errors="coerce").notna(), id_col].astype(str).tolist()
+        with st.expander(str(col), expanded=True):
+            st.image(_imr_png(chart, labels), use_container_width=True)
+            if chart.rules.any():
+                violations_df = chart.rules.to_frame(labels=ids)
+                violations_df.insert(1, t["chart_labels"]["values"], chart.values[chart.rules.indices()])
+                violations_df.columns = [id_col, t["chart_labels"]["values"], ar["rules_fired"]]
+                st.dataframe(violations_df, hide_index=True)
+            else:
+                st.write(ar["no_violations"])
+            st.write(f"{ar['process_stable']} **{chart.stable()}**")
+
+
+def _show_subgroup_chart(df: pd.DataFrame, t, kind: str) -> None:
+    """
+    Карта X̄-R / X̄-S: значения в длинном формате (одна строка — одно измерение),
+    подгруппа задаётся столбцом-меткой (момент отбора) или фиксированным размером.
+    """
+    sg = t["subgroups"]
+    # Первый столбец — метка времени/ID, он же по умолчанию столбец подгруппы
+    value_column = st.selectbox(sg["value_column"], numeric_columns(df[df.columns[1:]]) or list(df.columns[1:]))
+    by_size = st.checkbox(sg["by_size"], value=False, help=sg["by_size_help"])
+    if by_size:
+        size = int(st.number_input(sg["subgroup_size"], min_value=2, max_value=25, value=5))
+        subgroups = None
+    else:
+        subgroup_column = st.selectbox(
+            sg["subgroup_column"], [c for c in df.columns if c != value_column], help=sg["subgroup_column_help"]
+        )
+        size = None
+        subgroups = df[subgroup_column].astype(str).to_numpy()
+
+    values = pd.to_numeric(df[value_column], errors="coerce").to_numpy(dtype=float)
+    try:
+        chart = cached_call(compute_xbar, values, subgroups, size=size, kind=kind)
+    except ValueError:
+        st.error(sg["error_subgroups"])
+        return
+
+    spread_label = sg["range"] if kind == "R" else sg["std"]
+    st.write(
+        f"{sg['subgroups_count']}: **{chart.k}**, {sg['sizes']}: **{chart.stats.size.min()}–{chart.stats.size.max()}**"
+    )
+    if not chart.equal_sizes:
+        st.caption(sg["unequal_sizes"])
+
+    st.image(
+        render_png(
+            figure_key("xbar", values, subgroups, size, kind, spread_label, sg["subgroup"]),
+            lambda: plot_xbar(chart, xlabel=sg["subgroup"], ylabel_top=sg["mean"], ylabel_bottom=spread_label),
+        ),
+        use_container_width=True,
+    )
+
+    constants = chart.constants()
+    summary = {
+        "X̄ (CL)": chart.center,
+        "σ̂": chart.sigma,
+        "UCL": chart.x_ucl.max(),
+        "LCL": chart.x_lcl.min(),
+        f"{kind} (CL)": chart.spread_cl.mean(),
+        f"UCL ({kind})": chart.spread_ucl.max(),
+    }
+    if constants is not None:
+        summary.update(constants.to_dict())
+    st.write(f"**{sg['limits']}**")
+    st.dataframe(pd.DataFrame([summary]).round(4), hide_index=True)
+
+    ar = t["analysis_results"]
+    st.subheader(ar["violations_header"])
+    flagged = chart.rules.points() | chart.spread_violations
+    if flagged.any():
+        table = chart.data(0).rename(columns={"value": sg["mean"]})
+        table.insert(3, spread_label, chart.spread)
+        table[ar["rules_fired"]] = [
+            ", ".join([str(r) for r in chart.rules.fired(i)] + ([kind] if chart.spread_violations[i] else []))
+            for i in range(chart.k)
+        ]
+        st.dataframe(table.loc[flagged].rename(columns={"subgroup": sg["subgroup"]}), hide_index=True)
+    else:
+        st.write(ar["no_violations"])
+
+    st.write("---")
+    st.write(f"{ar['process_stable']} **{chart.stable()}**")
+
+
+def _target_sigma(values, sh):
+    """Целевое значение и σ: по умолчанию среднее и MR̄/d2 по данным, можно задать вручную."""
+    col_t, col_s = st.columns(2)
+    with col_t:
+        target = st.number_input(sh["target"], value=float(values.mean()), format="%.6g", help=sh["target_help"])
+    with col_s:
+        sigma = st.number_input(sh["sigma"], min_value=0.0, value=mr_sigma(values),
+                                format="%.6g", help=sh["sigma_help"])
+    return target, (sigma or None)
+
+
+def _signals_table(ids, values, flagged, t, extra=None) -> None:
+    ar, cl = t["analysis_results"], t["chart_labels"]
+    st.subheader(ar["violations_header"])
+    if not flagged.any():
+        st.write(ar["no_violations"])
+        return
+    idx = np.flatnonzero(flagged)
+    table = pd.DataFrame({cl["time_series"]: np.asarray(ids, dtype=object)[idx], cl["values"]: values[idx]})
+    for name, col in (extra or {}).items():
+        table[name] = col[idx]
+    st.write(f"{t['small_shift']['signals_count']}: **{idx.size}**")
+    st.dataframe(table, hide_index=True)
+
+
+def _show_ewma(values, ids, t) -> None:
+    """Карта EWMA: λ, L, целевое значение и σ настраиваются."""
+    sh = t["small_shift"]
+    col_l, col_w = st.columns(2)
+    with col_l:
+        lam = st.slider(sh["lambda"], min_value=0.05, max_value=1.0, value=0.2, step=0.05, help=sh["lambda_help"])
+    with col_w:
+        width = st.number_input(sh["L"], min_value=1.0, max_value=4.0, value=3.0, step=0.1, help=sh["L_help"])
+    target, sigma = _target_sigma(values, sh)
+    chart = cached_call(compute_ewma, values, lam, width, target, sigma)
+
+    labels = _chart_labels(t)
+    st.image(render_png(
+        figure_key("ewma", values, lam, width, target, sigma, labels),
+        lambda: plot_ewma(chart, xlabel=labels[0], ylabel=sh["ewma"]),
+    ), use_container_width=True)
+    st.write(f"σ = **{chart.sigma:.4g}**, UCL/LCL (∞) = **{chart.ucl[-1]:.4g} / {chart.lcl[-1]:.4g}**")
+    _signals_table(ids, values, chart.signals, t, {sh["ewma"]: chart.ewma, "UCL": chart.ucl, "LCL": chart.lcl})
+    st.write("---")
+    st.write(f"{t['analysis_results']['process_stable']} **{chart.stable()}**")
+
+
+def _show_cusum(values, ids, t) -> None:
+    """Табличный CUSUM: k, h (в σ), целевое значение и σ настраиваются."""
+    sh = t["small_shift"]
+    col_k, col_h = st.columns(2)
+    with col_k:
+        k = st.number_input(sh["k"], min_value=0.0, max_value=3.0, value=0.5, step=0.1, help=sh["k_help"])
+    with col_h:
+        h = st.number_input(sh["h"], min_value=0.5, max_value=10.0, value=5.0, step=0.5, help=sh["h_help"])
+    target, sigma = _target_sigma(values, sh)
+    chart = cached_call(compute_cusum, values, k, h, target, sigma)
+
+    labels = _chart_labels(t)
+    st.image(render_png(
+        figure_key("cusum", values, k, h, target, sigma, labels),
+        lambda: plot_cusum(chart, xlabel=labels[0], ylabel=sh["cusum"]),
+    ), use_container_width=True)
+    st.write(f"σ = **{chart.sigma:.4g}**, K = **{chart.K:.4g}**, H = **{chart.H:.4g}**")
+    _signals_table(ids, values, chart.signals, t,
+                   {"C+": chart.upper, "C-": chart.lower, sh["shift_estimate"]: chart.shift_estimate()})
+    st.write("---")
+    st.write(f"{t['analysis_results']['process_stable']} **{chart.stable()}**")
+
+
 def show(language_display: str) -> None:
     """
-    Страница контрольных карт (I-MR).
+    Страница контрольных карт (I-MR, X̄-R, X̄-S, EWMA, CUSUM).
     language_display: "Polski" | "English" | "Русский" (из селектора в app.py)
     """
     lang = map_display_to_code(language_display)       # "pl" | "en" | "ru"
@@ -38,7 +266,7 @@ def show(language_display: str) -> None:
         return
 
     try:
-        df = pd.read_excel(uploaded_file)
+        df = read_excel_cached(uploaded_file)
 
         col_count = df.shape[1]
         if col_count < 2:
@@ -48,7 +276,19 @@ def show(language_display: str) -> None:
         # Переименуем первую колонку в "ось времени"/идентификатор наблюдений
         df.rename(columns={df.columns[0]: t["chart_labels"]["time_series"]}, inplace=True)
 
-        # Если колонок > 2 — даём выбрать столбец с данными
+        # Тип карты: I-MR по отдельным значениям или X̄-R / X̄-S по подгруппам
+        chart_type = st.radio(t["subgroups"]["chart_type"], CHART_TYPES,
+                              format_func=t["subgroups"]["chart_types"].get, horizontal=True)
+        if chart_type in ("xbar_r", "xbar_s"):
+            _show_subgroup_chart(df, t, "R" if chart_type == "xbar_r" else "S")
+            return
+
+        # Если колонок > 2 — можно построить карты I-MR сразу по всем столбцам
+        if chart_type == "imr" and col_count > 2 and st.checkbox(t["all_columns"]["toggle"], value=False):
+            _show_all_columns(df, t)
+            return
+
+        # ... или выбрать один столбец с данными
         if col_count > 2:
             result_column = st.selectbox(
                 t["file_handling"]["select_result_column"],
@@ -76,50 +316,121 @@ def show(language_display: str) -> None:
             st.error(t["file_handling"]["error_no_numeric_data"])
             return
 
-        # Данные для I-MR
-        data_array = df[t["chart_labels"]["values"]].to_numpy().reshape(-1, 1)
-
-        chart = ImRControlChart(
-            data=data_array,
-            xlabel=t["chart_labels"]["observation"],
-            ylabel_top=t["chart_labels"]["individual_values"],
-            ylabel_bottom=t["chart_labels"]["moving_range"]
-        )
+        # Данные для карты
+        data_array = df[t["chart_labels"]["values"]].to_numpy(dtype=float)
+        ids = df[t["chart_labels"]["time_series"]].tolist()
+        if chart_type == "ewma":
+            _show_ewma(data_array, ids, t)
+            return
+        if chart_type == "cusum":
+            _show_cusum(data_array, ids, t)
+            return
 
-        # Линии пределов и правила Вестингауза
-        chart.limits = True
-        chart.append_rules([
-            Rule01(), Rule02(), Rule03(), Rule04(),
-            Rule05(), Rule06(), Rule07(), Rule08()
-        ])
+        # Пределы, скользящие размахи и правила считаются один раз (и кэшируются между перезапусками)
+        chart = cached_call(compute_imr, data_array)
 
         # Проверка нормальности индивидуальных значений
-        normally_distributed = chart.normally_distributed(
-            data=chart.value_I, significance_level=0.05
-        )
+        normally_distributed = chart.normally_distributed(significance_level=0.05)
         st.write(f"{t['analysis_results']['normal_distribution_check']} **{normally_distributed}**")
 
-        # Рендер графика
-        chart.plot()
-        fig = plt.gcf()
-        st.pyplot(fig)
+        # Рендер графика (PNG из кэша; фигура закрывается сразу после сохранения)
+        st.image(_imr_png(chart, _chart_labels(t)), use_container_width=True)
 
         # Таблички CL/UCL/LCL по желанию
         show_I_data = st.checkbox(t["analysis_results"]["show_I_chart"], value=True)
         show_MR_data = st.checkbox(t["analysis_results"]["show_MR_chart"], value=True)
 
+        flagged = chart.rules.points()
+
         if show_I_data:
             df_I = chart.data(0)
             st.write(f"**{t['analysis_results']['I_chart_data']}** (CL, UCL, LCL):")
-            st.dataframe(df_I[["CL", "UCL", "LCL"]].reset_index(drop=True))
+            table_I = df_I[["CL", "UCL", "LCL"]].reset_index(drop=True)
+            if flagged.any():
+                # Подсветка строк, на которых сработало хотя бы одно правило
+                table_I = table_I.style.apply(
+                    lambda row: ["background-color: #f8d7da" if flagged[row.name] else ""] * len(row),
+                    axis=1
+                )
+            st.dataframe(table_I)
 
         if show_MR_data:
             df_MR = chart.data(1)
             st.write(f"**{t['analysis_results']['MR_chart_data']}** (CL, UCL, LCL):")
             st.dataframe(df_MR[["CL", "UCL", "LCL"]].reset_index(drop=True))
 
+        # Нарушения правил: сводка по правилам и список точек
+        ar = t["analysis_results"]
+        st.subheader(ar["violations_header"])
+        if chart.rules.any():
+            counts = chart.rules.counts()
+            st.write(f"**{ar['violations_per_rule']}**")
+            st.dataframe(pd.DataFrame({
+                ar["rule"]: [f"{r}. {ar['rule_names'][str(r)]}" for r in counts],
+                ar["count"]: list(counts.values()),
+            }), hide_index=True)
+
+            violations_df = chart.rules.to_frame(labels=df[t["chart_labels"]["time_series"]].tolist())
+            violations_df.insert(1, t["chart_labels"]["values"], chart.values[chart.rules.indices()])
+            violations_df.columns = [t["chart_labels"]["time_series"], t["chart_labels"]["values"], ar["rules_fired"]]
+            st.dataframe(violations_df, hide_index=True)
+        else:
+            st.write(ar["no_violations"])
+
         st.write("---")
         st.write(f"{t['analysis_results']['process_stable']} **{chart.stable()}**")
 
+        # Мониторинг: пределы заморожены, проверяются только дописанные строки
+        mt = ar["monitor"]
+        with st.expander(mt["header"]):
+            st.caption(mt["help"])
+            # Состояние ищется по содержимому (столбец + хэш базового периода), а не по имени файла;
+            # точки дописываются только при новой базе или изменившемся ряде, не на каждый перезапуск
+            values = chart.values
+            state_path = find_monitor(values, result_column)
+            monitor = ImRMonitor.load(state_path) if state_path else None
+            if monitor is not None and not monitor.matches(values):
+                st.warning(mt["state_mismatch"])
+                monitor = None
+
+            if monitor is None:
+                baseline_n = st.number_input(
+                    mt["baseline_points"], min_value=2, max_value=len(values), value=len(values)
+                )
+                if st.button(mt["start"]):
+                    monitor = ImRMonitor.from_baseline(values[:baseline_n])
+                    state_path = monitor_path(result_column, monitor.baseline_hash)
+                    monitor.ingest(values)
+                    monitor.save(state_path)
+            elif monitor.ingest(values):
+                monitor.save(state_path)
+
+            if monitor is not None:
+                labels = df[t["chart_labels"]["time_series"]].tolist()
+
+                def _alarm_frame(alarms):
+                    return pd.DataFrame({
+                        t["chart_labels"]["time_series"]: [labels[a["index"]] for a in alarms],
+                        t["chart_labels"]["values"]: [a["value"] for a in alarms],
+                        ar["rules_fired"]: [", ".join(a["rules"]) for a in alarms],
+                    })
+
+                st.write(
+                    f"**{mt['frozen_limits']}:** CL={monitor.cl:.4g}, UCL={monitor.i_ucl:.4g}, "
+                    f"LCL={monitor.i_lcl:.4g}, UCL(MR)={monitor.mr_ucl:.4g}  \n"
+                    f"**{mt['points_monitored']}:** {monitor.n}"
+                )
+                st.write(f"**{mt['new_alarms']}**")
+                if monitor.new_alarms:
+                    st.dataframe(_alarm_frame(monitor.new_alarms), hide_index=True)
+                else:
+                    st.write(mt["no_new_alarms"])
+                if monitor.alarms:
+                    st.write(f"**{mt['alarm_history']}**")
+                    st.dataframe(_alarm_frame(monitor.alarms), hide_index=True)
+                if st.button(mt["reset"]):
+                    os.remove(state_path)
+                    st.rerun()
+
     except Exception as e:
         st.error(f"{t['file_handling']['error_processing_file']}: {e}")
@@ -1,9 +1,10 @@
 # AppPages/descriptive_statistics.py
 import streamlit as st
 import pandas as pd
-from scipy.stats import shapiro, skew, kurtosis
 
-from utils.data_processing import calculate_descriptive_stats
+from utils.data_processing import DESCRIBE_ROWS, describe_batch, shapiro_pvalues
+from utils.ingestion import read_excel_cached
+from utils.memo import cached_call
 from utils.i18n import map_display_to_code, load_section  # новый i18n
 
 __all__ = ["show"]
@@ -33,7 +34,7 @@ def show(language_display: str) -> None:
         return
 
     try:
-        df = pd.read_excel(uploaded_file).convert_dtypes()
+        df = read_excel_cached(uploaded_file).convert_dtypes()
 
         # Предпросмотр
         show_data = st.checkbox(t["file_handling"]["show_data_preview"], value=True)
@@ -74,51 +75,22 @@ def show(language_display: str) -> None:
                 index=2
             )
 
-        # Базовая описательная статистика
+        # Вся описательная статистика одним векторным проходом по матрице столбцов
         st.subheader(t["title"])
-        base_stats = calculate_descriptive_stats(cleaned[numeric_selected])
-        # Приводим к единому формату индекса (строки-метрики)
-        base_stats = base_stats.copy()
-
-        # Дополнительные метрики: Shapiro p-value, Skewness, Kurtosis
-        add_rows = {
-            t["statistics"]["skewness"]: [],
-            t["statistics"]["kurtosis"]: [],
-            t["statistics"].get("shapiro_pvalue", "Shapiro p-value"): []
-        }
-
-        for col in numeric_selected:
-            series = cleaned[col].dropna()
-            # безопасные вычисления — пустые/константные выборки пропускаем
-            if len(series) < 3 or series.nunique(dropna=True) < 2:
-                # NaN/прочерк для невозможных расчётов
-                add_rows[t["statistics"]["skewness"]].append(float("nan"))
-                add_rows[t["statistics"]["kurtosis"]].append(float("nan"))
-                add_rows[t["statistics"].get("shapiro_pvalue", "Shapiro p-value")].append(float("nan"))
-                continue
-
-            try:
-                p_shapiro = shapiro(series).pvalue
-            except Exception:
-                p_shapiro = float("nan")
-
-            try:
-                s = skew(series)
-            except Exception:
-                s = float("nan")
-
-            try:
-                k = kurtosis(series)
-            except Exception:
-                k = float("nan")
-
-            add_rows[t["statistics"]["skewness"]].append(round(s, round_digits) if pd.notna(s) else float("nan"))
-            add_rows[t["statistics"]["kurtosis"]].append(round(k, round_digits) if pd.notna(k) else float("nan"))
-            add_rows[t["statistics"].get("shapiro_pvalue", "Shapiro p-value")].append(
-                round(p_shapiro, 4) if pd.notna(p_shapiro) else float("nan")
-            )
-
-        add_df = pd.DataFrame(add_rows, index=numeric_selected).T
+        batch_stats = cached_call(describe_batch, cleaned[numeric_selected])
+        base_stats = batch_stats.loc[DESCRIBE_ROWS].round(2)
+
+        # Дополнительные метрики: Skewness, Kurtosis, Shapiro p-value (только Shapiro — по столбцам)
+        shapiro_label = t["statistics"].get("shapiro_pvalue", "Shapiro p-value")
+        shapiro_p = cached_call(shapiro_pvalues, cleaned[numeric_selected]).round(4)
+        add_df = pd.DataFrame(
+            [
+                batch_stats.loc["skewness"].round(round_digits),
+                batch_stats.loc["kurtosis"].round(round_digits),
+                shapiro_p,
+            ],
+            index=[t["statistics"]["skewness"], t["statistics"]["kurtosis"], shapiro_label],
+        )
 
         # Объединяем базовую и дополнительные строки
         full_stats = pd.concat([base_stats, add_df], axis=0)
@@ -130,7 +102,7 @@ def show(language_display: str) -> None:
         st.markdown("---")
         st.subheader(t["normality_summary"]["title"])
         notes = []
-        for col, p in zip(numeric_selected, add_rows[t["statistics"].get("shapiro_pvalue", "Shapiro p-value")]):
+        for col, p in zip(numeric_selected, shapiro_p):
             if pd.isna(p):
                 notes.append(f"- **{col}** — {t['normality_summary'].get('not_applicable', 'not applicable')}")
             elif p > alpha:
@@ -1,13 +1,24 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import shapiro, skew, kurtosis
-from utils.translations import translations
+from utils.i18n import map_display_to_code, load_section
+from utils.ingestion import read_excel_cached
+from utils.figures import figure_key, render_png
+from utils.kde import kde
+from utils.memo import memoize
+
+
+@memoize
+def _normality(data: np.ndarray):
+    """(W, p) теста Шапиро–Уилка, асимметрия и эксцесс — кэшируются по данным."""
+    from scipy.stats import shapiro, skew, kurtosis
+
+    stat, p_value = shapiro(data)
+    return float(stat), float(p_value), float(skew(data)), float(kurtosis(data))
+
 
 def show(language):
-    t = translations[language]["histogram_analysis"]
+    t = load_section(map_display_to_code(language), "histogram_analysis")
 
     st.header(t["title"])
 
@@ -22,7 +33,7 @@ def show(language):
 
     if uploaded_file is not None:
         try:
-            df = pd.read_excel(uploaded_file)
+            df = read_excel_cached(uploaded_file)
             columns = df.columns.tolist()
 
             selected_column = st.selectbox(t["file_handling"]["select_column"], columns)
@@ -37,14 +48,20 @@ def show(language):
                 st.subheader(t["file_handling"]["data_preview"])
                 st.dataframe(data.head(10))
 
-            plt.figure(figsize=(15, 10))
-            plt.hist(data, color="lightgrey", edgecolor="black", bins=20, density=True, label="Histogram")
-            sns.kdeplot(data, color="blue", label="Gęstość danych")
-            plt.title(t["plot"]["histogram_title"])
-            plt.xlabel(t["plot"]["x_label"])
-            plt.ylabel(t["plot"]["y_label"])
-            plt.legend()
-            st.pyplot(plt.gcf())
+            def draw():
+                import matplotlib.pyplot as plt
+
+                fig = plt.figure(figsize=(15, 10))
+                plt.hist(data, color="lightgrey", edgecolor="black", bins=20, density=True, label="Histogram")
+                plt.plot(*kde(data), color="blue", label="Gęstość danych")
+                plt.title(t["plot"]["histogram_title"])
+                plt.xlabel(t["plot"]["x_label"])
+                plt.ylabel(t["plot"]["y_label"])
+                plt.legend()
+                return fig
+
+            png = render_png(figure_key("histogram", data.to_numpy(dtype=float), language), draw)
+            st.image(png, use_container_width=True)
 
             st.subheader(t["statistics"]["sample_size"])
             st.write(f"**{t['statistics']['sample_size']}:** {len(data)}")
@@ -55,8 +72,9 @@ def show(language):
             st.write(f"**{t['statistics']['median']}:** {np.median(data)}")
             st.write(f"**{t['statistics']['rsd']}:** {round((data.std() / data.mean()) * 100, 2)}%")
 
+            stat, p_value, skewness, kurt = _normality(data.to_numpy(dtype=float))
+
             st.subheader(t["statistics"]["shapiro_test"])
-            stat, p_value = shapiro(data)
             st.write(f"**{t['statistics']['shapiro_test']}:** statystyka = {round(stat, 4)}, p-wartość = {round(p_value, 4)}")
             if p_value > 0.05:
                 st.success(t["normality_results"]["normal_distribution"])
@@ -64,8 +82,8 @@ def show(language):
                 st.error(t["normality_results"]["non_normal_distribution"])
 
             st.subheader(f"{t['statistics']['skewness']} i {t['statistics']['kurtosis']}")
-            st.write(f"**{t['statistics']['skewness']}:** {round(skew(data), 2)}")
-            st.write(f"**{t['statistics']['kurtosis']}:** {round(kurtosis(data), 2)}")
+            st.write(f"**{t['statistics']['skewness']}:** {round(skewness, 2)}")
+            st.write(f"**{t['statistics']['kurtosis']}:** {round(kurt, 2)}")
 
         except Exception as e:
             st.error(f"{t['file_handling']['error_processing_file']}: {e}")
@@ -1,16 +1,14 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-from scipy.stats import norm
-from io import BytesIO
 
-from SPC import ImRControlChart, Rule01, Rule02, Rule03, Rule04, Rule05, Rule06, Rule07, Rule08
-from utils.translations import translations
-from streamlit_quill import st_quill
-from utils.pdf_export import build_pdf, PdfSection
-from utils.signature_block import DEFAULT_ROLES
-from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
+from utils.capability import bootstrap_capability, capability_indices
+from utils.i18n import map_display_to_code, load_section
+from utils.ingestion import read_excel_cached
+from utils.decimation import decimate, tick_positions
+from utils.figures import close_figures
+from utils.memo import cached_call
+from utils.spc import compute_imr, plot_imr
 
 # Column keys for signature editor (ASCII to avoid encoding issues)
 SIG_ROLE = "role"
@@ -37,21 +35,22 @@ PQR_COVER_PAGE = {
 
 
 def _apply_imr_xticks(fig, series_labels):
-    """Force x-axis tick step = 1 for both I and MR charts."""
+    """Label the x-axis of both I and MR charts with at most MAX_TICKS evenly spaced ticks."""
     axes = fig.get_axes()
     if not axes:
         return
 
+    # Long series: at most MAX_TICKS evenly spaced labels
     top_n = len(series_labels)
-    top_positions = list(range(1, top_n + 1))
+    top_positions = tick_positions(top_n, start=1)
     axes[0].set_xticks(top_positions)
     if series_labels:
-        axes[0].set_xticklabels(series_labels, rotation=45, ha="right")
+        axes[0].set_xticklabels([series_labels[i - 1] for i in top_positions], rotation=45, ha="right")
 
     if len(axes) > 1:
         bottom_n = max(top_n - 1, 0)
         if bottom_n:
-            bottom_positions = list(range(1, bottom_n + 1))
+            bottom_positions = tick_positions(bottom_n, start=1)
             axes[1].set_xticks(bottom_positions)
             axes[1].set_xticklabels([str(i) for i in bottom_positions])
 
@@ -73,7 +72,7 @@ def _set_imr_gap(fig, gap_px=15):
 
 
 def show(language):
-    t = translations[language]["pqr_module"]
+    t = load_section(map_display_to_code(language), "pqr_module")
 
     # =========================
     # Upload step
@@ -107,11 +106,19 @@ def show(language):
     # =========================
     # Main body
     # =========================
+    # Тяжёлые зависимости (matplotlib, scipy, reportlab, редакторы) — только после загрузки файла
+    import matplotlib.pyplot as plt
+    from scipy.stats import norm
+    from streamlit_quill import st_quill
+    from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode, DataReturnMode
+    from utils.pdf_export import build_pdf, PdfSection
+    from utils.signature_block import DEFAULT_ROLES
+
+    # Фигуры нужны и на странице, и в PDF; закрываем их в finally, чтобы не копились в pyplot
+    open_figures = []
     try:
-        file_like = BytesIO(st.session_state["pqr_file_bytes"])
-
         with st.expander("Отчёт PQR", expanded=True):
-            df = pd.read_excel(file_like)
+            df = read_excel_cached(st.session_state["pqr_file_bytes"])
 
             if df.shape[1] < 2:
                 st.error(t["file_handling"]["error_two_columns"])
@@ -160,18 +167,16 @@ def show(language):
 
         # ====== ImR chart ======
         st.subheader(t["subheaders"]["imr_chart"])
-        chart = ImRControlChart(
-            data=data_array,
+        chart = cached_call(compute_imr, data_array)
+        fig_imr = plot_imr(
+            chart,
             xlabel=t["chart_labels"]["observation"],
             ylabel_top=t["chart_labels"]["individual_values"],
             ylabel_bottom=t["chart_labels"]["moving_range"]
         )
-        chart.limits = True
-        chart.append_rules([Rule01(), Rule02(), Rule03(), Rule04(), Rule05(), Rule06(), Rule07(), Rule08()])
-        chart.plot()
-        fig_imr = plt.gcf()
         _apply_imr_xticks(fig_imr, series_ids)
         _set_imr_gap(fig_imr, gap_px=15)
+        open_figures.append(fig_imr)
         st.pyplot(fig_imr)
 
         # ====== Cpk + histogram ======
@@ -184,11 +189,13 @@ def show(language):
         if usl == lsl:
             st.warning(t["warnings"]["spec_limits_equal"])
         else:
-            mean = float(np.mean(data_array))
-            std_dev = float(np.std(data_array, ddof=1))
-            cpk = min((usl - mean) / (3 * std_dev), (mean - lsl) / (3 * std_dev))
+            # Cpk — по σ внутри (MR̄/d2), Ppk — по общему σ (ddof=1)
+            ind = cached_call(capability_indices, data_array, lsl, usl).iloc[0]
+            mean, std_dev = float(ind["mean"]), float(ind["std_overall"])
+            cpk, ppk = float(ind["Cpk"]), float(ind["Ppk"])
 
             fig_hist, ax = plt.subplots(figsize=(10, 6))
+            open_figures.append(fig_hist)
             ax.hist(data_array, bins=20, density=True, alpha=0.6, edgecolor='black')
 
             bins = np.linspace(min(data_array)[0], max(data_array)[0], 200)
@@ -208,10 +215,18 @@ def show(language):
             st.write(f"{t['cpk_results']['mean']}: **{mean:.2f}**")
             st.write(f"{t['cpk_results']['std_dev']}: **{std_dev:.2f}**")
             st.write(f"{t['cpk_results']['cpk']}: **{cpk:.2f}**")
+            st.write(f"{t['cpk_results']['ppk']}: **{ppk:.2f}**")
+            # 95% BCa-интервалы (10 000 выборок, фиксированный seed)
+            ci_text = {"Cpk": "–", "Ppk": "–"}
+            if data_array.shape[0] >= 3:
+                ci = cached_call(bootstrap_capability, data_array.ravel(), lsl, usl, seed=0, max_workers=None)
+                ci_text = {k: f"{ci.at[k, 'bca_lower']:.2f} – {ci.at[k, 'bca_upper']:.2f}" for k in ci_text}
+                st.write(f"{t['cpk_results']['ci']}: Cpk **{ci_text['Cpk']}**, Ppk **{ci_text['Ppk']}**")
             cpk_content = [
                 f"{t['cpk_results']['mean']}: {mean:.2f}",
                 f"{t['cpk_results']['std_dev']}: {std_dev:.2f}",
-                f"{t['cpk_results']['cpk']}: {cpk:.2f}",
+                f"{t['cpk_results']['cpk']}: {cpk:.2f} ({t['cpk_results']['ci']}: {ci_text['Cpk']})",
+                f"{t['cpk_results']['ppk']}: {ppk:.2f} ({t['cpk_results']['ci']}: {ci_text['Ppk']})",
                 f"USL: {usl}",
                 f"LSL: {lsl}",
             ]
@@ -219,7 +234,14 @@ def show(language):
         # ====== Comparison chart ======
         st.subheader(t["subheaders"]["spec_limits_comparison"])
         fig_comp, ax = plt.subplots(figsize=(12, 6))
-        ax.plot(series_ids, data_array, marker='o', linestyle='-', label=t["chart_labels"]["values"])
+        open_figures.append(fig_comp)
+        # Positions instead of categorical labels, so long series can be decimated
+        positions, shown = decimate(None, data_array.ravel())
+        ax.plot(positions, shown, marker='o' if shown.size == len(series_ids) else None,
+                linestyle='-', label=t["chart_labels"]["values"])
+        ticks = tick_positions(len(series_ids))
+        ax.set_xticks(ticks)
+        ax.set_xticklabels([str(series_ids[i]) for i in ticks])
         ax.axhline(usl, linestyle='dashed', linewidth=2, label=t["spec_limits"]["usl"])
         ax.axhline(lsl, linestyle='dashed', linewidth=2, label=t["spec_limits"]["lsl"])
         ax.set_xlabel(t["chart_labels"]["time_series"])
@@ -277,7 +299,14 @@ def show(language):
         subset_for_pdf = df[[t["chart_labels"]["time_series"], t["chart_labels"]["values"]]].reset_index(drop=True)
         cpk_desc_html = "<br/>".join([f"• {item}" for item in cpk_content]) if cpk_content else None
 
-        figures_for_pdf = [(t["subheaders"]["imr_chart"], fig_imr)]
+        # Нарушения правил: номера точек по каждому сработавшему правилу
+        imr_desc_html = None
+        if chart.rules.any():
+            imr_desc_html = "<br/>".join(
+                "• " + t["imr"]["rule"].format(rule=rule) + ": " + ", ".join(str(i + 1) for i in chart.rules.indices(rule))
+                for rule, count in chart.rules.counts().items() if count
+            )
+        figures_for_pdf = [(t["subheaders"]["imr_chart"], fig_imr, imr_desc_html)]
         if fig_hist is not None:
             figures_for_pdf.append((t["subheaders"]["cpk_analysis"], fig_hist, cpk_desc_html))
         figures_for_pdf.append((t["subheaders"]["spec_limits_comparison"], fig_comp))
@@ -291,7 +320,8 @@ def show(language):
             PdfSection(
                 heading="Исходные данные",
                 table_df=subset_for_pdf,
-                show_heading=True
+                show_heading=True,
+                highlight_rows=chart.rules.indices().tolist(),
             ),
         ]
 
@@ -336,3 +366,5 @@ def show(language):
         )
     except Exception as e:
         st.error(f"{t['file_handling']['error_processing_file']}: {e}")
+    finally:
+        close_figures(open_figures)
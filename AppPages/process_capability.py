@@ -1,14 +1,17 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import norm
-from utils.translations import translations
+from utils.capability import bootstrap_capability, capability_indices, percentile_capability
+from utils.distributions import fit_distributions, fit_table, select_fit
+from utils.i18n import map_display_to_code, load_section
+from utils.ingestion import read_excel_cached
+from utils.memo import cached_call
+from utils.figures import figure_key, render_png
+from utils.kde import kde
 
 
 def show(language):
-    t = translations[language]["process_capability"]
+    t = load_section(map_display_to_code(language), "process_capability")
 
     st.header(t["title"])
 
@@ -23,7 +26,7 @@ def show(language):
 
     if uploaded_file is not None:
         try:
-            df = pd.read_excel(uploaded_file)
+            df = read_excel_cached(uploaded_file)
             columns = df.columns.tolist()
 
             selected_column = st.selectbox(t["file_handling"]["select_column"], columns)
@@ -39,29 +42,115 @@ def show(language):
                 st.dataframe(data.head(10))
 
             st.subheader(t["spec_settings"]["target"])
-            target = st.number_input(t["spec_settings"]["target"], value=0.0, format="%0.2f")
             LSL = st.number_input(t["spec_settings"]["lsl"], value=0.0, format="%0.2f")
             USL = st.number_input(t["spec_settings"]["usl"], value=0.0, format="%0.2f")
+            # Без введённого значения целевое — середина допуска (иначе Cpm считался бы от нуля)
+            target = st.number_input(t["spec_settings"]["target"], value=None, format="%0.2f",
+                                     placeholder=t["spec_settings"]["target_placeholder"])
+            if target is None:
+                target = (LSL + USL) / 2
+
+            from scipy.stats import norm, shapiro
+
+            # Режим: нормальное распределение или подогнанное (ISO 22514-2, метод процентилей)
+            nn = t["non_normal"]
+            fit = None
+            if len(data) >= 3:
+                if len(data) <= 5000 and cached_call(shapiro, data).pvalue < 0.05:
+                    st.warning(nn["shapiro_failed"])
+                if st.checkbox(nn["toggle"], value=False, help=nn["help"]):
+                    fits = fit_distributions(data.to_numpy(dtype=float))
+                    criterion = st.radio(nn["criterion"], ["aic", "ad"], format_func=nn["criteria"].get,
+                                         horizontal=True)
+                    best = select_fit(fits, criterion)
+                    usable = [f for f in fits if f.ok]
+                    fit = st.selectbox(nn["distribution"], usable, index=usable.index(best),
+                                       format_func=lambda f: f.label + (" ★" if f is best else ""))
+
+            values = data.to_numpy(dtype=float)
+            ind = cached_call(capability_indices, values, LSL, USL, target).iloc[0]
 
             x = np.linspace(min(data), max(data), 1000)
-            y = norm.pdf(x, loc=target, scale=data.std())
-
-            plt.figure(figsize=(15, 10))
-            plt.hist(data, color="lightgrey", edgecolor="black", density=True, label="Histogram danych")
-            sns.kdeplot(data, color="blue", label="Gęstość danych")
-            plt.plot(x, y, linestyle="--", color="black", label="Teoretyczna gęstość (Normalna)")
-            plt.axvline(LSL, linestyle="--", color="red", label="LSL")
-            plt.axvline(USL, linestyle="--", color="orange", label="USL")
-            plt.axvline(target, linestyle="--", color="green", label="Target")
-            plt.title(t["plot"]["title"])
-            plt.xlabel(t["plot"]["x_label"])
-            plt.ylabel(t["plot"]["y_label"])
-            plt.yticks([])
-            plt.legend()
-            st.pyplot(plt.gcf())
-
-            Cp = (USL - LSL) / (6 * data.std())
-            Cpk = min((USL - data.mean()) / (3 * data.std()), (data.mean() - LSL) / (3 * data.std()))
+            if fit is None:
+                y = norm.pdf(x, loc=ind["mean"], scale=ind["std_overall"])
+                density_label = "Teoretyczna gęstość (Normalna)"
+            else:
+                y = fit.dist.pdf(x)
+                density_label = f"{nn['fitted_density']} ({fit.label})"
+
+            def draw():
+                import matplotlib.pyplot as plt
+
+                fig = plt.figure(figsize=(15, 10))
+                plt.hist(data, color="lightgrey", edgecolor="black", density=True, label="Histogram danych")
+                plt.plot(*kde(data), color="blue", label="Gęstość danych")
+                plt.plot(x, y, linestyle="--", color="black", label=density_label)
+                plt.axvline(LSL, linestyle="--", color="red", label="LSL")
+                plt.axvline(USL, linestyle="--", color="orange", label="USL")
+                plt.axvline(target, linestyle="--", color="green", label="Target")
+                plt.title(t["plot"]["title"])
+                plt.xlabel(t["plot"]["x_label"])
+                plt.ylabel(t["plot"]["y_label"])
+                plt.yticks([])
+                plt.legend()
+                return fig
+
+            png = render_png(
+                figure_key("capability", values, target, LSL, USL, language, density_label), draw
+            )
+            st.image(png, use_container_width=True)
+            r = t["results"]
+
+            st.subheader(r["header"])
+
+            # Cp/Cpk — по σ внутри (MR̄/d2), Pp/Ppk/Cpm и PPM — по общему σ
+            st.dataframe(pd.DataFrame({
+                r["index"]: ["Cp", "Cpk", "Pp", "Ppk", "Cpm"],
+                r["value"]: [round(ind[k], 2) for k in ("Cp", "Cpk", "Pp", "Ppk", "Cpm")],
+                r["sigma_basis"]: [r["std_within"]] * 2 + [r["std_overall"]] * 3,
+            }), hide_index=True)
+            st.caption(r["indices_help"])
+
+            # Доверительные интервалы: фиксированный seed — одинаковые числа, поэтому результат
+            # бутстрепа кэшируется и перерисовка страницы его не пересчитывает
+            bt = t["bootstrap"]
+            if len(values) >= 3 and st.checkbox(bt["toggle"], value=False, help=bt["help"]):
+                col_b, col_c = st.columns(2)
+                with col_b:
+                    n_boot = st.selectbox(bt["resamples"], [2000, 5000, 10000, 20000], index=2)
+                with col_c:
+                    confidence = st.selectbox(bt["confidence"], [0.90, 0.95, 0.99], index=1)
+                ci = cached_call(bootstrap_capability, values, LSL, USL, n_boot=n_boot, confidence=confidence,
+                                 seed=0, max_workers=None)
+                st.dataframe(ci.reset_index().rename(columns={
+                    "index": r["index"], "estimate": r["value"], "se": bt["se"],
+                    "pct_lower": bt["pct_lower"], "pct_upper": bt["pct_upper"],
+                    "bca_lower": bt["bca_lower"], "bca_upper": bt["bca_upper"],
+                }).drop(columns="bias").round(3), hide_index=True)
+                st.caption(bt["caption"])
+
+            if fit is not None:
+                # Подгонка из кэша: смена LSL/USL пересчитывает только процентили
+                pc = percentile_capability(fit, LSL, USL)
+                st.write(f"**{nn['header']}** — {fit.label}")
+                st.dataframe(pd.DataFrame({
+                    r["index"]: ["Pp", "Ppk", "Ppl", "Ppu"],
+                    r["value"]: [round(pc[k], 2) for k in ("Pp", "Ppk", "Ppl", "Ppu")],
+                }), hide_index=True)
+                st.write(f"X0.135 = **{pc['X0.135']:.4g}**, X50 = **{pc['X50']:.4g}**, X99.865 = **{pc['X99.865']:.4g}**  \n"
+                         f"**{r['ppm_total']} ({fit.label}):** {pc['ppm_total']:.1f}")
+                st.caption(nn["caption"])
+                with st.expander(nn["fits_header"]):
+                    table = fit_table(fits).drop(columns="distribution").rename(columns={
+                        "label": nn["distribution"], "params": nn["params"], "loglik": "log L",
+                        "aic": "AIC", "delta_aic": "ΔAIC", "ad": "A²",
+                    })
+                    st.dataframe(table.round(3), hide_index=True)
+
+            st.write(f"**{r['std_within']}:** {round(ind['std_within'], 4)}")
+            st.write(f"**{r['ppm_below']}:** {ind['ppm_below']:.1f}  \n"
+                     f"**{r['ppm_above']}:** {ind['ppm_above']:.1f}  \n"
+                     f"**{r['ppm_total']}:** {ind['ppm_total']:.1f}")
 
             num_samples = len(data)
             sample_mean = data.mean()
@@ -70,13 +159,8 @@ def show(language):
             sample_min = data.min()
             sample_median = np.median(data)
 
-            pct_below_LSL = len(data[data < LSL]) / len(data) * 100
-            pct_above_USL = len(data[data > USL]) / len(data) * 100
-
-            st.subheader(t["results"]["header"])
-
-            st.write(f"**{t['results']['cp']}:** {round(Cp, 2)}")
-            st.write(f"**{t['results']['cpk']}:** {round(Cpk, 2)}")
+            pct_below_LSL = ind["pct_below_lsl"]
+            pct_above_USL = ind["pct_above_usl"]
 
             st.write("---")
             st.write(f"**{t['results']['sample_size']}:** {num_samples}")
@@ -1,18 +1,22 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.ticker import MultipleLocator
-from scipy.stats import linregress
-from utils.translations import translations
+from utils.ingestion import read_excel_cached
+from utils.figures import figure_key, render_png
+from utils.memo import cached_call
+from utils.stability import batch_linregress, fit_stability
 
 # подключил i18n-систему
 from utils.i18n import map_display_to_code, load_section
 
 
+def _fmt_p(p):
+    return "—" if p is None else f"{p:.4f}"
+
+
 def show(language):
     # "Polski" -> "pl", "English" -> "en", "Русский" -> "ru"
-    t = translations[language]["stability_regression"]
+    t = load_section(map_display_to_code(language), "stability_regression")
   
 
     st.header(t["title"])
@@ -30,7 +34,7 @@ def show(language):
 
     if uploaded_file is not None:
         try:
-            df = pd.read_excel(uploaded_file)
+            df = read_excel_cached(uploaded_file)
 
             parameter_name = df.iloc[0, 0]
             min_spec_raw = pd.to_numeric(df["Min"], errors="coerce")
@@ -56,50 +60,121 @@ def show(language):
                 series_columns,
                 default=series_columns,
             )
-
-            fig, ax = plt.subplots(figsize=(12, 8))
-            regression_results = []
-
-            for col in selected_series:
-                y = df[col]
-                valid_indices = y.dropna().index
-                x = time.loc[valid_indices]
-                y = y.loc[valid_indices]
-
-                if len(x) > 1:
-                    slope, intercept, r_value, p_value, std_err = linregress(x, y)
-                    y_pred = slope * x + intercept
-
+            if not selected_series:
+                st.info(t["file_handling"]["no_series_selected"])
+                return
+
+            # Регрессия по всем сериям сразу (NaN — пропущенные точки)
+            reg = cached_call(batch_linregress, time.to_numpy(dtype=float), df[list(selected_series)])
+            reg = reg[reg["n"] > 1]
+
+            regression_results = [
+                {
+                    t["regression_results"]["series"]: col,
+                    t["regression_results"]["slope"]: round(row.slope, 6),
+                    t["regression_results"]["intercept"]: round(row.intercept, 6),
+                    t["regression_results"]["r_value"]: round(row.rvalue, 6),
+                    t["regression_results"]["p_value"]: f"{row.pvalue:.3e}",
+                    t["regression_results"]["std_err"]: round(row.stderr, 3),
+                }
+                for col, row in reg.iterrows()
+            ]
+
+            def draw():
+                import matplotlib.pyplot as plt
+                from matplotlib.ticker import MultipleLocator
+
+                fig, ax = plt.subplots(figsize=(12, 8))
+                for col, row in reg.iterrows():
+                    y = df[col].dropna()
+                    x = time.loc[y.index]
+                    y_pred = row.slope * x + row.intercept
                     ax.scatter(x, y, label=f"{col} ({t['plot']['data']})", alpha=0.7)
                     ax.plot(x, y_pred, label=f"{col} ({t['plot']['regression']})", linestyle="--")
 
-                    regression_results.append(
-                        {
-                            t["regression_results"]["series"]: col,
-                            t["regression_results"]["slope"]: round(slope, 6),
-                            t["regression_results"]["intercept"]: round(intercept, 6),
-                            t["regression_results"]["r_value"]: round(r_value, 6),
-                            t["regression_results"]["p_value"]: f"{p_value:.3e}",
-                            t["regression_results"]["std_err"]: round(std_err, 3),
-                        }
-                    )
-
-            if min_spec is not None:
-                ax.axhline(min_spec, color="red", linestyle="-", label=t["plot"]["spec_limit"])
-            if max_spec is not None:
-                ax.axhline(max_spec, color="red", linestyle="-", label=t["plot"]["spec_limit"])
-
-            ax.set_xlabel(t["plot"]["x_label"])
-            ax.set_ylabel(parameter_name)
-            ax.set_title(f"{t['plot']['title']}: {parameter_name}")
-            ax.legend()
-            ax.xaxis.set_major_locator(MultipleLocator(3))
-            st.pyplot(fig)
+                if min_spec is not None:
+                    ax.axhline(min_spec, color="red", linestyle="-", label=t["plot"]["spec_limit"])
+                if max_spec is not None:
+                    ax.axhline(max_spec, color="red", linestyle="-", label=t["plot"]["spec_limit"])
+
+                ax.set_xlabel(t["plot"]["x_label"])
+                ax.set_ylabel(parameter_name)
+                ax.set_title(f"{t['plot']['title']}: {parameter_name}")
+                ax.legend()
+                ax.xaxis.set_major_locator(MultipleLocator(3))
+                return fig
+
+            key = figure_key(
+                "stability", df[["Time", *selected_series]], parameter_name, min_spec, max_spec, language
+            )
+            st.image(render_png(key, draw), use_container_width=True)
 
             st.subheader(t["regression_results"]["header"])
             regression_df = pd.DataFrame(regression_results)
             st.dataframe(regression_df)
 
+            # --------- Срок годности по ICH Q1E ---------
+            q1e = t["ich_q1e"]
+            st.subheader(q1e["header"])
+            names = list(selected_series)
+            values = df[names].to_numpy(dtype=float)
+            result = cached_call(fit_stability, time.to_numpy(dtype=float), values, min_spec, max_spec)
+            summary = result.summary()
+
+            if (result.n[0] >= 2).any():
+                shelf = summary["shelf_life"]
+                lines = [
+                    f"**{q1e['model']}:** {q1e['models'][summary['model']]}",
+                    f"**{q1e['p_slopes']}:** {_fmt_p(summary['p_slopes'])}",
+                    f"**{q1e['p_intercepts']}:** {_fmt_p(summary['p_intercepts'])}",
+                    f"**{q1e['shelf_life']}:** " + (f"{shelf:.1f}" if shelf is not None else q1e["no_crossing"]),
+                ]
+                if summary["limiting_batch"] >= 0:
+                    lines.append(f"**{q1e['limiting_batch']}:** {names[summary['limiting_batch']]}")
+                st.write("  \n".join(lines))
+                st.caption(q1e["extrapolation_note"].format(limit=summary["extrapolation_limit"]))
+
+                batch_df = result.to_frame(names=names)[["series", "n", "shelf_life"]]
+                batch_df.columns = [t["regression_results"]["series"], "n", q1e["batch_shelf_life"]]
+                st.dataframe(batch_df.round(1), hide_index=True)
+
+                def draw_q1e():
+                    import matplotlib.pyplot as plt
+
+                    end = summary["extrapolation_limit"]
+                    if shelf is not None:
+                        end = max(end, shelf * 1.1)
+                    grid = np.linspace(0, end, 200)
+                    center, low, high = result.curves(grid)
+                    fig, ax = plt.subplots(figsize=(12, 6))
+                    shown = range(len(names)) if summary["model"] != "pooled" else [0]
+                    for j in shown:
+                        if not np.isfinite(center[j]).any():
+                            continue
+                        label = names[j] if summary["model"] != "pooled" else q1e["models"]["pooled"]
+                        line, = ax.plot(grid, center[j], label=label)
+                        if min_spec is not None:
+                            ax.plot(grid, low[j], linestyle=":", color=line.get_color())
+                        if max_spec is not None:
+                            ax.plot(grid, high[j], linestyle=":", color=line.get_color())
+                    for j in range(len(names)):
+                        ax.scatter(time, values[:, j], s=12, alpha=0.6)
+                    for spec in (min_spec, max_spec):
+                        if spec is not None:
+                            ax.axhline(spec, color="red", linestyle="-")
+                    if shelf is not None:
+                        ax.axvline(shelf, color="black", linestyle="--", label=f"{q1e['shelf_life']}: {shelf:.1f}")
+                    ax.set_xlabel(t["plot"]["x_label"])
+                    ax.set_ylabel(parameter_name)
+                    ax.set_title(f"{q1e['header']}: {parameter_name} ({q1e['bound']} — ···)")
+                    ax.legend()
+                    return fig
+
+                key = figure_key("stability_q1e", time, values, min_spec, max_spec, parameter_name, language)
+                st.image(render_png(key, draw_q1e), use_container_width=True)
+            else:
+                st.write(q1e["not_enough_data"])
+
         except Exception as e:
             st.error(f"{t['file_handling']['error_processing_file']}: {e}")
     else:
@@ -1,10 +1,11 @@
 # AppPages/statistical_analysis.py
-from STATANALYZE.analyzer import analyze_groups
-from utils.statistical_analysis_translation import statistical_analysis_translations
+from utils.i18n import map_display_to_code, load_section
+from utils.ingestion import read_excel_cached
+from utils.figures import figure_key, render_png
+from utils.memo import cached_call
+from utils.kde import kde
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 __all__ = ["show"]
 
@@ -24,7 +25,7 @@ h2, h3 { margin-top: 0.4rem; margin-bottom: 0.6rem; }
   [data-testid="stTable"] tr,     [data-testid="stDataFrame"] tr     { break-inside: avoid !important; page-break-inside: avoid !important; }
   .stDataFrame, .stTable { overflow: visible !important; }
   .stDataFrame table, .stTable table { font-size: 11px !important; }
-  .stPyplot, .stAltairChart, .stPlotlyChart { break-inside: avoid !important; page-break-inside: avoid !important; }
+  .stPyplot, .stImage, .stAltairChart, .stPlotlyChart { break-inside: avoid !important; page-break-inside: avoid !important; }
   h1, h2, h3 { page-break-after: avoid; }
 }
 </style>
@@ -32,7 +33,7 @@ h2, h3 { margin-top: 0.4rem; margin-bottom: 0.6rem; }
 st.markdown(_PRINT_CSS, unsafe_allow_html=True)
 
 def show(language: str):
-    t = statistical_analysis_translations[language]["statistical_analysis"]
+    t = load_section(map_display_to_code(language), "statistical_analysis")
 
     st.title(t["title"])
 
@@ -40,7 +41,7 @@ def show(language: str):
     if not uploaded_file:
         return
 
-    df = pd.read_excel(uploaded_file).convert_dtypes()
+    df = read_excel_cached(uploaded_file).convert_dtypes()
     df = df.apply(pd.to_numeric, errors="coerce")
     df.dropna(axis=1, how="all", inplace=True)
     df.dropna(how="all", inplace=True)
@@ -72,8 +73,11 @@ def show(language: str):
         index=2,
     )
 
+    # scipy подтягивается только после загрузки файла
+    from STATANALYZE.analyzer import analyze_groups
+
     try:
-        result = analyze_groups(groups, paired=paired, alpha=alpha)
+        result = cached_call(analyze_groups, groups, paired=paired, alpha=alpha)
 
         # ===== 1) Przegląd danych / Data overview / Обзор данных =====
         st.markdown('<div class="report-block">', unsafe_allow_html=True)
@@ -89,13 +93,13 @@ def show(language: str):
         rows = []
         for i, summary in enumerate(result["group_summary"], start=1):
             rows.append({
-                statistical_analysis_translations[language]["statistical_analysis"]["group_col"] if "group_col" in statistical_analysis_translations[language]["statistical_analysis"] else "Group": f"{i}: {df.columns[i-1]}",
-                statistical_analysis_translations[language]["statistical_analysis"]["n_col"]     if "n_col"     in statistical_analysis_translations[language]["statistical_analysis"] else "n": summary.get("n"),
-                statistical_analysis_translations[language]["statistical_analysis"]["mean_col"]  if "mean_col"  in statistical_analysis_translations[language]["statistical_analysis"] else "Mean": summary.get("mean"),
-                statistical_analysis_translations[language]["statistical_analysis"]["median_col"]if "median_col"in statistical_analysis_translations[language]["statistical_analysis"] else "Median": summary.get("median"),
-                statistical_analysis_translations[language]["statistical_analysis"]["std_col"]   if "std_col"   in statistical_analysis_translations[language]["statistical_analysis"] else "Std. deviation": summary.get("std"),
-                statistical_analysis_translations[language]["statistical_analysis"]["iqr_col"]   if "iqr_col"   in statistical_analysis_translations[language]["statistical_analysis"] else "IQR": summary.get("iqr"),
-                statistical_analysis_translations[language]["statistical_analysis"]["var_col"]   if "var_col"   in statistical_analysis_translations[language]["statistical_analysis"] else "Variance": summary.get("var"),
+                t["group_col"] if "group_col" in t else "Group": f"{i}: {df.columns[i-1]}",
+                t["n_col"]     if "n_col"     in t else "n": summary.get("n"),
+                t["mean_col"]  if "mean_col"  in t else "Mean": summary.get("mean"),
+                t["median_col"]if "median_col"in t else "Median": summary.get("median"),
+                t["std_col"]   if "std_col"   in t else "Std. deviation": summary.get("std"),
+                t["iqr_col"]   if "iqr_col"   in t else "IQR": summary.get("iqr"),
+                t["var_col"]   if "var_col"   in t else "Variance": summary.get("var"),
             })
         full_df = pd.DataFrame(rows)
         styled_full_df = (
@@ -115,77 +119,90 @@ def show(language: str):
 
         with vcol1:
             st.markdown("**" + t["boxplot"] + "**")
-            fig1, ax1 = plt.subplots()
-            df.boxplot(ax=ax1)
-            ax1.set_xlabel(""); ax1.set_ylabel("")
-            st.pyplot(fig1, use_container_width=True)
+            def draw_box():
+                import matplotlib.pyplot as plt
+
+                fig1, ax1 = plt.subplots()
+                df.boxplot(ax=ax1)
+                ax1.set_xlabel(""); ax1.set_ylabel("")
+                return fig1
+
+            st.image(render_png(figure_key("groups_box", df), draw_box), use_container_width=True)
 
         with vcol2:
             st.markdown("**" + t["kde"] + "**")
-            fig2, ax2 = plt.subplots()
-            for col in df.columns:
-                sns.kdeplot(df[col].dropna(), label=col, fill=True, ax=ax2)
             # Tytuł legendy / Legend title / Заголовок легенды
-            legend_title = statistical_analysis_translations[language]["statistical_analysis"].get("group_col", "Group")
-            ax2.legend(title=legend_title, loc="best")
-            ax2.set_xlabel(""); ax2.set_ylabel("")
-            st.pyplot(fig2, use_container_width=True)
+            legend_title = t.get("group_col", "Group")
+
+            def draw_kde():
+                import matplotlib.pyplot as plt
+
+                fig2, ax2 = plt.subplots()
+                for col in df.columns:
+                    grid, density = kde(df[col])
+                    if grid.size:
+                        (line,) = ax2.plot(grid, density, label=col)
+                        ax2.fill_between(grid, density, color=line.get_color(), alpha=0.25)
+                ax2.legend(title=legend_title, loc="best")
+                ax2.set_xlabel(""); ax2.set_ylabel("")
+                return fig2
+
+            st.image(render_png(figure_key("groups_kde", df, legend_title), draw_kde), use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
         st.markdown("---")
 
         # ===== 2) Normalność / Normality / Нормальность =====
-        t_sa = statistical_analysis_translations[language]["statistical_analysis"]
         st.markdown('<div class="report-block">', unsafe_allow_html=True)
-        st.subheader(t_sa["sec2"])
+        st.subheader(t["sec2"])
 
-        st.markdown("**" + t_sa["sw_title"] + "**")
+        st.markdown("**" + t["sw_title"] + "**")
         cols = st.columns(4)
         for i, (p_value, col_name) in enumerate(zip(result["shapiro_p"], df.columns), start=1):
             is_normal = p_value > alpha
-            verdict = t_sa["group_verdict_normal"] if is_normal else t_sa["group_verdict_non_normal"]
-            sign = t_sa["sign_gt"] if is_normal else t_sa["sign_le"]
-            msg = verdict.format(i=i, name=col_name) + "  \n" + t_sa["p_line"].format(p=p_value, sign=sign, alpha=alpha)
+            verdict = t["group_verdict_normal"] if is_normal else t["group_verdict_non_normal"]
+            sign = t["sign_gt"] if is_normal else t["sign_le"]
+            msg = verdict.format(i=i, name=col_name) + "  \n" + t["p_line"].format(p=p_value, sign=sign, alpha=alpha)
             with cols[(i - 1) % 4]:
                 st.success(msg) if is_normal else st.error(msg)
 
         if len(result.get("shapiro_p", [])) == 0:
-            st.warning(t_sa["levene_na"])
+            st.warning(t["levene_na"])
 
-        st.markdown("**" + t_sa["levene_title"] + "**")
+        st.markdown("**" + t["levene_title"] + "**")
         levene_p = result.get("levene_p", None)
         if levene_p is None:
-            st.info(t_sa["levene_na"])
+            st.info(t["levene_na"])
         else:
             is_homo = levene_p > alpha
-            sign = t_sa["sign_gt"] if is_homo else t_sa["sign_le"]
-            lev_text = (t_sa["dist_homo"] if is_homo else t_sa["dist_hetero"]) + "  \n" + t_sa["p_line"].format(p=levene_p, sign=sign, alpha=alpha)
+            sign = t["sign_gt"] if is_homo else t["sign_le"]
+            lev_text = (t["dist_homo"] if is_homo else t["dist_hetero"]) + "  \n" + t["p_line"].format(p=levene_p, sign=sign, alpha=alpha)
             st.success(lev_text) if is_homo else st.warning(lev_text)
 
-        with st.expander(t_sa["help_norm_title"]):
-            st.write(t_sa["help_norm_text"])
+        with st.expander(t["help_norm_title"]):
+            st.write(t["help_norm_text"])
         st.markdown("</div>", unsafe_allow_html=True)
 
         st.markdown("---")
 
         # ===== 3) Metoda i wniosek / Method & conclusion / Метод и итог =====
         st.markdown('<div class="report-block">', unsafe_allow_html=True)
-        st.subheader(t_sa["sec3"])
+        st.subheader(t["sec3"])
 
         c1, c2 = st.columns(2)
         with c1:
-            st.info(t_sa["used_test"].format(test=result["test_used"]) + "  \n" + t_sa["alpha_used"].format(alpha=result["alpha"]))
+            st.info(t["used_test"].format(test=result["test_used"]) + "  \n" + t["alpha_used"].format(alpha=result["alpha"]))
         with c2:
-            st.info(t_sa["stat_value"].format(stat=result["statistic"]) + "  \n" + t_sa["p_value"].format(p=result["p_value"]))
+            st.info(t["stat_value"].format(stat=result["statistic"]) + "  \n" + t["p_value"].format(p=result["p_value"]))
 
-        st.markdown(t_sa["short_conclusion"])
+        st.markdown(t["short_conclusion"])
         if result["p_value"] < alpha:
-            st.success(t_sa["sig_yes"] + "  \n" + t_sa["p_line"].format(p=result["p_value"], sign=t_sa["sign_gt"], alpha=alpha))
+            st.success(t["sig_yes"] + "  \n" + t["p_line"].format(p=result["p_value"], sign=t["sign_gt"], alpha=alpha))
         else:
-            st.info(t_sa["sig_no"] + "  \n" + t_sa["p_line"].format(p=result["p_value"], sign=t_sa["sign_le"], alpha=alpha))
+            st.info(t["sig_no"] + "  \n" + t["p_line"].format(p=result["p_value"], sign=t["sign_le"], alpha=alpha))
 
-        with st.expander(t_sa["help_method_title"]):
-            st.write(t_sa["help_method_text"])
+        with st.expander(t["help_method_title"]):
+            st.write(t["help_method_text"])
         st.markdown("</div>", unsafe_allow_html=True)
 
     except ValueError as e:
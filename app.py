@@ -1,6 +1,11 @@
+import time
+
+_script_started = time.perf_counter()
+
 import streamlit as st
 
 from utils.i18n import map_display_to_code, load_all, load_section
+from utils.router import IMPORT_TIMES, load_page
 
 st.set_page_config(page_title="Santo Pharmstat", layout="wide")
 
@@ -18,38 +23,67 @@ t_sa = load_section(lang, "statistical_analysis")   # только для наз
 t_stab = t["stability_regression"]
 
 
-# --- Импорт страниц (функции show) один раз ---
-from AppPages import Wprowadzenie
-from AppPages import descriptive_statistics
-from AppPages import control_charts
-from AppPages import process_capability
-from AppPages import stability_analysis
-#from AppPages import histogram_analysis
-#from AppPages import BoxPlot
-#from AppPages import statistical_analysis
-#from AppPages import pqr
-# при наличии:
-# from AppPages import pqr
-# from AppPages import Analiza_temperatury_wilgotnosci
-
-# --- Карта пунктов меню -> функция показа страницы ---
+# --- Карта пунктов меню -> модуль страницы (импортируется только при выборе) ---
 routes = {
-    t_general["intro"]:                             lambda: Wprowadzenie.show(language_display),
-    t_general["descriptive_statistics"]:            lambda: descriptive_statistics.show(language_display),
-    t_general["control_charts"]:                    lambda: control_charts.show(language_display),
-    t_general["process_capability"]:                lambda: process_capability.show(language_display),
-    t_general["stability_regression"]:              lambda: stability_analysis.show(language_display),
-    #t_general["histogram_analysis"]:                lambda: histogram_analysis.show(language_display),
-    #t_general["boxplot_charts"]:                    lambda: BoxPlot.show(language_display),
-    #t_general["pqr_module"]:                        lambda: pqr.show(language_display),
+    t_general["intro"]:                             "AppPages.Wprowadzenie",
+    t_general["descriptive_statistics"]:            "AppPages.descriptive_statistics",
+    t_general["control_charts"]:                    "AppPages.control_charts",
+    t_general["process_capability"]:                "AppPages.process_capability",
+    t_general["stability_regression"]:              "AppPages.stability_analysis",
+    #t_general["histogram_analysis"]:                "AppPages.histogram_analysis",
+    #t_general["boxplot_charts"]:                    "AppPages.BoxPlot",
+    #t_general["pqr_module"]:                        "AppPages.pqr",
     # опциональные:
-    # t_general["temp_humidity_analysis"]:    lambda: Analiza_temperatury_wilgotnosci.show(language_display),
+    # t_general["temp_humidity_analysis"]:    "AppPages.Analiza_temperatury_wilgotnosci",
 
     # пункт «Статистический анализ» берём ИСКЛЮЧИТЕЛЬНО из t_sa["title"]
-    #t_sa["title"]:                          lambda: statistical_analysis.show(language_display),
+    #t_sa["title"]:                          "AppPages.statistical_analysis",
 }
 
 # --- Рендер меню и роутинг ---
 st.sidebar.title(t_general["menu_title"])
 page = st.sidebar.radio(t_general["choose_page"], list(routes.keys()))
-routes[page]()   # вызываем соответствующую функцию
+sidebar_ready = time.perf_counter() - _script_started
+
+page_module, import_seconds, first_import = load_page(routes[page])
+render_started = time.perf_counter()
+page_module.show(language_display)   # вызываем соответствующую функцию
+render_seconds = time.perf_counter() - render_started
+
+# --- Отчёт о времени загрузки ---
+with st.sidebar.expander(t_general["timing_title"]):
+    import_text = f"{import_seconds * 1000:.0f} ms" if first_import else t_general["timing_cached"]
+    st.write(
+        f"{t_general['timing_sidebar']}: **{sidebar_ready * 1000:.0f} ms**  \n"
+        f"{t_general['timing_import']}: **{import_text}**  \n"
+        f"{t_general['timing_render']}: **{render_seconds * 1000:.0f} ms**"
+    )
+    if IMPORT_TIMES:
+        st.caption(t_general["timing_modules"])
+        st.write("  \n".join(
+            f"{name.split('.')[-1]}: {seconds * 1000:.0f} ms" for name, seconds in IMPORT_TIMES.items()
+        ))
+
+# --- Попадания/промахи кэшей (результаты расчётов, графики, книги Excel) ---
+if st.sidebar.checkbox(t_general["cache_toggle"], value=False, help=t_general["cache_help"]):
+    from utils.memo import cache_report, clear_all
+
+    if st.sidebar.button(t_general["cache_clear"]):
+        clear_all()
+    report = cache_report()
+    report["name"] = [
+        name if kind == "cache" else ".".join(name.split(".")[-2:])
+        for kind, name in zip(report["kind"], report["name"])
+    ]
+    report["bytes"] = (report["bytes"] / 2**20).round(1)
+    st.sidebar.dataframe(
+        report.drop(columns="kind").rename(columns={
+            "name": t_general["cache_name"],
+            "hits": t_general["cache_hits"],
+            "misses": t_general["cache_misses"],
+            "entries": t_general["cache_entries"],
+            "bytes": t_general["cache_size_mb"],
+            "hit_rate": t_general["cache_hit_rate"],
+        }),
+        hide_index=True,
+    )
@@ -0,0 +1,205 @@
+# batch_analysis.py
+"""
+Пакетный (headless) запуск анализов без Streamlit.
+
+    python batch_analysis.py INPUT_DIR --spec jobs.json --out results/ [--workers 8] [--pdf]
+
+jobs.json:
+    {
+      "pattern": "*.xlsx",
+      "jobs": [
+        {"type": "descriptive"},
+        {"type": "imr", "column": "Assay"},
+        {"type": "imr_all"},
+        {"type": "xbar", "column": "Assay", "subgroup_column": "Time point", "kind": "R"},
+        {"type": "ewma", "column": "Assay", "lam": 0.2, "L": 3},
+        {"type": "cusum", "column": "Assay", "k": 0.5, "h": 5},
+        {"type": "capability", "column": "Assay", "lsl": 95, "usl": 105, "target": 100, "bootstrap": 10000,
+         "distribution": "auto"},
+        {"type": "capability_all", "lsl": {"Assay": 95, "Dissolution": 80}, "usl": {"Assay": 105}},
+        {"type": "stability"},
+        {"type": "temp_humidity", "temp_limits": [15, 25], "hum_limits": [30, 65]},
+        {"type": "group_comparison", "paired": false, "alpha": 0.05}
+      ]
+    }
+
+Для каждой книги пишется <имя>.json (сводки всех задач), таблицы
+<имя>.<задача>.<таблица>.parquet (или .csv) и, по флагу --pdf, <имя>.pdf.
+Итог по всем книгам — summary.json.
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from utils import analysis
+
+# Тип задачи -> (функция анализа, параметры pd.read_excel)
+JOBS = {
+    "descriptive": (analysis.descriptive_analysis, {}),
+    "imr": (analysis.imr_analysis, {}),
+    "imr_all": (analysis.imr_all_columns_analysis, {}),
+    "xbar": (analysis.xbar_analysis, {}),
+    "ewma": (analysis.ewma_analysis, {}),
+    "cusum": (analysis.cusum_analysis, {}),
+    "capability": (analysis.capability_analysis, {}),
+    "capability_all": (analysis.capability_table_analysis, {}),
+    "stability": (analysis.stability_analysis, {}),
+    "temp_humidity": (analysis.temp_humidity_analysis, {"header": None, "skiprows": 1}),
+    "group_comparison": (analysis.group_comparison_analysis, {}),
+}
+
+
+def _jsonable(obj):
+    """numpy/pandas -> чистый JSON; NaN/inf -> null."""
+    if isinstance(obj, dict):
+        return {str(k): _jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(v) for v in obj]
+    if isinstance(obj, (np.bool_, bool)):
+        return bool(obj)
+    if isinstance(obj, (np.integer,)):
+        return int(obj)
+    if isinstance(obj, (np.floating, float)):
+        return float(obj) if math.isfinite(obj) else None
+    if isinstance(obj, (pd.Timestamp, pd.Timedelta)):
+        return str(obj)
+    return obj
+
+
+def _job_name(job: Dict, idx: int) -> str:
+    return job.get("name") or f"{idx:02d}_{job['type']}"
+
+
+def _write_table(df: pd.DataFrame, path: str, fmt: str) -> str:
+    if fmt == "parquet":
+        path += ".parquet"
+        # Смешанные object-столбцы (ID серий и т.п.) parquet не принимает — приводим к строкам
+        out = df.copy()
+        for col in out.columns[out.dtypes == object]:
+            out[col] = out[col].astype(str)
+        out.columns = [str(c) for c in out.columns]
+        out.to_parquet(path, index=False)
+    else:
+        path += ".csv"
+        df.to_csv(path, index=False)
+    return path
+
+
+def _build_pdf(title: str, results: Dict, path: str) -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+    from utils.figures import close_figures
+    from utils.pdf_export import PdfSection, build_pdf
+
+    sections, figures = [], []
+    try:
+        for name, res in results.items():
+            lines = "<br/>".join(
+                f"{k}: {v}" for k, v in _jsonable(res.summary).items() if not isinstance(v, (dict, list))
+            )
+            sections.append(PdfSection(heading=name, body_html=lines or None))
+            for caption, make in res.plots:
+                figures.append((caption, make()))
+        # Книги и так обрабатываются в пуле процессов — вложенный пул для графиков не нужен
+        buf = build_pdf(title=title, sections=sections, figures=figures, show_title=True, max_workers=1)
+        with open(path, "wb") as fh:
+            fh.write(buf.getvalue())
+    finally:
+        close_figures(figures)
+
+
+def process_workbook(path: str, jobs: List[Dict], out_dir: str, table_format: str, pdf: bool) -> Dict:
+    """Все задачи для одной книги; выполняется в отдельном процессе."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    started = time.perf_counter()
+    frames: Dict = {}
+    results, report = {}, {"file": path, "jobs": {}}
+
+    for idx, job in enumerate(jobs, start=1):
+        name = _job_name(job, idx)
+        func, read_kwargs = JOBS[job["type"]]
+        params = {k: v for k, v in job.items() if k not in ("type", "name")}
+        try:
+            key = tuple(sorted(read_kwargs.items()))
+            if key not in frames:
+                frames[key] = pd.read_excel(path, **read_kwargs)
+            res = func(frames[key].copy(), **params)
+            results[name] = res
+            tables = {
+                t: _write_table(df, os.path.join(out_dir, f"{stem}.{name}.{t}"), table_format)
+                for t, df in res.tables.items()
+            }
+            report["jobs"][name] = {"status": "ok", "summary": res.summary, "tables": tables}
+        except Exception as e:
+            report["jobs"][name] = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    if pdf and results:
+        try:
+            pdf_path = os.path.join(out_dir, f"{stem}.pdf")
+            _build_pdf(stem, results, pdf_path)
+            report["pdf"] = pdf_path
+        except Exception as e:
+            report["pdf_error"] = f"{type(e).__name__}: {e}"
+
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report = _jsonable(report)
+    with open(os.path.join(out_dir, f"{stem}.json"), "w", encoding="utf-8") as fh:
+        json.dump(report, fh, ensure_ascii=False, indent=2)
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Santo Pharmstat — batch analysis without the UI")
+    parser.add_argument("input_dir", help="Directory with Excel workbooks")
+    parser.add_argument("--spec", required=True, help="JSON job spec")
+    parser.add_argument("--out", default="batch_results", help="Output directory")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Process pool size")
+    parser.add_argument("--tables", choices=["parquet", "csv"], default="parquet", help="Table output format")
+    parser.add_argument("--pdf", action="store_true", help="Also write a PDF report per workbook")
+    args = parser.parse_args(argv)
+
+    with open(args.spec, encoding="utf-8") as fh:
+        spec = json.load(fh)
+    jobs = spec["jobs"]
+    unknown = sorted({j["type"] for j in jobs} - set(JOBS))
+    if unknown:
+        parser.error(f"unknown job type(s): {', '.join(unknown)}; expected one of {', '.join(JOBS)}")
+
+    files = sorted(glob.glob(os.path.join(args.input_dir, spec.get("pattern", "*.xlsx"))))
+    if not files:
+        parser.error(f"no workbooks found in {args.input_dir}")
+    os.makedirs(args.out, exist_ok=True)
+
+    started = time.perf_counter()
+    reports = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(process_workbook, f, jobs, args.out, args.tables, args.pdf): f for f in files
+        }
+        for fut in as_completed(futures):
+            try:
+                report = fut.result()
+            except Exception as e:
+                report = {"file": futures[fut], "error": f"{type(e).__name__}: {e}"}
+            failed = [n for n, j in report.get("jobs", {}).items() if j["status"] != "ok"]
+            print(f"{os.path.basename(futures[fut])}: {'FAILED ' + ', '.join(failed) if failed else 'ok'}")
+            reports.append(report)
+
+    reports.sort(key=lambda r: r["file"])
+    with open(os.path.join(args.out, "summary.json"), "w", encoding="utf-8") as fh:
+        json.dump(_jsonable(reports), fh, ensure_ascii=False, indent=2)
+    print(f"{len(files)} workbook(s) in {time.perf_counter() - started:.1f}s -> {args.out}")
+    return 1 if any("error" in r for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,407 @@
+# utils/analysis.py
+"""
+Чистые функции анализа без Streamlit: те же расчёты, что выполняют страницы,
+в виде, пригодном для пакетного запуска (batch_analysis.py) и тестов.
+Каждая функция возвращает AnalysisResult: JSON-совместимую сводку,
+таблицы (DataFrame) и ленивые построители графиков для PDF.
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.capability import bootstrap_capability, capability_indices, capability_table, percentile_capability
+from utils.data_processing import describe_batch, shapiro_pvalues
+from utils.distributions import fit_distributions, fit_table, select_fit
+from utils.spc import (
+    compute_cusum,
+    compute_ewma,
+    compute_imr,
+    compute_imr_columns,
+    compute_xbar,
+    imr_summary_table,
+    numeric_columns,
+    plot_cusum,
+    plot_ewma,
+    plot_imr,
+    plot_xbar,
+)
+from utils.stability import batch_linregress, fit_stability, study_arrays
+from utils.temp_humidity import (
+    excursion_events,
+    find_threshold_crossings,
+    interval_weights,
+    mean_kinetic_temperature,
+    normalize_logger_frame,
+    period_summary,
+    time_out_of_range,
+)
+
+__all__ = [
+    "AnalysisResult",
+    "descriptive_analysis",
+    "imr_analysis",
+    "imr_all_columns_analysis",
+    "xbar_analysis",
+    "ewma_analysis",
+    "cusum_analysis",
+    "capability_analysis",
+    "capability_table_analysis",
+    "stability_analysis",
+    "temp_humidity_analysis",
+    "group_comparison_analysis",
+]
+
+
+@dataclass
+class AnalysisResult:
+    summary: Dict
+    tables: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    # (подпись, функция без аргументов -> matplotlib Figure); строятся только для PDF
+    plots: List[Tuple[str, Callable]] = field(default_factory=list)
+
+
+def _numeric_frame(df: pd.DataFrame) -> pd.DataFrame:
+    cleaned = df.apply(pd.to_numeric, errors="coerce")
+    return cleaned.loc[:, cleaned.notna().any()]
+
+
+def _finite(value) -> Optional[float]:
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def descriptive_analysis(df: pd.DataFrame) -> AnalysisResult:
+    """Как страница «Описательная статистика»: describe + RSD + skew/kurtosis + Shapiro p."""
+    numeric = _numeric_frame(df)
+    stats = describe_batch(numeric)
+    stats.loc["shapiro_p"] = shapiro_pvalues(numeric)
+    summary = {
+        str(col): {row: _finite(stats.at[row, col]) for row in stats.index}
+        for col in stats.columns
+    }
+    return AnalysisResult(summary, {"descriptive": stats.rename_axis("statistic").reset_index()})
+
+
+def imr_analysis(df: pd.DataFrame, column: Optional[str] = None) -> AnalysisResult:
+    """Как страница «Карты контроля»: первый столбец — ID/время, column — значения (по умолчанию второй)."""
+    if df.shape[1] < 2:
+        raise ValueError("I-MR job requires at least 2 columns (Time/ID, Value)")
+    column = column or df.columns[1]
+    work = pd.DataFrame({
+        "id": df.iloc[:, 0].astype(str),
+        "value": pd.to_numeric(df[column], errors="coerce"),
+    }).dropna(subset=["value"])
+    chart = compute_imr(work["value"].to_numpy(dtype=float))
+
+    summary = {
+        "column": str(column),
+        "n": chart.n,
+        "CL": chart.i_cl, "UCL": chart.i_ucl, "LCL": chart.i_lcl,
+        "MR_CL": chart.mr_cl, "MR_UCL": chart.mr_ucl,
+        "shapiro_p": _finite(chart.shapiro_pvalue()),
+        "stable": chart.stable(),
+        "violations": {str(r): c for r, c in chart.rules.counts().items()},
+        "mr_violations": int(chart.mr_violations.sum()),
+    }
+    points = work.reset_index(drop=True)
+    points["MR"] = np.r_[np.nan, chart.moving_range]
+    for r in chart.rules.rules:
+        points[f"rule_{r}"] = chart.violations[:, r - 1]
+    plots = [(f"I-MR: {column}", lambda: plot_imr(chart, xlabel="Observation"))]
+    return AnalysisResult(summary, {"imr_points": points}, plots)
+
+
+def imr_all_columns_analysis(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
+) -> AnalysisResult:
+    """Режим «все столбцы» страницы «Карты контроля»: I-MR по каждому числовому столбцу, кроме первого (ID)."""
+    columns = list(columns) if columns is not None else numeric_columns(df[df.columns[1:]])
+    charts = compute_imr_columns(df, columns, max_workers=max_workers)
+    table = imr_summary_table(charts)
+    table["column"] = table["column"].astype(str)
+    summary = {
+        "columns": int(len(table)),
+        "unstable": [str(c) for c in table.loc[~table["stable"], "column"]],
+    }
+    return AnalysisResult(summary, {"imr_summary": table})
+
+
+def xbar_analysis(
+    df: pd.DataFrame,
+    column: Optional[str] = None,
+    subgroup_column: Optional[str] = None,
+    size: Optional[int] = None,
+    kind: str = "R",
+) -> AnalysisResult:
+    """
+    Карта X̄-R / X̄-S: column — значения (по умолчанию второй столбец),
+    subgroup_column — метка подгруппы (по умолчанию первый столбец);
+    при заданном size подгруппы — подряд идущие блоки по size значений.
+    """
+    column = column or df.columns[1]
+    values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+    subgroups = None if size else df[subgroup_column or df.columns[0]].astype(str).to_numpy()
+    chart = compute_xbar(values, subgroups, size=size, kind=kind)
+
+    summary = {
+        "column": str(column),
+        "kind": f"Xbar-{chart.kind}",
+        "subgroups": chart.k,
+        "subgroup_size": int(chart.stats.size[0]) if chart.equal_sizes else None,
+        "CL": chart.center,
+        "UCL": _finite(chart.x_ucl[0]) if chart.equal_sizes else None,
+        "LCL": _finite(chart.x_lcl[0]) if chart.equal_sizes else None,
+        "sigma_within": chart.sigma,
+        f"{chart.kind}_CL": _finite(chart.spread_cl[0]) if chart.equal_sizes else None,
+        f"{chart.kind}_UCL": _finite(chart.spread_ucl[0]) if chart.equal_sizes else None,
+        "stable": chart.stable(),
+        "violations": {str(r): c for r, c in chart.rules.counts().items()},
+        f"{chart.kind.lower()}_violations": int(chart.spread_violations.sum()),
+    }
+    points = chart.data(0).rename(columns={"value": "mean"})
+    points[chart.kind] = chart.spread
+    points[f"{chart.kind}_UCL"] = chart.spread_ucl
+    for r in chart.rules.rules:
+        points[f"rule_{r}"] = chart.rules.matrix[:, r - 1]
+    plots = [(f"Xbar-{chart.kind}: {column}", lambda: plot_xbar(chart, xlabel="Subgroup"))]
+    return AnalysisResult(summary, {"xbar_subgroups": points}, plots)
+
+
+def _series_frame(df: pd.DataFrame, column: Optional[str]) -> Tuple[str, pd.DataFrame]:
+    """Первый столбец — ID/время, column — значения (по умолчанию второй); строки без числа отбрасываются."""
+    if df.shape[1] < 2:
+        raise ValueError("chart job requires at least 2 columns (Time/ID, Value)")
+    column = column or df.columns[1]
+    work = pd.DataFrame({
+        "id": df.iloc[:, 0].astype(str),
+        "value": pd.to_numeric(df[column], errors="coerce"),
+    }).dropna(subset=["value"]).reset_index(drop=True)
+    return column, work
+
+
+def ewma_analysis(
+    df: pd.DataFrame,
+    column: Optional[str] = None,
+    lam: float = 0.2,
+    L: float = 3.0,
+    target: Optional[float] = None,
+    sigma: Optional[float] = None,
+) -> AnalysisResult:
+    """Карта EWMA по столбцу (как I-MR: первый столбец — ID/время)."""
+    column, work = _series_frame(df, column)
+    chart = compute_ewma(work["value"].to_numpy(dtype=float), lam, L, target, sigma)
+    summary = {
+        "column": str(column),
+        "n": chart.n,
+        "target": chart.target, "sigma": chart.sigma, "lambda": chart.lam, "L": chart.L,
+        "UCL": float(chart.ucl[-1]), "LCL": float(chart.lcl[-1]),
+        "signals": int(chart.signals.sum()),
+        "first_signal": work["id"][int(chart.signals.argmax())] if chart.signals.any() else None,
+        "stable": chart.stable(),
+    }
+    points = pd.concat([work[["id"]], chart.data()], axis=1)
+    plots = [(f"EWMA: {column}", lambda: plot_ewma(chart, xlabel="Observation"))]
+    return AnalysisResult(summary, {"ewma_points": points}, plots)
+
+
+def cusum_analysis(
+    df: pd.DataFrame,
+    column: Optional[str] = None,
+    k: float = 0.5,
+    h: float = 5.0,
+    target: Optional[float] = None,
+    sigma: Optional[float] = None,
+) -> AnalysisResult:
+    """Табличный CUSUM по столбцу (как I-MR: первый столбец — ID/время)."""
+    column, work = _series_frame(df, column)
+    chart = compute_cusum(work["value"].to_numpy(dtype=float), k, h, target, sigma)
+    summary = {
+        "column": str(column),
+        "n": chart.n,
+        "target": chart.target, "sigma": chart.sigma, "k": chart.k, "h": chart.h, "H": chart.H,
+        "signals_upper": int(chart.signals_upper.sum()),
+        "signals_lower": int(chart.signals_lower.sum()),
+        "first_signal": work["id"][int(chart.signals.argmax())] if chart.signals.any() else None,
+        "stable": chart.stable(),
+    }
+    points = pd.concat([work[["id"]], chart.data()], axis=1)
+    points["shift_estimate"] = chart.shift_estimate()
+    plots = [(f"CUSUM: {column}", lambda: plot_cusum(chart, xlabel="Observation"))]
+    return AnalysisResult(summary, {"cusum_points": points}, plots)
+
+
+def capability_analysis(
+    df: pd.DataFrame,
+    column: str,
+    lsl: float,
+    usl: float,
+    target: Optional[float] = None,
+    bootstrap: int = 0,
+    confidence: float = 0.95,
+    seed: Optional[int] = 0,
+    distribution: Optional[str] = None,
+    criterion: str = "aic",
+) -> AnalysisResult:
+    """
+    Как страница «Zdolność procesu»: Cp/Cpk (σ внутри), Pp/Ppk/Cpm (общее σ), PPM и доля вне допусков.
+    bootstrap > 0 — число бутстреп-выборок для интервалов Cp/Cpk/Pp/Ppk (таблица bootstrap_ci).
+    distribution — "auto" (лучшая по criterion) или имя из utils.distributions.CANDIDATES:
+    индексы методом процентилей ISO 22514-2 (summary["percentile"], таблица distribution_fits).
+    """
+    data = pd.to_numeric(df[column], errors="coerce").dropna().to_numpy(dtype=float)
+    if data.size < 2:
+        raise ValueError(f"Column {column!r} has fewer than 2 numeric values")
+    ind = capability_indices(data, lsl, usl, target).iloc[0]
+    summary = {
+        "column": str(column),
+        "n": int(data.size),
+        "mean": float(ind["mean"]),
+        "std": _finite(ind["std_overall"]),
+        "std_within": _finite(ind["std_within"]),
+        "median": float(np.median(data)),
+        "min": float(data.min()),
+        "max": float(data.max()),
+        "LSL": lsl, "USL": usl, "target": target,
+        **{k: _finite(ind[k]) for k in ("Cp", "Cpk", "Pp", "Ppk", "Cpm", "ppm_below", "ppm_above", "ppm_total")},
+        "pct_below_lsl": float(ind["pct_below_lsl"]),
+        "pct_above_usl": float(ind["pct_above_usl"]),
+    }
+    tables = {}
+    if bootstrap:
+        ci = bootstrap_capability(data, lsl, usl, n_boot=bootstrap, confidence=confidence, seed=seed)
+        summary["bca_ci"] = {k: [_finite(ci.at[k, "bca_lower"]), _finite(ci.at[k, "bca_upper"])] for k in ci.index}
+        tables["bootstrap_ci"] = ci.reset_index()
+    if distribution:
+        fits = fit_distributions(data)
+        if distribution == "auto":
+            fit = select_fit(fits, criterion)
+        else:
+            fit = next((f for f in fits if f.name == distribution and f.ok), None)
+            if fit is None:
+                raise ValueError(f"distribution {distribution!r} is not available or could not be fitted")
+        pc = percentile_capability(fit, lsl, usl)
+        summary["percentile"] = {k: (v if isinstance(v, str) else _finite(v)) for k, v in pc.items()}
+        tables["distribution_fits"] = fit_table(fits)
+    return AnalysisResult(summary, tables)
+
+
+def capability_table_analysis(
+    df: pd.DataFrame,
+    lsl=None,
+    usl=None,
+    target=None,
+    columns: Optional[Sequence[str]] = None,
+) -> AnalysisResult:
+    """
+    Индексы воспроизводимости по всем числовым столбцам одним вызовом;
+    lsl/usl/target — число или словарь {столбец: граница}.
+    """
+    columns = list(columns) if columns is not None else list(_numeric_frame(df).columns)
+    table = capability_table(df, lsl, usl, target, columns).rename_axis("column").reset_index()
+    table["column"] = table["column"].astype(str)
+    summary = {
+        "columns": int(len(table)),
+        "below_1_33": [c for c, v in zip(table["column"], table["Ppk"]) if v < 1.33],
+    }
+    return AnalysisResult(summary, {"capability": table})
+
+
+def stability_analysis(df: pd.DataFrame, series: Optional[Sequence[str]] = None) -> AnalysisResult:
+    """
+    Как страница «Стабильность»: столбцы Parameter, Time, Min, Max, далее серии.
+    Для каждой серии — линейная регрессия значения от времени.
+    """
+    parameter_name = df.iloc[0, 0]
+    min_spec = pd.to_numeric(df["Min"], errors="coerce").iloc[0]
+    max_spec = pd.to_numeric(df["Max"], errors="coerce").iloc[0]
+    time = pd.to_numeric(df["Time"], errors="coerce")
+    series = list(series) if series is not None else list(df.columns[4:])
+
+    values = df[series].apply(pd.to_numeric, errors="coerce")
+    reg = batch_linregress(time.to_numpy(dtype=float), values)
+    reg = reg[reg["n"] >= 2]
+    rows = [
+        {
+            "series": str(col),
+            "slope": row.slope,
+            "intercept": row.intercept,
+            "r_value": row.rvalue,
+            "p_value": row.pvalue,
+            "std_err": row.stderr,
+        }
+        for col, row in reg.iterrows()
+    ]
+    table = pd.DataFrame(rows)
+
+    # Срок годности по ICH Q1E (тесты объединения серий + доверительная граница)
+    q1e_time, q1e_values, _, _, names = study_arrays(df, series)
+    q1e = fit_stability(q1e_time, q1e_values, min_spec, max_spec)
+    q1e_summary = q1e.summary()
+    limiting = q1e_summary.pop("limiting_batch")
+    q1e_summary["limiting_batch"] = str(names[limiting]) if limiting >= 0 else None
+
+    summary = {
+        "parameter": None if pd.isna(parameter_name) else str(parameter_name),
+        "min_spec": _finite(min_spec),
+        "max_spec": _finite(max_spec),
+        "series": {r["series"]: {k: _finite(v) for k, v in r.items() if k != "series"} for r in rows},
+        "ich_q1e": q1e_summary,
+    }
+    shelf_life = q1e.to_frame(names=[str(n) for n in names])
+    return AnalysisResult(summary, {"regression": table, "shelf_life": shelf_life})
+
+
+def temp_humidity_analysis(
+    df: pd.DataFrame,
+    temp_limits: Tuple[float, float] = (23, 27),
+    hum_limits: Tuple[float, float] = (55, 65),
+) -> AnalysisResult:
+    """Как страница «Температура/влажность»: df читается с header=None, skiprows=1."""
+    work = normalize_logger_frame(df).sort_values("time", kind="stable").reset_index(drop=True)
+
+    limits = {"temperature": tuple(temp_limits), "humidity": tuple(hum_limits)}
+    summary = {"n": int(len(work))}
+    for col in ("temperature", "humidity"):
+        s = work[col]
+        mean = float(s.mean())
+        summary[col] = {
+            "mean": _finite(mean),
+            "min": _finite(s.min()),
+            "max": _finite(s.max()),
+            "rsd": _finite(s.std() / mean * 100) if mean else None,
+        }
+    crossings = find_threshold_crossings(work, limits)
+    events = excursion_events(work, limits)
+    out_of_range = time_out_of_range(work, limits)
+    summary["crossings"] = int(len(crossings))
+    summary["excursions"] = int(len(events))
+    weights = interval_weights(work["time"])
+    summary["mkt"] = _finite(mean_kinetic_temperature(work["temperature"].to_numpy(), weights))
+    summary["time_out_of_range_h"] = {
+        f"{r.parameter}_{r.limit}": r.time_out.total_seconds() / 3600 for r in out_of_range.itertuples()
+    }
+    return AnalysisResult(summary, {
+        "crossings": crossings,
+        "excursions": events,
+        "time_out_of_range": out_of_range,
+        "daily": period_summary(work, limits, freq="D"),
+    })
+
+
+def group_comparison_analysis(df: pd.DataFrame, paired: bool = False, alpha: float = 0.05) -> AnalysisResult:
+    """Как страница «Статистический анализ»: каждая колонка — группа."""
+    from STATANALYZE.analyzer import analyze_groups
+
+    numeric = _numeric_frame(df).dropna(how="all")
+    groups = [numeric[col].dropna().tolist() for col in numeric.columns]
+    result = analyze_groups(groups, paired=paired, alpha=alpha)
+    result["groups"] = [str(c) for c in numeric.columns]
+    result["shapiro_p"] = [float(p) for p in result["shapiro_p"]]
+    if result["levene_p"] is not None:
+        result["levene_p"] = float(result["levene_p"])
+    table = pd.DataFrame(result["group_summary"], index=result["groups"]).rename_axis("group").reset_index()
+    return AnalysisResult(result, {"group_summary": table})
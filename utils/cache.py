@@ -0,0 +1,200 @@
+# utils/cache.py
+import dataclasses
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["BoundedCache", "CACHES", "content_hash", "hash_data", "estimate_size"]
+
+# Все именованные кэши процесса: имя -> BoundedCache (для отчёта о попаданиях)
+CACHES: Dict[str, "BoundedCache"] = {}
+
+
+def content_hash(data: bytes) -> str:
+    """Короткий стабильный хэш содержимого (ключ кэша для загруженных файлов)."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def hash_data(*parts: Any) -> str:
+    """
+    Хэш набора аргументов для ключей кэша:
+      - ndarray          -> dtype, shape и байты
+      - DataFrame/Series -> hash_pandas_object (значения + индекс) и имена столбцов
+      - bytes            -> как есть
+      - list/tuple/dict  -> поэлементно, если внутри есть массивы или вложенные контейнеры
+      - прочее           -> repr (числа, строки, кортежи параметров)
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _hash_into(h, parts)
+    return h.hexdigest()
+
+
+def _hash_into(h, parts) -> None:
+    nested = (np.ndarray, pd.DataFrame, pd.Series, list, tuple, dict)
+    for part in parts:
+        if isinstance(part, dict) and any(isinstance(v, nested) for v in part.values()):
+            h.update(b"dict")
+            _hash_into(h, [x for item in part.items() for x in item])
+        elif isinstance(part, (list, tuple)) and any(isinstance(v, nested) for v in part):
+            # repr массива сокращается до "...", поэтому вложенные массивы хэшируем по байтам
+            h.update(type(part).__name__.encode())
+            _hash_into(h, part)
+        elif isinstance(part, (bytes, bytearray)):
+            h.update(bytes(part))
+        elif isinstance(part, np.ndarray):
+            arr = np.ascontiguousarray(part)
+            h.update(f"{arr.dtype}{arr.shape}".encode())
+            h.update(arr.tobytes() if arr.dtype != object else repr(arr.tolist()).encode())
+        elif isinstance(part, (pd.DataFrame, pd.Series)):
+            names = list(part.columns) if isinstance(part, pd.DataFrame) else [part.name]
+            h.update(repr(names).encode())
+            h.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"\x1f")
+
+
+def estimate_size(obj: Any) -> int:
+    """
+    Оценка занимаемой памяти в байтах:
+      - DataFrame/Series  -> memory_usage(deep=True)
+      - ndarray / bytes   -> nbytes / len
+      - dict/list/tuple   -> сумма по элементам
+      - dataclass         -> сумма по полям (результаты расчётов: ImRResult, XbarResult …)
+      - прочее            -> sys.getsizeof
+    """
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return sys.getsizeof(obj) + sum(estimate_size(getattr(obj, f.name)) for f in dataclasses.fields(obj))
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_size(v) for v in obj)
+    if hasattr(obj, "memory_usage"):
+        try:
+            usage = obj.memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+        except Exception:
+            pass
+    if hasattr(obj, "nbytes"):
+        return int(obj.nbytes)
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    return sys.getsizeof(obj)
+
+
+class BoundedCache:
+    """
+    Потокобезопасный LRU-кэш с ограничением по числу записей и по суммарному размеру.
+    Общий для всех страниц и сессий Streamlit (живёт на уровне процесса).
+
+    ttl — время жизни записи в секундах (None — без ограничения); просроченная
+    запись считается промахом и удаляется при обращении. Кэш с именем name
+    регистрируется в CACHES.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = estimate_size,
+        ttl: Optional[float] = None,
+        name: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._stored: Dict[Hashable, float] = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if name is not None:
+            CACHES[name] = self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data and not self._expired(key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data and self._expired(key):
+                self._remove(key)
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            # Объект больше всего бюджета не кэшируем
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self._stored[key] = time.monotonic()
+            self._total += size
+            self._evict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Вернуть значение из кэша или вычислить и сохранить.
+        Вычисление идёт вне блокировки, чтобы не тормозить другие сессии.
+        """
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._stored.clear()
+            self._total = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._data),
+                "bytes": self._total,
+            }
+
+    # Методы ниже вызываются под блокировкой
+
+    def _expired(self, key: Hashable) -> bool:
+        return self.ttl is not None and time.monotonic() - self._stored[key] > self.ttl
+
+    def _remove(self, key: Hashable) -> None:
+        del self._data[key]
+        del self._stored[key]
+        self._total -= self._sizes.pop(key)
+
+    def _evict(self) -> None:
+        # Выбрасываем самые старые записи
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes is not None and self._total > self.max_bytes)
+        ):
+            self._remove(next(iter(self._data)))
@@ -0,0 +1,339 @@
+# utils/capability.py
+"""
+Индексы воспроизводимости процесса для многих столбцов одним вызовом.
+
+Данные — 2-D массив (наблюдения × столбцы) с NaN на месте пропусков,
+границы допуска — скаляры или массивы по столбцам. Все статистики считаются
+по оси 0 без циклов по столбцам:
+  σ внутри (within)  — MR̄ / d2 по соседним непропущенным значениям (как у карты I-MR);
+  σ общее (overall)  — выборочное стандартное отклонение (ddof=1).
+Cp, Cpk — по σ внутри; Pp, Ppk, Cpm и ожидаемые PPM — по общему σ.
+Односторонний допуск задаётся NaN/None на месте отсутствующей границы:
+двусторонние индексы (Cp, Pp, Cpm) тогда NaN, Cpk/Ppk — по имеющейся стороне.
+
+bootstrap_capability — доверительные интервалы (перцентильные и BCa) для
+Cp/Cpk/Pp/Ppk: выборки строятся матрицей индексов (n × B) по частям, каждая
+часть получает свой поток SeedSequence.spawn, поэтому результат при заданном
+seed не зависит от числа процессов.
+
+percentile_capability — индексы по ISO 22514-2 (метод процентилей) для
+подогнанного ненормального распределения: 6σ заменяется на X99.865 − X0.135,
+среднее — на медиану X50, PPM — по функции распределения подгонки.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.spc.imr import D2
+
+__all__ = [
+    "INDEX_COLUMNS",
+    "BOOTSTRAP_INDICES",
+    "within_sigma",
+    "capability_indices",
+    "capability_table",
+    "bootstrap_capability",
+    "percentile_capability",
+]
+
+# Порядок столбцов результата
+INDEX_COLUMNS = [
+    "n", "mean", "std_within", "std_overall",
+    "Cp", "Cpl", "Cpu", "Cpk", "Pp", "Ppl", "Ppu", "Ppk", "Cpm",
+    "ppm_below", "ppm_above", "ppm_total", "pct_below_lsl", "pct_above_usl",
+]
+
+Limit = Union[None, float, Sequence[float], np.ndarray]
+
+# Индексы, для которых строятся бутстреп-интервалы
+BOOTSTRAP_INDICES = ["Cp", "Cpk", "Pp", "Ppk"]
+
+# Элементов в одной матрице выборок (n × часть B): ≈ 16 МБ float64
+BOOTSTRAP_CHUNK_ELEMENTS = 2_000_000
+
+# Меньше стольких выборок пул процессов не окупает запуск
+PARALLEL_MIN_RESAMPLES = 20_000
+
+
+def _as_2d(data) -> np.ndarray:
+    x = np.asarray(data, dtype=float)
+    return x[:, None] if x.ndim == 1 else x
+
+
+def _limit(value: Limit, m: int) -> np.ndarray:
+    if value is None:
+        return np.full(m, np.nan)
+    arr = np.asarray(value, dtype=float)
+    return np.broadcast_to(np.where(np.isfinite(arr), arr, np.nan), (m,)).astype(float)
+
+
+def within_sigma(data) -> np.ndarray:
+    """MR̄/d2 по каждому столбцу; пропуски удаляются до расчёта скользящих размахов."""
+    x = _as_2d(data)
+    # NaN в конец столбца (порядок значений сохраняется) — соседние пары как после dropna()
+    order = np.argsort(np.isnan(x), axis=0, kind="stable")
+    x = np.take_along_axis(x, order, axis=0)
+    mr = np.abs(np.diff(x, axis=0))
+    with np.errstate(invalid="ignore"):
+        count = np.isfinite(mr).sum(axis=0)
+        mr_bar = np.where(count > 0, np.nansum(mr, axis=0) / np.maximum(count, 1), np.nan)
+    return mr_bar / D2
+
+
+def capability_indices(
+    data,
+    lsl: Limit = None,
+    usl: Limit = None,
+    target: Limit = None,
+    names: Optional[Sequence] = None,
+) -> pd.DataFrame:
+    """
+    Индексы по каждому столбцу data (1-D — один столбец). lsl/usl/target —
+    скаляры или массивы длины числа столбцов; target по умолчанию —
+    середина допуска. Строка результата — столбец, столбцы — INDEX_COLUMNS.
+    """
+    from scipy.special import ndtr
+
+    x = _as_2d(data)
+    m = x.shape[1]
+    lo, hi = _limit(lsl, m), _limit(usl, m)
+    tgt = _limit(target, m)
+    tgt = np.where(np.isnan(tgt), (lo + hi) / 2, tgt)
+
+    valid = ~np.isnan(x)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(x, axis=0) / n
+        dev = np.where(valid, x - mean, 0.0)
+        s_overall = np.sqrt((dev * dev).sum(axis=0) / (n - 1))
+        s_overall[n < 2] = np.nan
+        s_within = within_sigma(x)
+
+        def _indices(sigma):
+            lower = (mean - lo) / (3 * sigma)
+            upper = (hi - mean) / (3 * sigma)
+            both = (hi - lo) / (6 * sigma)
+            return both, lower, upper, np.fmin(lower, upper)
+
+        cp, cpl, cpu, cpk = _indices(s_within)
+        pp, ppl, ppu, ppk = _indices(s_overall)
+        cpm = (hi - lo) / (6 * np.sqrt(s_overall ** 2 + (mean - tgt) ** 2))
+
+        # Ожидаемая доля вне допуска по нормальному распределению с общим σ
+        ppm_below = np.where(np.isnan(lo), 0.0, ndtr((lo - mean) / s_overall) * 1e6)
+        ppm_above = np.where(np.isnan(hi), 0.0, ndtr((mean - hi) / s_overall) * 1e6)
+        ppm_below[np.isnan(s_overall)] = np.nan
+        ppm_above[np.isnan(s_overall)] = np.nan
+        pct_below = (x < lo).sum(axis=0) / n * 100
+        pct_above = (x > hi).sum(axis=0) / n * 100
+
+    table = pd.DataFrame({
+        "n": n,
+        "mean": mean,
+        "std_within": s_within,
+        "std_overall": s_overall,
+        "Cp": cp, "Cpl": cpl, "Cpu": cpu, "Cpk": cpk,
+        "Pp": pp, "Ppl": ppl, "Ppu": ppu, "Ppk": ppk,
+        "Cpm": cpm,
+        "ppm_below": ppm_below,
+        "ppm_above": ppm_above,
+        "ppm_total": ppm_below + ppm_above,
+        "pct_below_lsl": pct_below,
+        "pct_above_usl": pct_above,
+    }, columns=INDEX_COLUMNS)
+    if names is not None:
+        table.index = pd.Index(list(names))
+    # ±inf при нулевом σ (все значения одинаковы) не несут смысла
+    return table.replace([np.inf, -np.inf], np.nan)
+
+
+def _per_column(value, columns) -> Limit:
+    if isinstance(value, Mapping):
+        return np.array([value.get(c, np.nan) for c in columns], dtype=float)
+    if isinstance(value, pd.Series):
+        return value.reindex(columns).to_numpy(dtype=float)
+    return value
+
+
+def capability_table(
+    df: pd.DataFrame,
+    lsl=None,
+    usl=None,
+    target=None,
+    columns: Optional[Sequence] = None,
+) -> pd.DataFrame:
+    """
+    Индексы по столбцам DataFrame (нечисловые значения -> NaN). lsl/usl/target —
+    скаляр, словарь или Series {столбец: граница}; столбцы без границы получают NaN.
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    values = df[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    return capability_indices(
+        values,
+        _per_column(lsl, columns),
+        _per_column(usl, columns),
+        _per_column(target, columns),
+        names=columns,
+    )
+
+
+def _index_matrix(x: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    """(4 × B) Cp, Cpk, Pp, Ppk по столбцам матрицы без пропусков (n × B)."""
+    n = x.shape[0]
+    mean = x.mean(axis=0)
+    s_overall = x.std(axis=0, ddof=1)
+    s_within = np.abs(np.diff(x, axis=0)).mean(axis=0) / D2
+    out = np.empty((4, x.shape[1]))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for row, sigma in ((0, s_within), (2, s_overall)):
+            out[row] = (hi - lo) / (6 * sigma)
+            out[row + 1] = np.fmin((mean - lo) / (3 * sigma), (hi - mean) / (3 * sigma))
+    out[~np.isfinite(out)] = np.nan
+    return out if n > 1 else np.full_like(out, np.nan)
+
+
+def _resample_chunk(x: np.ndarray, lo: float, hi: float, size: int, block: int, seed) -> np.ndarray:
+    """Индексы блочного бутстрепа (блоки по block подряд идущих точек) и индексы по ним."""
+    rng = np.random.default_rng(seed)
+    n = x.shape[0]
+    n_blocks = -(-n // block)
+    starts = rng.integers(0, n - block + 1, size=(n_blocks, 1, size))
+    idx = (starts + np.arange(block)[None, :, None]).reshape(n_blocks * block, size)[:n]
+    return _index_matrix(x[idx], lo, hi)
+
+
+def _jackknife(x: np.ndarray, lo: float, hi: float, groups: int = 1000) -> np.ndarray:
+    """
+    (4 × g) индексы без одной группы подряд идущих точек: ряд делится на
+    g = min(n, groups) групп по d или d + 1 точек (как np.array_split), так что
+    каждая точка выпадает ровно один раз; при n ≤ groups — без одной точки.
+    """
+    n = x.shape[0]
+    g = min(n, groups)
+    sizes = np.full(g, n // g)
+    sizes[:n % g] += 1
+    starts = np.cumsum(sizes) - sizes
+    out = np.empty((4, g))
+    for d in np.unique(sizes):
+        # Строка i столбца j: i-я точка ряда без точек starts[j] … starts[j] + d − 1
+        rows = np.arange(n - d)[:, None]
+        cols = np.flatnonzero(sizes == d)
+        step = max(BOOTSTRAP_CHUNK_ELEMENTS // n, 1)
+        for first in range(0, cols.size, step):
+            part = cols[first:first + step]
+            idx = rows + d * (rows >= starts[part][None, :])
+            out[:, part] = _index_matrix(x[idx], lo, hi)
+    return out
+
+
+def _acceleration(jack: np.ndarray) -> float:
+    """Ускорение BCa по джекнайф-оценкам: a = Σ(θ̄ − θ_j)³ / (6 · (Σ(θ̄ − θ_j)²)^{3/2})."""
+    j = jack[np.isfinite(jack)]
+    dev = j.mean() - j
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return float((dev ** 3).sum() / (6 * (dev ** 2).sum() ** 1.5))
+
+
+def bootstrap_capability(
+    values: Sequence[float],
+    lsl: Optional[float] = None,
+    usl: Optional[float] = None,
+    n_boot: int = 10_000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    block_length: Optional[int] = None,
+    max_workers: Optional[int] = 1,
+) -> pd.DataFrame:
+    """
+    Бутстреп-интервалы Cp, Cpk, Pp, Ppk: строка — индекс, столбцы —
+    estimate, bias, se, pct_lower/pct_upper (перцентильный) и bca_lower/bca_upper.
+    Выборки — блочный бутстреп (по умолчанию блок ⌈n^(1/3)⌉), чтобы σ внутри
+    по скользящим размахам сохраняла порядок соседних точек; block_length=1 —
+    обычный бутстреп. max_workers > 1 (или None — по числу CPU) распределяет
+    части по процессам; при одном seed результат одинаков при любом числе процессов.
+    """
+    from scipy.special import ndtr, ndtri
+
+    x = np.asarray(values, dtype=float)
+    x = x[~np.isnan(x)]
+    n = x.shape[0]
+    if n < 3:
+        raise ValueError("bootstrap requires at least 3 observations")
+    lo = np.nan if lsl is None else float(lsl)
+    hi = np.nan if usl is None else float(usl)
+    block = int(block_length or np.ceil(n ** (1 / 3)))
+    block = min(max(block, 1), n)
+
+    size = max(BOOTSTRAP_CHUNK_ELEMENTS // n, 1)
+    sizes = [min(size, n_boot - start) for start in range(0, n_boot, size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(max_workers or os.cpu_count() or 1, len(sizes))
+    args = [(x, lo, hi, k, block, s) for k, s in zip(sizes, seeds)]
+    if workers > 1 and n_boot >= PARALLEL_MIN_RESAMPLES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_resample_chunk, *zip(*args)))
+    else:
+        parts = [_resample_chunk(*a) for a in args]
+    boot = np.concatenate(parts, axis=1)
+
+    estimate = _index_matrix(x[:, None], lo, hi)[:, 0]
+    jack = _jackknife(x, lo, hi)
+    alpha = (1 - confidence) / 2
+    z = ndtri(np.array([alpha, 1 - alpha]))
+    stats = np.full((4, 6), np.nan)            # bias, se, pct_lower, pct_upper, bca_lower, bca_upper
+    for i in range(4):
+        b = boot[i][np.isfinite(boot[i])]
+        if b.size < 2 or not np.isfinite(estimate[i]):
+            continue
+        stats[i, :2] = b.mean() - estimate[i], b.std(ddof=1)
+        stats[i, 2:4] = np.quantile(b, [alpha, 1 - alpha])
+
+        # BCa: поправка смещения z0 по доле выборок ниже оценки, ускорение a — по джекнайфу
+        z0 = ndtri(((b < estimate[i]).sum() + 0.5 * (b == estimate[i]).sum()) / b.size)
+        # Влияние группы — сумма влияний её точек, кумулянты складываются, и формула
+        # групповой оценки та же, что у джекнайфа без одной точки
+        a = _acceleration(jack[i])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            adj = ndtr(z0 + (z0 + z) / (1 - a * (z0 + z)))
+        if np.isfinite(adj).all():
+            stats[i, 4:] = np.quantile(b, adj)
+
+    return pd.DataFrame(
+        stats, columns=["bias", "se", "pct_lower", "pct_upper", "bca_lower", "bca_upper"],
+        index=pd.Index(BOOTSTRAP_INDICES, name="index"),
+    ).assign(estimate=estimate)[["estimate", "bias", "se", "pct_lower", "pct_upper", "bca_lower", "bca_upper"]]
+
+
+def percentile_capability(fit, lsl: Optional[float] = None, usl: Optional[float] = None) -> pd.Series:
+    """
+    Pp, Ppl, Ppu, Ppk по ISO 22514-2 для подгонки (utils.distributions.DistributionFit):
+    Pp = (USL − LSL) / (X99.865 − X0.135), Ppl = (X50 − LSL) / (X50 − X0.135),
+    Ppu = (USL − X50) / (X99.865 − X50); ожидаемые PPM — по cdf подгонки.
+    """
+    from scipy.special import ndtr
+
+    dist = fit.dist
+    q_lo, q_mid, q_hi = dist.ppf([ndtr(-3.0), 0.5, ndtr(3.0)])
+    lo = np.nan if lsl is None else float(lsl)
+    hi = np.nan if usl is None else float(usl)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ppl = (q_mid - lo) / (q_mid - q_lo)
+        ppu = (hi - q_mid) / (q_hi - q_mid)
+        below = 0.0 if np.isnan(lo) else float(dist.cdf(lo)) * 1e6
+        above = 0.0 if np.isnan(hi) else float(dist.sf(hi)) * 1e6
+    return pd.Series({
+        "distribution": fit.name,
+        "X0.135": q_lo,
+        "X50": q_mid,
+        "X99.865": q_hi,
+        "Pp": (hi - lo) / (q_hi - q_lo),
+        "Ppl": ppl,
+        "Ppu": ppu,
+        "Ppk": np.fmin(ppl, ppu),
+        "ppm_below": below,
+        "ppm_above": above,
+        "ppm_total": below + above,
+    })
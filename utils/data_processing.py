@@ -1,15 +1,89 @@
 import pandas as pd
 import numpy as np
 
+# Wiersze w kolejności pandas.describe + RSD
+DESCRIBE_ROWS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max", "RSD (%)"]
+
+
+def _column_quantiles(sorted_arr, counts, qs):
+    # Kwantyle metodą liniową (jak pandas/numpy) z już posortowanej macierzy;
+    # NaN po sortowaniu są na końcu, więc pozycja zależy tylko od liczby wartości w kolumnie
+    cols = np.arange(sorted_arr.shape[1])
+    last = np.maximum(counts - 1, 0)
+    out = []
+    for q in qs:
+        pos = q * last
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, last)
+        frac = pos - lo
+        val = sorted_arr[lo, cols] * (1 - frac) + sorted_arr[hi, cols] * frac
+        out.append(np.where(counts > 0, val, np.nan))
+    return out
+
+
+def describe_batch(df):
+    # Wszystkie statystyki dla wszystkich kolumn z jednej macierzy 2-D:
+    # jedno sortowanie (kwantyle, min, max) i jeden przebieg momentów (średnia, std, skośność, kurtoza)
+    arr = df.to_numpy(dtype=float, na_value=np.nan)
+    if arr.ndim == 1:
+        arr = arr.reshape(-1, 1)
+    valid = ~np.isnan(arr)
+    counts = valid.sum(axis=0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, arr, 0.0).sum(axis=0) / counts
+        dev = np.where(valid, arr - mean, 0.0)
+        dev2 = dev * dev
+        m2 = dev2.sum(axis=0) / counts
+        m3 = (dev2 * dev).sum(axis=0) / counts
+        m4 = (dev2 * dev2).sum(axis=0) / counts
+        std = np.sqrt(dev2.sum(axis=0) / (counts - 1))
+
+        sorted_arr = np.sort(arr, axis=0)
+        q25, q50, q75 = _column_quantiles(sorted_arr, counts, (0.25, 0.5, 0.75))
+        cols = np.arange(arr.shape[1])
+        vmin = np.where(counts > 0, sorted_arr[0, cols], np.nan)
+        vmax = np.where(counts > 0, sorted_arr[np.maximum(counts - 1, 0), cols], np.nan)
+
+        # Skośność i kurtoza (Fisher) jak scipy.stats.skew/kurtosis z bias=True;
+        # dla n < 3 lub próby stałej — NaN. Stałość sprawdzamy po rozstępie, a nie po m2:
+        # dla stałych ułamków (0.1, 1.23 …) m2 to szum zmiennoprzecinkowy, nie zero
+        defined = (counts >= 3) & (vmax > vmin)
+        skewness = np.where(defined, m3 / m2 ** 1.5, np.nan)
+        kurt = np.where(defined, m4 / (m2 * m2) - 3.0, np.nan)
+        rsd = std / mean * 100
+
+    return pd.DataFrame(
+        [counts.astype(float), mean, std, vmin, q25, q50, q75, vmax, rsd, skewness, kurt],
+        index=DESCRIBE_ROWS + ["skewness", "kurtosis"],
+        columns=df.columns,
+    )
+
+
+def shapiro_pvalues(df):
+    # Shapiro-Wilk nie ma postaci wektorowej — liczymy kolumna po kolumnie,
+    # tylko tam, gdzie test ma sens (n >= 3 i co najmniej dwie różne wartości)
+    from scipy.stats import shapiro
+
+    arr = df.to_numpy(dtype=float, na_value=np.nan)
+    out = np.full(arr.shape[1], np.nan)
+    for j in range(arr.shape[1]):
+        col = arr[:, j]
+        col = col[~np.isnan(col)]
+        if col.size < 3 or np.ptp(col) == 0:
+            continue
+        try:
+            out[j] = shapiro(col).pvalue
+        except Exception:
+            pass
+    return pd.Series(out, index=df.columns)
+
+
 def calculate_descriptive_stats(df):
     # Najpierw bierzemy tylko kolumny numeryczne (jeśli występują inne typy)
     numeric_df = df.select_dtypes(include=[np.number])
-    
-    # Uzyskujemy standardowe statystyki i kwantyle
-    stats = numeric_df.describe(percentiles=[0.25, 0.5, 0.75])
-    
-    # Dodajemy wiersz RSD (%) na końcu
-    # Uwaga: aby dodać nowy wiersz do describe, sięgamy po loc
-    stats.loc['RSD (%)'] = (stats.loc['std'] / stats.loc['mean']) * 100
-    
+
+    # Standardowe statystyki, kwantyle i RSD (%) z jednego przebiegu
+    stats = describe_batch(numeric_df).loc[DESCRIBE_ROWS]
+
     return stats.round(2)
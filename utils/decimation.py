@@ -0,0 +1,97 @@
+# utils/decimation.py
+"""
+Прореживание длинных рядов перед отрисовкой.
+
+Ряд делится на корзины (примерно по корзине на пиксель по оси X), в каждой
+корзине остаются первая и последняя точки, минимум и максимум. Линия на
+графике выглядит так же, как по всем точкам: пики и выходы за лимиты не
+теряются, а точек рисуется не больше MAX_POINTS.
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ["MAX_POINTS", "MAX_TICKS", "decimate_indices", "decimate", "tick_positions"]
+
+# Потолок точек на одну линию (≈ 4 точки на пиксель ширины графика 10" × 100 dpi)
+MAX_POINTS = 4000
+# Потолок подписей по оси X для категориальных осей (номера серий и т.п.)
+MAX_TICKS = 40
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").view("i8").astype(float)
+    if np.issubdtype(x.dtype, np.timedelta64):
+        return x.astype("timedelta64[ns]").view("i8").astype(float)
+    return x.astype(float)
+
+
+def _first_match(values: np.ndarray, target: np.ndarray, bucket: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Индекс первой точки каждой корзины, где values == target[корзина]; -1 если нет."""
+    hits = np.flatnonzero(values == target[bucket])
+    out = np.full(n_buckets, -1, dtype=np.int64)
+    # hits возрастают, поэтому при записи в обратном порядке остаётся первое совпадение
+    out[bucket[hits][::-1]] = hits[::-1]
+    return out
+
+
+def decimate_indices(
+    x: Optional[Sequence] = None,
+    y: Sequence = (),
+    max_points: int = MAX_POINTS,
+    keep: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Отсортированные индексы точек, которые нужно нарисовать.
+    x — координаты (числа или даты, по возрастанию); None — корзины по номеру точки.
+    keep — булева маска точек, которые нужно сохранить обязательно (сигналы карт).
+    Ряд короче max_points возвращается целиком.
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.shape[0]
+    if n <= max_points:
+        return np.arange(n)
+
+    n_buckets = max(max_points // 4, 1)
+    if x is None:
+        bucket = (np.arange(n) * n_buckets) // n
+    else:
+        xf = _as_float(np.asarray(x))
+        span = xf[-1] - xf[0]
+        if not np.isfinite(span) or span <= 0:
+            bucket = (np.arange(n) * n_buckets) // n
+        else:
+            bucket = np.minimum(((xf - xf[0]) / span * n_buckets).astype(np.int64), n_buckets - 1)
+
+    starts = np.flatnonzero(np.diff(bucket, prepend=-1))          # первая точка каждой непустой корзины
+    ids = bucket[starts]
+    with np.errstate(invalid="ignore"):
+        lo = np.full(n_buckets, np.nan)
+        hi = np.full(n_buckets, np.nan)
+        lo[ids] = np.fmin.reduceat(y, starts)
+        hi[ids] = np.fmax.reduceat(y, starts)
+    ends = np.append(starts[1:], n) - 1
+
+    picked = np.zeros(n, dtype=bool)
+    picked[starts] = True
+    picked[ends] = True
+    for idx in (_first_match(y, lo, bucket, n_buckets), _first_match(y, hi, bucket, n_buckets)):
+        picked[idx[idx >= 0]] = True
+    if keep is not None:
+        picked |= np.asarray(keep, dtype=bool)
+    return np.flatnonzero(picked)
+
+
+def decimate(x, y, max_points: int = MAX_POINTS, keep: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """(x, y) после прореживания; x=None — номера точек 0..n-1."""
+    y = np.asarray(y)
+    idx = decimate_indices(x, y, max_points, keep)
+    xs = np.arange(y.shape[0]) if x is None else np.asarray(x)
+    return xs[idx], y[idx]
+
+
+def tick_positions(n: int, max_ticks: int = MAX_TICKS, start: int = 0) -> np.ndarray:
+    """Не более max_ticks равномерно расставленных позиций подписей из start..start+n-1."""
+    step = max(int(np.ceil(n / max_ticks)), 1)
+    return np.arange(start, start + n, step)
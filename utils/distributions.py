@@ -0,0 +1,161 @@
+# utils/distributions.py
+"""
+Подбор распределений для анализа воспроизводимости ненормальных данных.
+
+Кандидаты (нормальное, логнормальное, Вейбулла и гамма с порогом, Джонсона SU
+и SB) подгоняются методом максимального правдоподобия, при большом объёме
+данных — параллельно в пуле процессов. Для каждого считаются AIC и
+статистика Андерсона–Дарлинга; выбор — по минимуму выбранного критерия.
+
+Подгонка зависит только от данных, поэтому кэшируется по хэшу значений:
+смена LSL/USL или критерия выбора не вызывает повторной подгонки.
+"""
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import BoundedCache, hash_data
+
+__all__ = [
+    "CANDIDATES",
+    "LABELS",
+    "FIT_CACHE",
+    "DistributionFit",
+    "anderson_darling",
+    "fit_distributions",
+    "fit_table",
+    "select_fit",
+]
+
+# Имя -> имя распределения scipy.stats (у всех параметр loc свободный: для
+# логнормального, Вейбулла и гамма это порог, т.е. трёхпараметрические модели)
+CANDIDATES: Dict[str, str] = {
+    "normal": "norm",
+    "lognormal": "lognorm",
+    "weibull": "weibull_min",
+    "gamma": "gamma",
+    "johnson_su": "johnsonsu",
+    "johnson_sb": "johnsonsb",
+}
+
+LABELS = {
+    "normal": "Normal",
+    "lognormal": "Lognormal (3P)",
+    "weibull": "Weibull (3P)",
+    "gamma": "Gamma (3P)",
+    "johnson_su": "Johnson SU",
+    "johnson_sb": "Johnson SB",
+}
+
+# Подгонки по хэшу данных; результат — несколько чисел на кандидата
+FIT_CACHE = BoundedCache(max_entries=64, max_bytes=8 * 1024 * 1024, name="distribution_fits")
+
+# Меньше стольких точек подгонка занимает миллисекунды — пул процессов не окупается
+PARALLEL_MIN_POINTS = 5_000
+
+
+@dataclass(frozen=True)
+class DistributionFit:
+    name: str
+    params: Tuple[float, ...]
+    loglik: float
+    aic: float
+    ad: float
+
+    @property
+    def label(self) -> str:
+        return LABELS.get(self.name, self.name)
+
+    @property
+    def dist(self):
+        """Замороженное распределение scipy.stats с подогнанными параметрами."""
+        from scipy import stats
+        return getattr(stats, CANDIDATES[self.name])(*self.params)
+
+    @property
+    def ok(self) -> bool:
+        return bool(np.isfinite(self.aic))
+
+
+def anderson_darling(sorted_x: np.ndarray, cdf) -> float:
+    """A² для отсортированной выборки и функции распределения cdf."""
+    n = sorted_x.shape[0]
+    u = np.clip(cdf(sorted_x), 1e-300, 1 - 1e-16)
+    i = np.arange(1, n + 1)
+    return float(-n - np.sum((2 * i - 1) * (np.log(u) + np.log1p(-u[::-1]))) / n)
+
+
+def _fit_one(name: str, x: np.ndarray) -> DistributionFit:
+    from scipy import stats
+
+    dist = getattr(stats, CANDIDATES[name])
+    failed = DistributionFit(name, (), float("nan"), float("inf"), float("inf"))
+    with warnings.catch_warnings(), np.errstate(all="ignore"):
+        warnings.simplefilter("ignore")
+        try:
+            params = tuple(float(p) for p in dist.fit(x))
+        except Exception:
+            return failed
+        loglik = float(dist.logpdf(x, *params).sum())
+        if not np.isfinite(loglik):
+            return failed
+        ad = anderson_darling(np.sort(x), lambda v: dist.cdf(v, *params))
+    return DistributionFit(name, params, loglik, 2 * len(params) - 2 * loglik, ad)
+
+
+def _fit_all(x: np.ndarray, names: Sequence[str], max_workers: Optional[int]) -> List[DistributionFit]:
+    workers = min(max_workers or os.cpu_count() or 1, len(names))
+    if workers > 1 and x.shape[0] >= PARALLEL_MIN_POINTS:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_fit_one, names, [x] * len(names)))
+        except Exception:
+            pass
+    return [_fit_one(name, x) for name in names]
+
+
+def fit_distributions(
+    values: Sequence[float],
+    candidates: Sequence[str] = tuple(CANDIDATES),
+    max_workers: Optional[int] = None,
+) -> List[DistributionFit]:
+    """
+    Подгонка всех кандидатов (NaN отбрасываются); порядок — как в candidates.
+    Неудавшаяся подгонка даёт aic = ad = inf. Результат кэшируется в FIT_CACHE.
+    """
+    x = np.asarray(values, dtype=float)
+    x = x[~np.isnan(x)]
+    if x.shape[0] < 3:
+        raise ValueError("distribution fitting requires at least 3 observations")
+    names = [c for c in candidates if c in CANDIDATES]
+    key = hash_data(x, tuple(names))
+    return FIT_CACHE.get_or_compute(key, lambda: _fit_all(x, names, max_workers))
+
+
+def select_fit(fits: Sequence[DistributionFit], criterion: str = "aic") -> DistributionFit:
+    """Лучшая подгонка по критерию "aic" или "ad" (меньше — лучше)."""
+    if criterion not in ("aic", "ad"):
+        raise ValueError("criterion must be 'aic' or 'ad'")
+    usable = [f for f in fits if f.ok]
+    if not usable:
+        raise ValueError("no candidate distribution could be fitted")
+    return min(usable, key=lambda f: getattr(f, criterion))
+
+
+def fit_table(fits: Sequence[DistributionFit]) -> pd.DataFrame:
+    """Сводка подгонок: распределение, параметры, log L, AIC, ΔAIC, A²."""
+    best = min((f.aic for f in fits if f.ok), default=np.nan)
+    return pd.DataFrame({
+        "distribution": [f.name for f in fits],
+        "label": [f.label for f in fits],
+        "params": [", ".join(f"{p:.4g}" for p in f.params) for f in fits],
+        "loglik": [f.loglik for f in fits],
+        "aic": [f.aic if f.ok else np.nan for f in fits],
+        "delta_aic": [f.aic - best if f.ok else np.nan for f in fits],
+        "ad": [f.ad if f.ok else np.nan for f in fits],
+    })
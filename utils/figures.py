@@ -0,0 +1,141 @@
+# utils/figures.py
+"""
+Рендер графиков matplotlib в PNG с кэшированием.
+
+Страницы не держат Figure между перерисовками: функция построения вызывается
+только при промахе кэша, результат сохраняется в PNG, а фигура сразу
+закрывается (plt.close), чтобы не копиться в глобальном реестре pyplot.
+Ключ строится из хэша данных, параметров и языка подписей — переключение
+чекбоксов предпросмотра не вызывает повторного рендера.
+
+Для экспорта (PDF) rasterize_figures растеризует набор фигур заранее,
+при большом их числе — параллельно в пуле процессов на Agg.
+"""
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from utils.cache import BoundedCache, hash_data
+
+__all__ = [
+    "FIGURE_CACHE",
+    "DEFAULT_DPI",
+    "DPI_PROFILES",
+    "resolve_dpi",
+    "figure_key",
+    "fig_to_png",
+    "close_figures",
+    "render_png",
+    "rasterize_figures",
+]
+
+DEFAULT_DPI = 150
+
+# Профили качества для экспорта (PDF и т.п.)
+DPI_PROFILES = {"draft": 100, "standard": 200, "print": 300}
+
+# Меньше стольких фигур пул процессов не окупает запуск и сериализацию
+PARALLEL_MIN_FIGURES = 4
+
+# Общий для всех сессий; PNG 150 dpi — обычно 50–300 КБ
+FIGURE_CACHE = BoundedCache(max_entries=64, max_bytes=128 * 1024 * 1024, name="figures")
+
+
+def figure_key(page: str, *parts: Any) -> str:
+    """Ключ кэша: имя страницы/графика + хэш данных, параметров и языка."""
+    return f"{page}:{hash_data(*parts)}"
+
+
+def fig_to_png(fig, dpi: int = DEFAULT_DPI) -> bytes:
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def close_figures(figures: Iterable) -> None:
+    """Закрыть фигуры (или пары (подпись, фигура)) после использования, например после сборки PDF."""
+    import matplotlib.pyplot as plt
+
+    for fig in figures:
+        if isinstance(fig, tuple):
+            fig = fig[-1]
+        plt.close(fig)
+
+
+def render_png(key: str, draw: Callable[[], Any], dpi: int = DEFAULT_DPI) -> bytes:
+    """
+    PNG из кэша по ключу; при промахе — draw() -> Figure, сохранение и закрытие фигуры.
+    Фигура закрывается и при ошибке сохранения.
+    """
+    def _render() -> bytes:
+        import matplotlib.pyplot as plt
+
+        fig = draw()
+        try:
+            return fig_to_png(fig, dpi)
+        finally:
+            plt.close(fig)
+
+    return FIGURE_CACHE.get_or_compute((key, dpi), _render)
+
+
+def resolve_dpi(quality) -> int:
+    """Имя профиля из DPI_PROFILES или число dpi."""
+    if isinstance(quality, str):
+        try:
+            return DPI_PROFILES[quality]
+        except KeyError:
+            raise ValueError(f"Unknown quality profile {quality!r}; expected one of {', '.join(DPI_PROFILES)}")
+    return int(quality)
+
+
+def _render_pickled(payload: bytes, dpi: int) -> bytes:
+    # Выполняется в дочернем процессе: только Agg, без GUI
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig = pickle.loads(payload)
+    try:
+        return fig_to_png(fig, dpi)
+    finally:
+        plt.close(fig)
+
+
+def rasterize_figures(
+    figures: Sequence[Any],
+    dpi: int = DEFAULT_DPI,
+    max_workers: Optional[int] = None,
+) -> List[bytes]:
+    """
+    PNG для каждой фигуры; готовые PNG (bytes) возвращаются как есть.
+    При PARALLEL_MIN_FIGURES и более фигурах они сериализуются (pickle) и
+    рендерятся в пуле процессов; max_workers=1 — всегда последовательно.
+    Фигуры, которые не удалось сериализовать, и все фигуры при сбое пула
+    рендерятся в текущем процессе. Сами фигуры не закрываются.
+    """
+    out: List[Optional[bytes]] = [f if isinstance(f, (bytes, bytearray)) else None for f in figures]
+    pending = [i for i, png in enumerate(out) if png is None]
+    workers = min(max_workers or os.cpu_count() or 1, len(pending))
+
+    if workers > 1 and len(pending) >= PARALLEL_MIN_FIGURES:
+        payloads = {}
+        for i in pending:
+            try:
+                payloads[i] = pickle.dumps(figures[i])
+            except Exception:
+                pass
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {i: pool.submit(_render_pickled, p, dpi) for i, p in payloads.items()}
+                for i, fut in futures.items():
+                    out[i] = fut.result()
+        except Exception:
+            pass
+
+    for i, png in enumerate(out):
+        if png is None:
+            out[i] = fig_to_png(figures[i], dpi)
+    return [bytes(png) for png in out]
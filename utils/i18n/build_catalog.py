@@ -0,0 +1,113 @@
+# utils/i18n/build_catalog.py
+"""
+Сборка предкомпилированного каталога переводов.
+
+    python -m utils.i18n.build_catalog
+
+Собирает все секции × языки из модульных файлов utils/i18n/<section>/<code>.py
+и старых словарей (utils/translations.py, utils/statistical_analysis_translation.py)
+в один JSON: {code: {section: {...}}}. Фолбэки уже разрешены, поэтому во время
+работы приложения load_section — это просто обращение к словарю.
+
+Порядок слияния (каждый следующий перекрывает предыдущий):
+    ru (старый) -> ru -> en (старый) -> en -> <язык> (старый) -> <язык>
+то есть отсутствующие ключи берутся из en, затем из ru, а модульные файлы
+важнее старых словарей того же языка.
+"""
+import json
+import os
+from importlib import import_module
+from typing import Any, Dict
+
+from . import CATALOG_PATH
+from .common import deep_merge
+
+LANGUAGES = ("pl", "en", "ru")
+CODE_TO_DISPLAY = {"pl": "Polski", "en": "English", "ru": "Русский"}
+I18N_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _normalize_as_mapping(section: str, obj: Any) -> Dict[str, Dict[str, Any]]:
+    """
+    Привести объект модуля к виду {section: {...}}.
+    Допускаются варианты:
+      - {section: {...}}         (уже готово)
+      - {...}                    (считаем, что это тело нужной секции)
+      - None / не dict           -> {}
+    """
+    if isinstance(obj, dict):
+        if section in obj and isinstance(obj[section], dict):
+            return {section: obj[section]}
+        return {section: obj}
+    return {section: {}}
+
+
+def _import_section(section: str, code: str) -> Dict[str, Any]:
+    """
+    Тело секции из модуля utils.i18n.<section>.<code>; {} если модуля нет.
+    Поддерживаем следующие варианты содержимого модуля:
+      - TRANSLATIONS = {section: {...}} ИЛИ {...}
+      - translations = {section: {...}} ИЛИ {...}
+      - <section> = {...}  (например, general = {...})
+    """
+    try:
+        mod = import_module(f"utils.i18n.{section}.{code}")
+    except ModuleNotFoundError:
+        return {}
+
+    # Пытаемся найти подходящую переменную
+    obj = (
+        getattr(mod, "TRANSLATIONS", None) or
+        getattr(mod, "translations", None) or
+        getattr(mod, section, None)
+    )
+    return _normalize_as_mapping(section, obj)[section]
+
+
+def _modular_sections():
+    return sorted(
+        name for name in os.listdir(I18N_DIR)
+        if os.path.isdir(os.path.join(I18N_DIR, name))
+        and any(os.path.exists(os.path.join(I18N_DIR, name, f"{code}.py")) for code in LANGUAGES)
+    )
+
+
+def _legacy() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Старые словари, приведённые к {code: {section: {...}}}."""
+    from utils.statistical_analysis_translation import statistical_analysis_translations
+    from utils.translations import translations
+
+    out: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for code, display in CODE_TO_DISPLAY.items():
+        merged = deep_merge(translations.get(display, {}), statistical_analysis_translations.get(display, {}))
+        out[code] = merged
+    return out
+
+
+def build_catalog() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    legacy = _legacy()
+    sections = sorted(set(_modular_sections()).union(*(set(v) for v in legacy.values())))
+    modular = {code: {s: _import_section(s, code) for s in sections} for code in LANGUAGES}
+
+    catalog: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for code in LANGUAGES:
+        catalog[code] = {}
+        for section in sections:
+            body: Dict[str, Any] = {}
+            for src in [c for c in ("ru", "en") if c != code] + [code]:
+                body = deep_merge(body, legacy[src].get(section, {}))
+                body = deep_merge(body, modular[src][section])
+            catalog[code][section] = body
+    return catalog
+
+
+def main() -> None:
+    catalog = build_catalog()
+    with open(CATALOG_PATH, "w", encoding="utf-8") as fh:
+        json.dump(catalog, fh, ensure_ascii=False, indent=1, sort_keys=True)
+        fh.write("\n")
+    print(f"{CATALOG_PATH}: {sum(len(v) for v in catalog.values())} sections")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,61 @@ TRANSLATIONS = {
                 "control_charts": "ImR Control Charts",
                 "control_charts_desc": "Monitoring process stability using ImR control charts. Control charts allow tracking of changes in production or research processes, detecting any deviations from the norm. They are an essential tool in quality management and continuous process improvement.",
                 "title": "ImR Control Charts",
+                "subgroups": {
+                    "chart_type": "Chart type",
+                    "chart_types": {
+                        "imr": "I-MR (individual values)",
+                        "xbar_r": "X̄-R (subgroup means and ranges)",
+                        "xbar_s": "X̄-S (subgroup means and standard deviations)",
+                        "ewma": "EWMA (small drifts)",
+                        "cusum": "CUSUM (small sustained shifts)"
+                    },
+                    "value_column": "Measurement column:",
+                    "subgroup_column": "Subgroup column (time point / sample):",
+                    "subgroup_column_help": "One row per measurement; rows with the same label form one subgroup, in order of first appearance.",
+                    "by_size": "Form subgroups from consecutive rows",
+                    "by_size_help": "Use when the file has no subgroup column: every N consecutive values make one subgroup.",
+                    "subgroup_size": "Subgroup size (n)",
+                    "subgroups_count": "Subgroups",
+                    "sizes": "subgroup size",
+                    "unequal_sizes": "Subgroup sizes differ - limits are calculated for each subgroup from its own size.",
+                    "subgroup": "Subgroup",
+                    "mean": "X̄ (subgroup mean)",
+                    "range": "R (subgroup range)",
+                    "std": "S (subgroup standard deviation)",
+                    "limits": "Control limits and constants",
+                    "error_subgroups": "At least 2 subgroups with 2-25 numeric values each are required."
+                },
+                "small_shift": {
+                    "lambda": "Smoothing constant λ",
+                    "lambda_help": "Smaller λ gives more weight to history and detects smaller shifts; λ = 1 is the I chart.",
+                    "L": "Limit width L (σ)",
+                    "L_help": "Limits are CL ± L·σ·√(λ/(2−λ)·(1−(1−λ)^(2t))); L = 3 with λ = 0.2 is the usual choice.",
+                    "k": "Reference value k (σ)",
+                    "k_help": "Allowance: half of the shift to detect, in σ. k = 0.5 targets a 1σ shift.",
+                    "h": "Decision interval h (σ)",
+                    "h_help": "A signal is raised when C+ or C- exceeds H = h·σ; h = 4-5 is usual.",
+                    "target": "Target (CL)",
+                    "target_help": "By default the mean of the data; enter the nominal value to monitor against it.",
+                    "sigma": "σ (0 = from data)",
+                    "sigma_help": "By default σ = MR̄/d2 from the data, as on the I-MR chart.",
+                    "ewma": "EWMA",
+                    "cusum": "CUSUM (C+ up, C- down)",
+                    "shift_estimate": "Estimated new mean",
+                    "signals_count": "Points with a signal"
+                },
+                "all_columns": {
+                    "toggle": "Chart all numeric columns",
+                    "summary_header": "Stability summary for all columns",
+                    "unstable_count": "Columns with signals",
+                    "column": "Column",
+                    "stable": "Stable",
+                    "mr_violations": "MR > UCL",
+                    "rules_legend": "R1–R8 — number of points where the rule fired",
+                    "drilldown": "Open charts for columns:",
+                    "drilldown_help": "Charts are drawn only for the columns selected here.",
+                    "no_numeric_columns": "No column has at least two numeric values."
+                },
                 "instructions": {
                     "header": "Instructions",
                     "upload_file": "Upload an Excel file containing measurement data.",
@@ -36,7 +91,36 @@ TRANSLATIONS = {
                     "show_I_chart": "Show I Chart Data (Individual Values)",
                     "show_MR_chart": "Show MR Chart Data (Moving Range)",
                     "I_chart_data": "I Chart Data (Individual Values)",
-                    "MR_chart_data": "MR Chart Data (Moving Range)"
+                    "MR_chart_data": "MR Chart Data (Moving Range)",
+                    "violations_header": "Rule violations",
+                    "no_violations": "No rule violations detected.",
+                    "violations_per_rule": "Violations per rule",
+                    "rule": "Rule",
+                    "count": "Points",
+                    "rules_fired": "Rules",
+                    "monitor": {
+                        "header": "Continuous monitoring (frozen baseline limits)",
+                        "help": "Limits are frozen on the baseline points; when an upload of the same series (same column and baseline values) brings new rows, only those rows are checked. The state is kept on the server.",
+                        "baseline_points": "Number of baseline points",
+                        "start": "Freeze baseline and start monitoring",
+                        "reset": "Reset monitoring state",
+                        "state_mismatch": "The saved monitoring state does not match this file (earlier rows changed) - start a new baseline.",
+                        "frozen_limits": "Frozen limits",
+                        "points_monitored": "Points monitored",
+                        "new_alarms": "Alarms from the last update",
+                        "no_new_alarms": "The last update brought no new alarms.",
+                        "alarm_history": "All alarms since the baseline was frozen"
+                    },
+                    "rule_names": {
+                        "1": "1 point beyond 3σ",
+                        "2": "9 points in a row on one side of CL",
+                        "3": "6 points in a row steadily increasing or decreasing",
+                        "4": "14 points in a row alternating up and down",
+                        "5": "2 of 3 points beyond 2σ on one side",
+                        "6": "4 of 5 points beyond 1σ on one side",
+                        "7": "15 points in a row within 1σ",
+                        "8": "8 points in a row beyond 1σ on both sides"
+                    }
                 }
             },
            
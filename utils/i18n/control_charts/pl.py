@@ -3,6 +3,61 @@ TRANSLATIONS = {
                 "control_charts": "Karty kontrolne ImR",
                 "control_charts_desc": "Monitorowanie stabilności procesów za pomocą kart kontrolnych ImR. Karty kontrolne pozwalają na śledzenie zmian w procesach produkcyjnych lub badawczych, wykrywając ewentualne odchylenia od normy. Są niezbędnym narzędziem w zarządzaniu jakością i ciągłym doskonaleniu procesów.",
                 "title": "Karty kontrolne ImR",
+                "subgroups": {
+                    "chart_type": "Typ karty",
+                    "chart_types": {
+                        "imr": "I-MR (wartości indywidualne)",
+                        "xbar_r": "X̄-R (średnie i rozstępy podgrup)",
+                        "xbar_s": "X̄-S (średnie i odchylenia standardowe podgrup)",
+                        "ewma": "EWMA (małe dryfty)",
+                        "cusum": "CUSUM (małe trwałe przesunięcia)"
+                    },
+                    "value_column": "Kolumna z pomiarami:",
+                    "subgroup_column": "Kolumna podgrupy (punkt czasowy / próbka):",
+                    "subgroup_column_help": "Jeden wiersz = jeden pomiar; wiersze z tą samą etykietą tworzą podgrupę, w kolejności pierwszego wystąpienia.",
+                    "by_size": "Twórz podgrupy z kolejnych wierszy",
+                    "by_size_help": "Gdy plik nie ma kolumny podgrupy: każde N kolejnych wartości tworzy jedną podgrupę.",
+                    "subgroup_size": "Liczność podgrupy (n)",
+                    "subgroups_count": "Podgrupy",
+                    "sizes": "liczność podgrupy",
+                    "unequal_sizes": "Podgrupy mają różną liczność - granice są liczone dla każdej podgrupy według jej liczności.",
+                    "subgroup": "Podgrupa",
+                    "mean": "X̄ (średnia podgrupy)",
+                    "range": "R (rozstęp podgrupy)",
+                    "std": "S (odchylenie standardowe podgrupy)",
+                    "limits": "Granice kontrolne i stałe",
+                    "error_subgroups": "Wymagane są co najmniej 2 podgrupy po 2-25 wartości liczbowych."
+                },
+                "small_shift": {
+                    "lambda": "Stała wygładzania λ",
+                    "lambda_help": "Mniejsze λ daje większą wagę historii i wykrywa mniejsze przesunięcia; λ = 1 to karta I.",
+                    "L": "Szerokość granic L (σ)",
+                    "L_help": "Granice: CL ± L·σ·√(λ/(2−λ)·(1−(1−λ)^(2t))); typowo L = 3 przy λ = 0.2.",
+                    "k": "Wartość odniesienia k (σ)",
+                    "k_help": "Połowa wykrywanego przesunięcia w σ. k = 0.5 dla przesunięcia o 1σ.",
+                    "h": "Przedział decyzyjny h (σ)",
+                    "h_help": "Sygnał, gdy C+ lub C- przekroczy H = h·σ; typowo h = 4-5.",
+                    "target": "Wartość docelowa (CL)",
+                    "target_help": "Domyślnie średnia z danych; wpisz wartość nominalną, aby monitorować względem niej.",
+                    "sigma": "σ (0 = z danych)",
+                    "sigma_help": "Domyślnie σ = MR̄/d2 z danych, jak na karcie I-MR.",
+                    "ewma": "EWMA",
+                    "cusum": "CUSUM (C+ w górę, C- w dół)",
+                    "shift_estimate": "Szacowana nowa średnia",
+                    "signals_count": "Punkty z sygnałem"
+                },
+                "all_columns": {
+                    "toggle": "Karty dla wszystkich kolumn liczbowych",
+                    "summary_header": "Podsumowanie stabilności wszystkich kolumn",
+                    "unstable_count": "Kolumny z sygnałami",
+                    "column": "Kolumna",
+                    "stable": "Stabilny",
+                    "mr_violations": "MR > UCL",
+                    "rules_legend": "R1–R8 — liczba punktów, w których zadziałała reguła",
+                    "drilldown": "Pokaż karty dla kolumn:",
+                    "drilldown_help": "Wykresy są rysowane tylko dla kolumn wybranych tutaj.",
+                    "no_numeric_columns": "Żadna kolumna nie zawiera co najmniej dwóch wartości liczbowych."
+                },
                 "instructions": {
                     "header": "Instrukcje",
                     "upload_file": "Wczytaj plik Excel zawierający dane pomiarowe.",
@@ -35,7 +90,36 @@ TRANSLATIONS = {
                     "show_I_chart": "Pokaż dane wykresu I (wartości indywidualne)",
                     "show_MR_chart": "Pokaż dane wykresu MR (ruchomy rozstęp)",
                     "I_chart_data": "Dane wykresu I (wartości indywidualne)",
-                    "MR_chart_data": "Dane wykresu MR (ruchomy rozstęp)"
+                    "MR_chart_data": "Dane wykresu MR (ruchomy rozstęp)",
+                    "violations_header": "Naruszenia reguł",
+                    "no_violations": "Nie wykryto naruszeń reguł.",
+                    "violations_per_rule": "Naruszenia według reguł",
+                    "rule": "Reguła",
+                    "count": "Punkty",
+                    "rules_fired": "Reguły",
+                    "monitor": {
+                        "header": "Monitorowanie ciągłe (zamrożone granice bazowe)",
+                        "help": "Granice są zamrażane na punktach bazowych; gdy wczytany plik z tą samą serią (ta sama kolumna i te same punkty bazowe) zawiera nowe wiersze, sprawdzane są tylko one. Stan jest przechowywany na serwerze.",
+                        "baseline_points": "Liczba punktów bazowych",
+                        "start": "Zamroź bazę i rozpocznij monitorowanie",
+                        "reset": "Resetuj stan monitorowania",
+                        "state_mismatch": "Zapisany stan monitorowania nie pasuje do tego pliku (zmieniono wcześniejsze wiersze) - utwórz nową bazę.",
+                        "frozen_limits": "Zamrożone granice",
+                        "points_monitored": "Monitorowane punkty",
+                        "new_alarms": "Alarmy z ostatniej aktualizacji",
+                        "no_new_alarms": "Ostatnia aktualizacja nie przyniosła nowych alarmów.",
+                        "alarm_history": "Wszystkie alarmy od zamrożenia bazy"
+                    },
+                    "rule_names": {
+                        "1": "1 punkt poza 3σ",
+                        "2": "9 kolejnych punktów po jednej stronie CL",
+                        "3": "6 kolejnych punktów stale rosnących lub malejących",
+                        "4": "14 kolejnych punktów naprzemiennie w górę i w dół",
+                        "5": "2 z 3 punktów poza 2σ po jednej stronie",
+                        "6": "4 z 5 punktów poza 1σ po jednej stronie",
+                        "7": "15 kolejnych punktów w granicach 1σ",
+                        "8": "8 kolejnych punktów poza 1σ po obu stronach"
+                    }
                 }
             },
             
@@ -4,6 +4,61 @@ TRANSLATIONS = {
                 "control_charts": "Контрольные карты ImR",
                 "control_charts_desc": "Мониторинг стабильности процессов с использованием контрольных карт ImR. Контрольные карты позволяют отслеживать изменения в производственных или исследовательских процессах, выявляя любые отклонения от нормы. Они являются неотъемлемым инструментом в управлении качеством и непрерывном улучшении процессов.",
                 "title": "Контрольные карты ImR",
+                "subgroups": {
+                    "chart_type": "Тип карты",
+                    "chart_types": {
+                        "imr": "I-MR (индивидуальные значения)",
+                        "xbar_r": "X̄-R (средние и размахи подгрупп)",
+                        "xbar_s": "X̄-S (средние и стандартные отклонения подгрупп)",
+                        "ewma": "EWMA (малые дрейфы)",
+                        "cusum": "CUSUM (малые устойчивые сдвиги)"
+                    },
+                    "value_column": "Столбец с измерениями:",
+                    "subgroup_column": "Столбец подгруппы (момент отбора / проба):",
+                    "subgroup_column_help": "Одна строка — одно измерение; строки с одинаковой меткой образуют подгруппу, в порядке первого появления.",
+                    "by_size": "Формировать подгруппы из подряд идущих строк",
+                    "by_size_help": "Если в файле нет столбца подгруппы: каждые N подряд идущих значений образуют подгруппу.",
+                    "subgroup_size": "Объём подгруппы (n)",
+                    "subgroups_count": "Подгрупп",
+                    "sizes": "объём подгруппы",
+                    "unequal_sizes": "Объёмы подгрупп различаются — пределы рассчитаны для каждой подгруппы по её объёму.",
+                    "subgroup": "Подгруппа",
+                    "mean": "X̄ (среднее подгруппы)",
+                    "range": "R (размах подгруппы)",
+                    "std": "S (стандартное отклонение подгруппы)",
+                    "limits": "Контрольные пределы и константы",
+                    "error_subgroups": "Нужно не меньше 2 подгрупп по 2–25 числовых значений."
+                },
+                "small_shift": {
+                    "lambda": "Константа сглаживания λ",
+                    "lambda_help": "Чем меньше λ, тем больше вес истории и тем меньшие сдвиги обнаруживаются; λ = 1 — карта I.",
+                    "L": "Ширина пределов L (σ)",
+                    "L_help": "Пределы: CL ± L·σ·√(λ/(2−λ)·(1−(1−λ)^(2t))); обычно L = 3 при λ = 0.2.",
+                    "k": "Опорное значение k (σ)",
+                    "k_help": "Половина обнаруживаемого сдвига в σ. k = 0.5 — для сдвига на 1σ.",
+                    "h": "Решающий интервал h (σ)",
+                    "h_help": "Сигнал, когда C+ или C- превышает H = h·σ; обычно h = 4–5.",
+                    "target": "Целевое значение (CL)",
+                    "target_help": "По умолчанию среднее по данным; укажите номинал, чтобы контролировать относительно него.",
+                    "sigma": "σ (0 — по данным)",
+                    "sigma_help": "По умолчанию σ = MR̄/d2 по данным, как на карте I-MR.",
+                    "ewma": "EWMA",
+                    "cusum": "CUSUM (C+ вверх, C- вниз)",
+                    "shift_estimate": "Оценка нового среднего",
+                    "signals_count": "Точек с сигналом"
+                },
+                "all_columns": {
+                    "toggle": "Карты по всем числовым столбцам",
+                    "summary_header": "Сводка стабильности по всем столбцам",
+                    "unstable_count": "Столбцов с сигналами",
+                    "column": "Столбец",
+                    "stable": "Стабилен",
+                    "mr_violations": "MR > UCL",
+                    "rules_legend": "R1–R8 — число точек, где сработало правило",
+                    "drilldown": "Открыть карты для столбцов:",
+                    "drilldown_help": "Графики строятся только для выбранных здесь столбцов.",
+                    "no_numeric_columns": "Ни в одном столбце нет хотя бы двух числовых значений."
+                },
                 "instructions": {
                     "header": "Инструкции",
                     "upload_file": "Загрузите файл Excel с измерительными данными.",
@@ -36,7 +91,36 @@ TRANSLATIONS = {
                     "show_I_chart": "Показать данные графика I (индивидуальные значения)",
                     "show_MR_chart": "Показать данные графика MR (скользящий диапазон)",
                     "I_chart_data": "Данные графика I (индивидуальные значения)",
-                    "MR_chart_data": "Данные графика MR (скользящий диапазон)"
+                    "MR_chart_data": "Данные графика MR (скользящий диапазон)",
+                    "violations_header": "Нарушения правил",
+                    "no_violations": "Нарушений правил не обнаружено.",
+                    "violations_per_rule": "Нарушения по правилам",
+                    "rule": "Правило",
+                    "count": "Точек",
+                    "rules_fired": "Правила",
+                    "monitor": {
+                        "header": "Непрерывный мониторинг (замороженные базовые пределы)",
+                        "help": "Пределы замораживаются по базовым точкам; если загрузка того же ряда (тот же столбец и те же базовые значения) содержит новые строки, проверяются только они. Состояние хранится на сервере.",
+                        "baseline_points": "Число базовых точек",
+                        "start": "Заморозить базу и начать мониторинг",
+                        "reset": "Сбросить состояние мониторинга",
+                        "state_mismatch": "Сохранённое состояние мониторинга не соответствует файлу (изменены прежние строки) - задайте новую базу.",
+                        "frozen_limits": "Замороженные пределы",
+                        "points_monitored": "Точек под мониторингом",
+                        "new_alarms": "Сигналы последнего обновления",
+                        "no_new_alarms": "Последнее обновление не принесло новых сигналов.",
+                        "alarm_history": "Все сигналы с момента заморозки базы"
+                    },
+                    "rule_names": {
+                        "1": "1 точка за пределами 3σ",
+                        "2": "9 точек подряд по одну сторону от CL",
+                        "3": "6 точек подряд монотонно растут или убывают",
+                        "4": "14 точек подряд попеременно вверх и вниз",
+                        "5": "2 из 3 точек за 2σ по одну сторону",
+                        "6": "4 из 5 точек за 1σ по одну сторону",
+                        "7": "15 точек подряд в пределах 1σ",
+                        "8": "8 точек подряд за 1σ по обе стороны"
+                    }
                 }
             },
            
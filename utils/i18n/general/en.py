@@ -20,4 +20,23 @@ general  = {
     "view_results": "Analysis results (charts, tables, statistics) will appear in the main area.",
     "customize_view": "You can hide or display analysis details, adjusting the view to your needs.",
     "how_to_use": "How to use the application?",
+
+    # load timing report (sidebar)
+    "timing_title": "Load times",
+    "timing_sidebar": "Script start → menu",
+    "timing_import": "Page module import",
+    "timing_render": "Page render",
+    "timing_cached": "already loaded",
+    "timing_modules": "First import of page modules in this process",
+
+    # compute cache statistics (sidebar)
+    "cache_toggle": "Show cache hits/misses",
+    "cache_help": "Analysis results, figures and workbooks are cached in the app process and reused when only the display changes.",
+    "cache_name": "Cache / function",
+    "cache_hits": "Hits",
+    "cache_misses": "Misses",
+    "cache_entries": "Entries",
+    "cache_size_mb": "Size, MB",
+    "cache_hit_rate": "Hit rate",
+    "cache_clear": "Clear caches",
 }
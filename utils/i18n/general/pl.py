@@ -20,4 +20,23 @@ general  = {
     "view_results": "Wyniki analizy (wykresy, tabele, statystyki) pojawią się w głównym obszarze strony.",
     "customize_view": "Możesz ukrywać lub wyświetlać szczegóły analizy, dostosowując widok do swoich potrzeb.",
     "how_to_use": "Jak korzystać z aplikacji?",
+
+    # raport czasów ładowania (panel boczny)
+    "timing_title": "Czasy ładowania",
+    "timing_sidebar": "Start skryptu → menu",
+    "timing_import": "Import modułu strony",
+    "timing_render": "Renderowanie strony",
+    "timing_cached": "już załadowany",
+    "timing_modules": "Pierwszy import modułów stron w tym procesie",
+
+    # statystyki pamięci podręcznej obliczeń (panel boczny)
+    "cache_toggle": "Pokaż trafienia/chybienia pamięci podręcznej",
+    "cache_help": "Wyniki analiz, wykresy i skoroszyty są przechowywane w procesie aplikacji i używane ponownie, gdy zmienia się tylko sposób wyświetlania.",
+    "cache_name": "Pamięć podręczna / funkcja",
+    "cache_hits": "Trafienia",
+    "cache_misses": "Chybienia",
+    "cache_entries": "Wpisy",
+    "cache_size_mb": "Rozmiar, MB",
+    "cache_hit_rate": "Odsetek trafień",
+    "cache_clear": "Wyczyść pamięć podręczną",
 }
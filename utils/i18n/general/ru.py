@@ -20,4 +20,23 @@ general  = {
     "view_results": "Результаты анализа (графики, таблицы, статистика) появятся в основной области страницы.",
     "customize_view": "Вы можете скрывать или отображать детали анализа, адаптируя интерфейс под свои нужды.",
     "how_to_use": "Как пользоваться приложением?",
+
+    # отчёт о времени загрузки (боковая панель)
+    "timing_title": "Время загрузки",
+    "timing_sidebar": "Старт скрипта → меню",
+    "timing_import": "Импорт модуля страницы",
+    "timing_render": "Отрисовка страницы",
+    "timing_cached": "уже загружен",
+    "timing_modules": "Первый импорт модулей страниц в этом процессе",
+
+    # статистика кэша расчётов (боковая панель)
+    "cache_toggle": "Показать попадания/промахи кэша",
+    "cache_help": "Результаты анализа, графики и книги Excel кэшируются в процессе приложения и переиспользуются, если меняется только отображение.",
+    "cache_name": "Кэш / функция",
+    "cache_hits": "Попадания",
+    "cache_misses": "Промахи",
+    "cache_entries": "Записей",
+    "cache_size_mb": "Объём, МБ",
+    "cache_hit_rate": "Доля попаданий",
+    "cache_clear": "Очистить кэши",
 }
@@ -45,7 +45,12 @@ TRANSLATIONS = {
         "cpk_results": {
             "mean": "Mean",
             "std_dev": "Standard Deviation",
-            "cpk": "Cpk Index"
+            "cpk": "Cpk Index (within σ)",
+            "ppk": "Ppk Index (overall σ)",
+            "ci": "95% CI (bootstrap BCa)"
+        },
+        "imr": {
+            "rule": "Rule {rule}"
         }
     }
     
@@ -44,7 +44,12 @@ TRANSLATIONS = {
         "cpk_results": {
             "mean": "Średnia",
             "std_dev": "Odchylenie standardowe",
-            "cpk": "Wskaźnik Cpk"
+            "cpk": "Wskaźnik Cpk (σ wewnętrzne)",
+            "ppk": "Wskaźnik Ppk (σ całkowite)",
+            "ci": "95% PU (bootstrap BCa)"
+        },
+        "imr": {
+            "rule": "Reguła {rule}"
         }
     }
  
@@ -31,7 +31,7 @@ TRANSLATIONS = {
             "control_chart_with_spec_limits": "Контрольная карта с пределами спецификации"
         },
         "subheaders": {
-            "imr_chart": "Контрольная карта Щухарта",
+            "imr_chart": "Контрольная карта Шухарта",
             "cpk_analysis": "Анализ способности процесса Cpk",
             "spec_limits_comparison": "Сравнение результатов с пределами спецификации"
         },
@@ -45,7 +45,12 @@ TRANSLATIONS = {
         "cpk_results": {
             "mean": "Среднее",
             "std_dev": "Стандартное отклонение",
-            "cpk": "Индекс Cpk"
+            "cpk": "Индекс Cpk (σ внутри)",
+            "ppk": "Индекс Ppk (общее σ)",
+            "ci": "95% ДИ (бутстреп BCa)"
+        },
+        "imr": {
+            "rule": "Правило {rule}"
         }
     }
            
@@ -20,6 +20,7 @@ TRANSLATIONS = {
                 },
                 "spec_settings": {
                     "target": "Target Value",
+                    "target_placeholder": "(LSL + USL) / 2 if empty",
                     "lsl": "Lower Specification Limit (LSL)",
                     "usl": "Upper Specification Limit (USL)"
                 },
@@ -28,6 +29,31 @@ TRANSLATIONS = {
                     "x_label": "Values",
                     "y_label": ""
                 },
+                "bootstrap": {
+                    "toggle": "Bootstrap confidence intervals",
+                    "help": "Resamples the data (moving blocks of consecutive points, so the moving-range σ keeps its meaning) and reports percentile and BCa intervals.",
+                    "resamples": "Number of resamples",
+                    "confidence": "Confidence level",
+                    "se": "Std. error",
+                    "pct_lower": "Percentile: lower",
+                    "pct_upper": "Percentile: upper",
+                    "bca_lower": "BCa: lower",
+                    "bca_upper": "BCa: upper",
+                    "caption": "BCa intervals correct the percentile interval for bias and skewness and are recommended for small samples. A fixed seed keeps the results reproducible."
+                },
+                "non_normal": {
+                    "toggle": "Non-normal data: fit a distribution (ISO 22514-2 percentile method)",
+                    "help": "Fits normal, 3-parameter lognormal, Weibull and gamma, Johnson SU and SB; the best fit by the chosen criterion is preselected.",
+                    "shapiro_failed": "The Shapiro-Wilk test rejects normality (p < 0.05) - indices based on the normal distribution may be misleading; consider the fitted-distribution mode.",
+                    "criterion": "Selection criterion",
+                    "criteria": {"aic": "AIC", "ad": "Anderson-Darling"},
+                    "distribution": "Distribution",
+                    "params": "Parameters",
+                    "fitted_density": "Fitted density",
+                    "header": "Percentile method (ISO 22514-2)",
+                    "caption": "Pp = (USL − LSL) / (X99.865 − X0.135); Ppk = min((USL − X50) / (X99.865 − X50), (X50 − LSL) / (X50 − X0.135)). Expected PPM come from the fitted distribution.",
+                    "fits_header": "All fitted distributions"
+                },
                 "results": {
                     "header": "Analysis Results",
                     "cp": "Cp",
@@ -39,7 +65,16 @@ TRANSLATIONS = {
                     "sample_min": "Minimum",
                     "sample_median": "Median",
                     "pct_below_lsl": "Percentage of Samples Below LSL",
-                    "pct_above_usl": "Percentage of Samples Above USL"
+                    "pct_above_usl": "Percentage of Samples Above USL",
+                    "index": "Index",
+                    "value": "Value",
+                    "sigma_basis": "σ basis",
+                    "std_within": "σ within (MR̄/d2)",
+                    "std_overall": "σ overall (sample)",
+                    "indices_help": "Cp and Cpk use the within-process σ from the average moving range; Pp, Ppk and Cpm use the overall sample σ. Expected PPM assume a normal distribution with the overall σ.",
+                    "ppm_below": "Expected PPM below LSL",
+                    "ppm_above": "Expected PPM above USL",
+                    "ppm_total": "Expected PPM total"
                 }
             },
             
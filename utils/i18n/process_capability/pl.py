@@ -19,6 +19,7 @@ TRANSLATIONS = {
                 },
                 "spec_settings": {
                     "target": "Wartość docelowa (Target)",
+                    "target_placeholder": "(LSL + USL) / 2, jeśli puste",
                     "lsl": "Dolna granica specyfikacji (LSL)",
                     "usl": "Górna granica specyfikacji (USL)"
                 },
@@ -27,6 +28,31 @@ TRANSLATIONS = {
                     "x_label": "Wartości",
                     "y_label": ""
                 },
+                "bootstrap": {
+                    "toggle": "Przedziały ufności metodą bootstrap",
+                    "help": "Losowanie ze zwracaniem bloków kolejnych punktów (σ z rozstępu ruchomego zachowuje sens); przedziały percentylowe i BCa.",
+                    "resamples": "Liczba losowań",
+                    "confidence": "Poziom ufności",
+                    "se": "Błąd standardowy",
+                    "pct_lower": "Percentylowy: dolna",
+                    "pct_upper": "Percentylowy: górna",
+                    "bca_lower": "BCa: dolna",
+                    "bca_upper": "BCa: górna",
+                    "caption": "Przedziały BCa korygują obciążenie i skośność rozkładu i są zalecane dla małych prób. Stałe ziarno zapewnia powtarzalność wyników."
+                },
+                "non_normal": {
+                    "toggle": "Dane nienormalne: dopasuj rozkład (ISO 22514-2, metoda percentyli)",
+                    "help": "Dopasowywane są rozkłady: normalny, 3-parametrowe logarytmiczno-normalny, Weibulla i gamma, Johnsona SU i SB; najlepszy według wybranego kryterium jest wybrany domyślnie.",
+                    "shapiro_failed": "Test Shapiro-Wilka odrzuca normalność (p < 0.05) - wskaźniki oparte na rozkładzie normalnym mogą być mylące; rozważ tryb dopasowanego rozkładu.",
+                    "criterion": "Kryterium wyboru",
+                    "criteria": {"aic": "AIC", "ad": "Anderson-Darling"},
+                    "distribution": "Rozkład",
+                    "params": "Parametry",
+                    "fitted_density": "Gęstość dopasowana",
+                    "header": "Metoda percentyli (ISO 22514-2)",
+                    "caption": "Pp = (USL − LSL) / (X99.865 − X0.135); Ppk = min((USL − X50) / (X99.865 − X50), (X50 − LSL) / (X50 − X0.135)). Oczekiwane PPM według dopasowanego rozkładu.",
+                    "fits_header": "Wszystkie dopasowane rozkłady"
+                },
                 "results": {
                     "header": "Wyniki analizy",
                     "cp": "Cp",
@@ -38,7 +64,16 @@ TRANSLATIONS = {
                     "sample_min": "Minimum",
                     "sample_median": "Mediana",
                     "pct_below_lsl": "Procent próbek poniżej LSL",
-                    "pct_above_usl": "Procent próbek powyżej USL"
+                    "pct_above_usl": "Procent próbek powyżej USL",
+                    "index": "Wskaźnik",
+                    "value": "Wartość",
+                    "sigma_basis": "Podstawa σ",
+                    "std_within": "σ wewnętrzne (MR̄/d2)",
+                    "std_overall": "σ całkowite (z próby)",
+                    "indices_help": "Cp i Cpk wykorzystują σ wewnątrz procesu ze średniego rozstępu ruchomego; Pp, Ppk i Cpm — całkowite σ z próby. Oczekiwane PPM zakładają rozkład normalny z całkowitym σ.",
+                    "ppm_below": "Oczekiwane PPM poniżej LSL",
+                    "ppm_above": "Oczekiwane PPM powyżej USL",
+                    "ppm_total": "Oczekiwane PPM łącznie"
                 }
             },
            
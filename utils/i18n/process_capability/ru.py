@@ -20,6 +20,7 @@ TRANSLATIONS = {
                 },
                 "spec_settings": {
                     "target": "Целевое значение (Target)",
+                    "target_placeholder": "(LSL + USL) / 2, если не задано",
                     "lsl": "Нижний предел спецификации (LSL)",
                     "usl": "Верхний предел спецификации (USL)"
                 },
@@ -28,6 +29,31 @@ TRANSLATIONS = {
                     "x_label": "Значения",
                     "y_label": ""
                 },
+                "bootstrap": {
+                    "toggle": "Бутстреп-доверительные интервалы",
+                    "help": "Повторные выборки блоками подряд идущих точек (σ по скользящему размаху сохраняет смысл); перцентильные и BCa-интервалы.",
+                    "resamples": "Число выборок",
+                    "confidence": "Доверительный уровень",
+                    "se": "Стандартная ошибка",
+                    "pct_lower": "Перцентильный: нижняя",
+                    "pct_upper": "Перцентильный: верхняя",
+                    "bca_lower": "BCa: нижняя",
+                    "bca_upper": "BCa: верхняя",
+                    "caption": "BCa-интервалы учитывают смещение и асимметрию распределения и рекомендуются для малых выборок. Фиксированный seed делает результат воспроизводимым."
+                },
+                "non_normal": {
+                    "toggle": "Ненормальные данные: подобрать распределение (ISO 22514-2, метод процентилей)",
+                    "help": "Подбираются нормальное, трёхпараметрические логнормальное, Вейбулла и гамма, Джонсона SU и SB; лучшее по выбранному критерию выбрано по умолчанию.",
+                    "shapiro_failed": "Тест Шапиро–Уилка отвергает нормальность (p < 0.05) — индексы по нормальному распределению могут вводить в заблуждение; используйте режим подобранного распределения.",
+                    "criterion": "Критерий выбора",
+                    "criteria": {"aic": "AIC", "ad": "Андерсон–Дарлинг"},
+                    "distribution": "Распределение",
+                    "params": "Параметры",
+                    "fitted_density": "Подобранная плотность",
+                    "header": "Метод процентилей (ISO 22514-2)",
+                    "caption": "Pp = (USL − LSL) / (X99.865 − X0.135); Ppk = min((USL − X50) / (X99.865 − X50), (X50 − LSL) / (X50 − X0.135)). Ожидаемые PPM — по подобранному распределению.",
+                    "fits_header": "Все подобранные распределения"
+                },
                 "results": {
                     "header": "Результаты анализа",
                     "cp": "Cp",
@@ -39,7 +65,16 @@ TRANSLATIONS = {
                     "sample_min": "Минимум",
                     "sample_median": "Медиана",
                     "pct_below_lsl": "Процент образцов ниже LSL",
-                    "pct_above_usl": "Процент образцов выше USL"
+                    "pct_above_usl": "Процент образцов выше USL",
+                    "index": "Индекс",
+                    "value": "Значение",
+                    "sigma_basis": "Основа σ",
+                    "std_within": "σ внутри (MR̄/d2)",
+                    "std_overall": "σ общее (выборочное)",
+                    "indices_help": "Cp и Cpk рассчитаны по σ внутри процесса из среднего скользящего размаха; Pp, Ppk и Cpm — по общему выборочному σ. Ожидаемые PPM — по нормальному распределению с общим σ.",
+                    "ppm_below": "Ожидаемые PPM ниже LSL",
+                    "ppm_above": "Ожидаемые PPM выше USL",
+                    "ppm_total": "Ожидаемые PPM всего"
                 }
             },
            
@@ -20,6 +20,7 @@ TRANSLATIONS = {
             "show_data_preview": "Show data preview",
             "data_preview": "Data preview (first 12 rows):",
             "select_series": "Select series for analysis:",
+            "no_series_selected": "Select at least one series to run the regression and the shelf-life estimate.",
             "error_processing_file": "An error occurred while processing the file",
             "no_file_uploaded": "No file selected - please upload an Excel file above."
         },
@@ -30,6 +31,24 @@ TRANSLATIONS = {
             "x_label": "Time (months)",
             "title": "Stability Analysis"
         },
+        "ich_q1e": {
+            "header": "Shelf Life (ICH Q1E)",
+            "model": "Selected model",
+            "models": {
+                "separate": "separate slopes and intercepts (batches not poolable)",
+                "common_slope": "common slope, separate intercepts",
+                "pooled": "all batches pooled"
+            },
+            "p_slopes": "Slope equality test p-value",
+            "p_intercepts": "Intercept equality test p-value",
+            "shelf_life": "Estimated shelf life (months)",
+            "no_crossing": "the confidence bound does not reach the specification within the analysed horizon",
+            "limiting_batch": "Limiting batch",
+            "extrapolation_note": "ICH Q1E allows extrapolation up to {limit:.0f} months for these data (2× the study period, at most +12 months).",
+            "batch_shelf_life": "Shelf life by batch (months)",
+            "bound": "95% one-sided bound",
+            "not_enough_data": "At least one batch with two time points is required."
+        },
         "regression_results": {
             "header": "Regression Analysis Results for Selected Series",
             "series": "Series",
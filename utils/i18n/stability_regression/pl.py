@@ -20,6 +20,7 @@ TRANSLATIONS = {
             "show_data_preview": "Pokaż podgląd danych",
             "data_preview": "Podgląd danych (pierwsze 12 wierszy):",
             "select_series": "Wybierz serie do analizy:",
+            "no_series_selected": "Wybierz co najmniej jedną serię, aby wykonać regresję i oszacować okres ważności.",
             "error_processing_file": "Wystąpił błąd podczas analizy pliku",
             "no_file_uploaded": "Nie wybrano pliku — proszę wgrać plik Excel powyżej."
         },
@@ -30,6 +31,24 @@ TRANSLATIONS = {
             "x_label": "Czas (miesiące)",
             "title": "Analiza stabilności"
         },
+        "ich_q1e": {
+            "header": "Okres ważności (ICH Q1E)",
+            "model": "Wybrany model",
+            "models": {
+                "separate": "oddzielne nachylenia i wyrazy wolne (serii nie można łączyć)",
+                "common_slope": "wspólne nachylenie, oddzielne wyrazy wolne",
+                "pooled": "wszystkie serie połączone"
+            },
+            "p_slopes": "Wartość p testu równości nachyleń",
+            "p_intercepts": "Wartość p testu równości wyrazów wolnych",
+            "shelf_life": "Szacowany okres ważności (miesiące)",
+            "no_crossing": "granica ufności nie osiąga specyfikacji w analizowanym horyzoncie",
+            "limiting_batch": "Seria ograniczająca",
+            "extrapolation_note": "ICH Q1E dopuszcza ekstrapolację do {limit:.0f} miesięcy dla tych danych (2× okres badania, maks. +12 miesięcy).",
+            "batch_shelf_life": "Okres ważności według serii (miesiące)",
+            "bound": "jednostronna granica 95%",
+            "not_enough_data": "Wymagana jest co najmniej jedna seria z dwoma punktami czasowymi."
+        },
         "regression_results": {
             "header": "Wyniki analizy regresji dla wybranych serii",
             "series": "Seria",
@@ -20,6 +20,7 @@ TRANSLATIONS = {
             "show_data_preview": "Показать предварительный просмотр данных",
             "data_preview": "Предварительный просмотр данных (первые 12 строк):",
             "select_series": "Выберите серии для анализа:",
+            "no_series_selected": "Выберите хотя бы одну серию для регрессии и оценки срока годности.",
             "error_processing_file": "Произошла ошибка при анализе файла",
             "no_file_uploaded": "Файл не выбран — пожалуйста, загрузите файл Excel выше."
         },
@@ -30,6 +31,24 @@ TRANSLATIONS = {
             "x_label": "Время (месяцы)",
             "title": "Анализ стабильности"
         },
+        "ich_q1e": {
+            "header": "Срок годности (ICH Q1E)",
+            "model": "Выбранная модель",
+            "models": {
+                "separate": "отдельные наклоны и свободные члены (серии не объединяются)",
+                "common_slope": "общий наклон, отдельные свободные члены",
+                "pooled": "все серии объединены"
+            },
+            "p_slopes": "p-значение теста равенства наклонов",
+            "p_intercepts": "p-значение теста равенства свободных членов",
+            "shelf_life": "Оценка срока годности (месяцы)",
+            "no_crossing": "доверительная граница не достигает спецификации в анализируемом горизонте",
+            "limiting_batch": "Лимитирующая серия",
+            "extrapolation_note": "ICH Q1E допускает экстраполяцию до {limit:.0f} месяцев для этих данных (2× период исследования, не более +12 месяцев).",
+            "batch_shelf_life": "Срок годности по сериям (месяцы)",
+            "bound": "односторонняя 95% граница",
+            "not_enough_data": "Нужна хотя бы одна серия с двумя временными точками."
+        },
         "regression_results": {
             "header": "Результаты анализа регрессии для выбранных серий",
             "series": "Серия",
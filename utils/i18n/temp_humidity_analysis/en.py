@@ -6,7 +6,7 @@ TRANSLATIONS = {
                 "title": "Temperature and Humidity Analysis",
                 "instructions": {
                     "header": "Instructions",
-                    "upload_file": "Upload an Excel file containing temperature and humidity data.",
+                    "upload_file": "Upload an Excel or CSV logger export containing temperature and humidity data.",
                     "set_limits": "Set temperature and humidity limits using sliders.",
                     "view_results": "Browse charts and the list of limit exceedances."
                 },
@@ -17,10 +17,10 @@ TRANSLATIONS = {
                     "hum_upper": "Upper Humidity Limit (%)"
                 },
                 "file_handling": {
-                    "choose_file": "Choose an Excel file (xlsx, xls):",
+                    "choose_file": "Choose an Excel or CSV file (xlsx, xls, csv):",
                     "data_preview": "Data preview (first 10 rows):",
                     "error_processing_file": "An error occurred while processing the file",
-                    "no_file_uploaded": "No file selected - please upload an Excel file above."
+                    "no_file_uploaded": "No file selected - please upload an Excel or CSV file above."
                 },
                 "statistics": {
                     "temp_stats": "Temperature Statistics",
@@ -35,7 +35,30 @@ TRANSLATIONS = {
                     "no_crossings": "No temperature/humidity limit exceedances.",
                     "time": "Time",
                     "temperature": "Temperature",
-                    "humidity": "Humidity"
+                    "humidity": "Humidity",
+                    "events": "Excursion events (start, end, duration)"
+                },
+                "tables": {
+                    "time": "Time",
+                    "parameter": "Parameter",
+                    "limit": "Limit",
+                    "limit_value": "Limit value",
+                    "start": "Start",
+                    "end": "End",
+                    "duration": "Duration",
+                    "points": "Points",
+                    "extreme": "Extreme value",
+                    "time_out": "Time out of range",
+                    "percent": "% of recording time",
+                    "events": "Events",
+                    "longest": "Longest event",
+                    "period": "Period",
+                    "mean": "mean",
+                    "min": "min",
+                    "max": "max",
+                    "out_h": "hours out of range",
+                    "mkt": "MKT (°C)",
+                    "sides": {"lower": "lower", "upper": "upper"}
                 },
                 "plot": {
                     "temp": "Temperature",
@@ -47,6 +70,25 @@ TRANSLATIONS = {
                     "x_label": "Time",
                     "y_label": "Value",
                     "title": "Temperature and Humidity"
+                },
+                "streaming": {
+                    "rows_read": "Rows read",
+                    "truncated": "Showing the first {shown} of {total}.",
+                    "unsorted": "Time stamps in the file are not in chronological order; the rows were sorted by time before the analysis.",
+                    "unsorted_too_large": "Time stamps in the file are not in chronological order and the file has more than {rows:,} rows. Sort the export by time and upload it again."
+                },
+                "gdp": {
+                    "header": "GDP: mean kinetic temperature and time out of range",
+                    "mkt_total": "Mean kinetic temperature (°C)",
+                    "mkt_note": "Time-weighted MKT, ΔH/R = 10 000 K (ΔH = 83.144 kJ/mol).",
+                    "rolling_window": "Rolling MKT window",
+                    "windows": {"24h": "24 hours", "7D": "7 days", "30D": "30 days"},
+                    "rolling_max": "Maximum rolling MKT (°C)",
+                    "rolling_title": "Rolling mean kinetic temperature",
+                    "time_out": "Time out of range per limit",
+                    "aggregation": "Aggregation period",
+                    "periods": {"D": "Day", "W": "Week"},
+                    "period_table": "Aggregates per period (time-weighted mean, hours out of range, MKT)"
                 }
             },
                     
@@ -5,7 +5,7 @@ TRANSLATIONS = {
                 "title": "Analiza temperatury i wilgotności",
                 "instructions": {
                     "header": "Instrukcje",
-                    "upload_file": "Wczytaj plik Excel zawierający dane temperatury i wilgotności.",
+                    "upload_file": "Wczytaj plik Excel lub eksport CSV z rejestratora zawierający dane temperatury i wilgotności.",
                     "set_limits": "Ustaw limity temperatury i wilgotności za pomocą suwaków.",
                     "view_results": "Przeglądaj wykresy oraz listę przekroczeń limitów."
                 },
@@ -16,10 +16,10 @@ TRANSLATIONS = {
                     "hum_upper": "Górna granica wilgotności (%)"
                 },
                 "file_handling": {
-                    "choose_file": "Wybierz plik Excel (xlsx, xls):",
+                    "choose_file": "Wybierz plik Excel lub CSV (xlsx, xls, csv):",
                     "data_preview": "Podgląd danych (pierwsze 10 wierszy):",
                     "error_processing_file": "Wystąpił błąd podczas analizy pliku",
-                    "no_file_uploaded": "Nie wybrano pliku - proszę wgrać plik Excel powyżej."
+                    "no_file_uploaded": "Nie wybrano pliku - proszę wgrać plik Excel lub CSV powyżej."
                 },
                 "statistics": {
                     "temp_stats": "Statystyki temperatury",
@@ -34,7 +34,30 @@ TRANSLATIONS = {
                     "no_crossings": "Brak przekroczeń granic temperatury / wilgotności.",
                     "time": "Czas",
                     "temperature": "Temperatura",
-                    "humidity": "Wilgotność"
+                    "humidity": "Wilgotność",
+                    "events": "Zdarzenia przekroczeń (początek, koniec, czas trwania)"
+                },
+                "tables": {
+                    "time": "Czas",
+                    "parameter": "Parametr",
+                    "limit": "Granica",
+                    "limit_value": "Wartość granicy",
+                    "start": "Początek",
+                    "end": "Koniec",
+                    "duration": "Czas trwania",
+                    "points": "Punkty",
+                    "extreme": "Wartość skrajna",
+                    "time_out": "Czas poza zakresem",
+                    "percent": "% czasu rejestracji",
+                    "events": "Zdarzenia",
+                    "longest": "Najdłuższe zdarzenie",
+                    "period": "Okres",
+                    "mean": "średnia",
+                    "min": "min",
+                    "max": "maks",
+                    "out_h": "godziny poza zakresem",
+                    "mkt": "MKT (°C)",
+                    "sides": {"lower": "dolna", "upper": "górna"}
                 },
                 "plot": {
                     "temp": "Temperatura",
@@ -46,6 +69,25 @@ TRANSLATIONS = {
                     "x_label": "Czas",
                     "y_label": "Wartość",
                     "title": "Temperatura i Wilgotność"
+                },
+                "streaming": {
+                    "rows_read": "Wczytane wiersze",
+                    "truncated": "Pokazano pierwsze {shown} z {total}.",
+                    "unsorted": "Znaczniki czasu w pliku nie są uporządkowane chronologicznie; przed analizą wiersze posortowano według czasu.",
+                    "unsorted_too_large": "Znaczniki czasu w pliku nie są uporządkowane chronologicznie, a plik ma więcej niż {rows:,} wierszy. Posortuj eksport według czasu i wczytaj go ponownie."
+                },
+                "gdp": {
+                    "header": "GDP: średnia temperatura kinetyczna i czas poza zakresem",
+                    "mkt_total": "Średnia temperatura kinetyczna (°C)",
+                    "mkt_note": "MKT ważona czasem, ΔH/R = 10 000 K (ΔH = 83,144 kJ/mol).",
+                    "rolling_window": "Okno kroczącej MKT",
+                    "windows": {"24h": "24 godziny", "7D": "7 dni", "30D": "30 dni"},
+                    "rolling_max": "Maksymalna krocząca MKT (°C)",
+                    "rolling_title": "Krocząca średnia temperatura kinetyczna",
+                    "time_out": "Czas poza zakresem dla każdej granicy",
+                    "aggregation": "Okres agregacji",
+                    "periods": {"D": "Dzień", "W": "Tydzień"},
+                    "period_table": "Agregaty dla okresów (średnia ważona czasem, godziny poza zakresem, MKT)"
                 }
             },
            
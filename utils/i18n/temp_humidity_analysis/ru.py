@@ -6,7 +6,7 @@ TRANSLATIONS = {
                         "title": "Анализ температуры и влажности",
                         "instructions": {
                             "header": "Инструкции",
-                            "upload_file": "Загрузите файл Excel с данными температуры и влажности.",
+                            "upload_file": "Загрузите файл Excel или CSV-выгрузку логгера с данными температуры и влажности.",
                             "set_limits": "Установите лимиты температуры и влажности с помощью ползунков.",
                             "view_results": "Просматривайте графики и список превышений лимитов."
                         },
@@ -17,10 +17,10 @@ TRANSLATIONS = {
                             "hum_upper": "Верхний предел влажности (%)"
                         },
                         "file_handling": {
-                            "choose_file": "Выберите файл Excel (xlsx, xls):",
+                            "choose_file": "Выберите файл Excel или CSV (xlsx, xls, csv):",
                             "data_preview": "Предварительный просмотр данных (первые 10 строк):",
                             "error_processing_file": "Произошла ошибка при анализе файла",
-                            "no_file_uploaded": "Файл не выбран - пожалуйста, загрузите файл Excel."
+                            "no_file_uploaded": "Файл не выбран - пожалуйста, загрузите файл Excel или CSV."
                         },
                         "statistics": {
                             "temp_stats": "Статистика температуры",
@@ -35,7 +35,30 @@ TRANSLATIONS = {
                             "no_crossings": "Превышений температурных/влажностных лимитов не обнаружено.",
                             "time": "Время",
                             "temperature": "Температура",
-                            "humidity": "Влажность"
+                            "humidity": "Влажность",
+                            "events": "События выхода за лимиты (начало, конец, длительность)"
+                        },
+                        "tables": {
+                            "time": "Время",
+                            "parameter": "Параметр",
+                            "limit": "Граница",
+                            "limit_value": "Значение границы",
+                            "start": "Начало",
+                            "end": "Конец",
+                            "duration": "Длительность",
+                            "points": "Точек",
+                            "extreme": "Экстремальное значение",
+                            "time_out": "Время вне диапазона",
+                            "percent": "% времени записи",
+                            "events": "Событий",
+                            "longest": "Самое длинное событие",
+                            "period": "Период",
+                            "mean": "среднее",
+                            "min": "мин",
+                            "max": "макс",
+                            "out_h": "часов вне диапазона",
+                            "mkt": "MKT (°C)",
+                            "sides": {"lower": "нижняя", "upper": "верхняя"}
                         },
                         "plot": {
                             "temp": "Температура",
@@ -47,6 +70,25 @@ TRANSLATIONS = {
                             "x_label": "Время",
                             "y_label": "Значение",
                             "title": "Температура и Влажность"
+                        },
+                        "streaming": {
+                            "rows_read": "Прочитано строк",
+                            "truncated": "Показаны первые {shown} из {total}.",
+                            "unsorted": "Отметки времени в файле идут не по порядку; перед анализом строки отсортированы по времени.",
+                            "unsorted_too_large": "Отметки времени в файле идут не по порядку, а строк больше {rows:,}. Отсортируйте выгрузку по времени и загрузите её снова."
+                        },
+                        "gdp": {
+                            "header": "GDP: средняя кинетическая температура и время вне диапазона",
+                            "mkt_total": "Средняя кинетическая температура (°C)",
+                            "mkt_note": "MKT взвешена по времени, ΔH/R = 10 000 K (ΔH = 83,144 кДж/моль).",
+                            "rolling_window": "Окно скользящей MKT",
+                            "windows": {"24h": "24 часа", "7D": "7 дней", "30D": "30 дней"},
+                            "rolling_max": "Максимальная скользящая MKT (°C)",
+                            "rolling_title": "Скользящая средняя кинетическая температура",
+                            "time_out": "Время вне диапазона по каждой границе",
+                            "aggregation": "Период агрегации",
+                            "periods": {"D": "День", "W": "Неделя"},
+                            "period_table": "Агрегаты по периодам (среднее по времени, часы вне диапазона, MKT)"
                         }
                                
         },
@@ -0,0 +1,135 @@
+# utils/ingestion.py
+import csv
+import re
+from io import BytesIO
+from typing import Any, Iterator, Optional, Union
+
+import pandas as pd
+
+from utils.cache import BoundedCache, content_hash
+
+__all__ = ["WORKBOOK_CACHE", "upload_bytes", "read_excel_cached", "CHUNK_ROWS", "iter_table_chunks"]
+
+# Разобранные книги Excel: ключ = (хэш содержимого, параметры read_excel).
+# 16 файлов / 512 МБ на процесс — с запасом для 50k-строчных выгрузок.
+WORKBOOK_CACHE = BoundedCache(max_entries=16, max_bytes=512 * 1024 * 1024, name="workbooks")
+
+# Строк в одной части при потоковом чтении
+CHUNK_ROWS = 100_000
+
+
+def upload_bytes(source: Any) -> bytes:
+    """Сырые байты из UploadedFile / BytesIO / bytes."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    data = source.read()
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return data
+
+
+def _freeze(value: Any) -> Any:
+    """Привести параметры read_excel к хэшируемому виду (списки -> кортежи)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def read_excel_cached(source: Union[bytes, Any], **kwargs) -> pd.DataFrame:
+    """
+    pd.read_excel с кэшем по содержимому файла.
+    Файл парсится один раз; повторные перезапуски страницы (клик по виджету)
+    получают копию уже разобранного DataFrame — страницы меняют df на месте,
+    поэтому кэшированный оригинал наружу не отдаём.
+    """
+    data = upload_bytes(source)
+    key = (content_hash(data), _freeze(kwargs))
+    df = WORKBOOK_CACHE.get_or_compute(key, lambda: pd.read_excel(BytesIO(data), **kwargs))
+    return df.copy()
+
+
+# --------- Потоковое чтение больших выгрузок (CSV / xlsx) ---------
+
+def _source_name(source: Any, name: Optional[str]) -> str:
+    return (name or getattr(source, "name", "") or "").lower()
+
+
+def _open_binary(source: Any):
+    """Файловый объект с начала файла; bytes оборачиваются в BytesIO без копии содержимого."""
+    if isinstance(source, (bytes, bytearray)):
+        return BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def _sniff_csv(head: bytes) -> dict:
+    """Кодировка, разделитель и десятичный знак по началу файла (логгеры пишут и `;` с `,`)."""
+    for encoding in ("utf-8-sig", "cp1250", "latin-1"):
+        try:
+            sample = head.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    sample = sample.rsplit("\n", 1)[0] if "\n" in sample else sample
+    try:
+        sep = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+    except csv.Error:
+        sep = ","
+    decimal = "," if sep != "," and re.search(r"\d,\d", sample) else "."
+    return {"encoding": encoding, "sep": sep, "decimal": decimal}
+
+
+def _iter_csv(source: Any, chunk_rows: int, skiprows: int, ncols: int) -> Iterator[pd.DataFrame]:
+    fh = _open_binary(source)
+    options = _sniff_csv(fh.read(64 * 1024))
+    fh.seek(0)
+    reader = pd.read_csv(fh, header=None, skiprows=skiprows, usecols=range(ncols), chunksize=chunk_rows, **options)
+    for chunk in reader:
+        yield chunk
+
+
+def _iter_xlsx(source: Any, chunk_rows: int, skiprows: int, ncols: int) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    # read_only: строки читаются из XML по мере обхода, книга целиком в памяти не строится
+    wb = load_workbook(_open_binary(source), read_only=True, data_only=True)
+    try:
+        rows = []
+        for row in wb.worksheets[0].iter_rows(min_row=skiprows + 1, max_col=ncols, values_only=True):
+            rows.append(row)
+            if len(rows) >= chunk_rows:
+                yield pd.DataFrame(rows, columns=range(ncols))
+                rows = []
+        if rows:
+            yield pd.DataFrame(rows, columns=range(ncols))
+    finally:
+        wb.close()
+
+
+def iter_table_chunks(
+    source: Any,
+    name: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    skiprows: int = 1,
+    ncols: int = 3,
+) -> Iterator[pd.DataFrame]:
+    """
+    Первые ncols столбцов файла частями по chunk_rows строк (столбцы 0..ncols-1,
+    значения как в файле). CSV читается pd.read_csv(chunksize=…), xlsx — openpyxl
+    в режиме read_only; старый .xls потоково не читается и разбивается после
+    pd.read_excel. Тип определяется по имени файла (name или source.name).
+    """
+    kind = _source_name(source, name)
+    if kind.endswith((".csv", ".txt")):
+        yield from _iter_csv(source, chunk_rows, skiprows, ncols)
+    elif kind.endswith(".xls"):
+        df = pd.read_excel(_open_binary(source), header=None, skiprows=skiprows, usecols=range(ncols))
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows].reset_index(drop=True)
+    else:
+        yield from _iter_xlsx(source, chunk_rows, skiprows, ncols)
@@ -0,0 +1,94 @@
+# utils/kde.py
+"""
+Ядерная оценка плотности (гауссово ядро) через бинирование и БПФ.
+
+Точки линейно раскладываются по равномерной сетке (два соседних узла с
+весами), затем сетка свёртывается с дискретизированным ядром через rfft —
+O(n + m log m) вместо прямой суммы O(n · m). Погрешность бинирования растёт
+как (шаг / ширина окна)², поэтому число узлов выбирается по ширине окна:
+не меньше grid_size и не реже RESOLUTION узлов на ширину окна (но не больше
+MAX_GRID_SIZE). Тогда отклонение от точной суммы — ~1e-3 от максимума
+плотности и меньше, в том числе для скошенных данных с длинным хвостом.
+
+Ширина окна — как у seaborn.kdeplot / scipy.stats.gaussian_kde ("scott":
+σ · n^(-1/5)) или робастное правило Сильвермана
+(0.9 · min(σ, IQR/1.349) · n^(-1/5)); можно задать числом. Сетка, как у
+seaborn (cut=3), выходит за пределы данных на 3 ширины окна.
+"""
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+__all__ = ["GRID_SIZE", "MAX_GRID_SIZE", "RESOLUTION", "bandwidth", "kde"]
+
+# Минимум узлов сетки (степень двойки — самый быстрый размер для БПФ)
+GRID_SIZE = 512
+
+# Узлов на одну ширину окна: шаг ≤ h/8 даёт погрешность ~4e-4 от пика
+RESOLUTION = 8
+
+# Верхняя граница числа узлов (экстремально длинный хвост при узком окне)
+MAX_GRID_SIZE = 1 << 16
+
+# Ядро обрезается на стольких ширинах окна (вклад дальше < 1e-8 от пика)
+KERNEL_CUTOFF = 6.0
+
+
+def bandwidth(x: np.ndarray, method: Union[str, float] = "scott") -> float:
+    """Ширина окна гауссова ядра для одномерной выборки без NaN."""
+    if not isinstance(method, str):
+        return float(method)
+    n = x.shape[0]
+    std = float(x.std(ddof=1))
+    if method == "scott":
+        return std * n ** (-0.2)
+    if method == "silverman":
+        q75, q25 = np.percentile(x, [75, 25])
+        spread = min(std, (q75 - q25) / 1.349) or std
+        return 0.9 * spread * n ** (-0.2)
+    raise ValueError("bandwidth must be 'scott', 'silverman' or a number")
+
+
+def kde(
+    values: Sequence[float],
+    bw: Union[str, float] = "scott",
+    grid_size: int = GRID_SIZE,
+    cut: float = 3.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (сетка, плотность) для построения линией. NaN/inf отбрасываются; меньше
+    двух точек или нулевой разброс — пустые массивы (как seaborn, кривая не рисуется).
+    grid_size — минимальное число узлов; на широком относительно окна диапазоне
+    сетка гуще (см. RESOLUTION).
+    """
+    x = np.asarray(values, dtype=float).ravel()
+    x = x[np.isfinite(x)]
+    n = x.shape[0]
+    empty = (np.empty(0), np.empty(0))
+    if n < 2:
+        return empty
+    h = bandwidth(x, bw)
+    if not np.isfinite(h) or h <= 0:
+        return empty
+
+    lo, hi = x.min() - cut * h, x.max() + cut * h
+    grid_size = int(min(max(grid_size, np.ceil((hi - lo) / h * RESOLUTION) + 1), MAX_GRID_SIZE))
+    grid = np.linspace(lo, hi, grid_size)
+    dx = grid[1] - grid[0]
+
+    # Линейное бинирование: каждая точка делится между двумя соседними узлами
+    pos = (x - lo) / dx
+    left = np.clip(np.floor(pos).astype(np.int64), 0, grid_size - 2)
+    frac = pos - left
+    counts = np.bincount(left, weights=1.0 - frac, minlength=grid_size)
+    counts += np.bincount(left + 1, weights=frac, minlength=grid_size)
+
+    # Дискретное ядро на смещениях −L..L узлов
+    half = min(int(np.ceil(KERNEL_CUTOFF * h / dx)), grid_size - 1)
+    offsets = np.arange(-half, half + 1) * dx
+    kernel = np.exp(-0.5 * (offsets / h) ** 2) / (h * np.sqrt(2 * np.pi))
+
+    size = 1 << int(np.ceil(np.log2(grid_size + 2 * half)))
+    conv = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)
+    density = np.maximum(conv[half:half + grid_size], 0.0) / n
+    return grid, density
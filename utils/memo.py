@@ -0,0 +1,91 @@
+# utils/memo.py
+"""
+Кэш результатов чистых расчётных функций (I-MR, Шапиро–Уилк, регрессия,
+analyze_groups, индексы воспроизводимости ...).
+
+Streamlit перезапускает скрипт страницы при любом изменении виджета, и без
+кэша весь анализ пересчитывается, даже если переключён только флажок
+отображения. cached_call(fn, *args, **kwargs) ищет результат по имени функции
+и хэшу аргументов (hash_data: массивы и таблицы — по содержимому) в общем для
+процесса COMPUTE_CACHE с ограничением по числу записей, объёму и времени жизни.
+
+Вместо st.cache_data: кэш не зависит от Streamlit (работает и в пакетных
+расчётах), а его статистика видна вместе с остальными кэшами в cache_report().
+Результаты общие для всех сессий — их нельзя изменять на месте.
+"""
+import functools
+import threading
+from typing import Any, Callable, Dict
+
+import pandas as pd
+
+from utils.cache import CACHES, BoundedCache, hash_data
+
+__all__ = ["COMPUTE_CACHE", "FUNCTION_STATS", "cache_report", "cached_call", "clear_all", "memoize"]
+
+COMPUTE_TTL_SECONDS = 3600
+COMPUTE_MAX_ENTRIES = 256
+
+COMPUTE_CACHE = BoundedCache(
+    max_entries=COMPUTE_MAX_ENTRIES,
+    max_bytes=256 * 1024 * 1024,
+    ttl=COMPUTE_TTL_SECONDS,
+    name="compute",
+)
+
+# "модуль.функция" -> {"hits": ..., "misses": ...}
+FUNCTION_STATS: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def _function_name(fn: Callable) -> str:
+    return f"{fn.__module__}.{getattr(fn, '__qualname__', fn.__name__)}"
+
+
+def cached_call(fn: Callable, *args: Any, **kwargs: Any) -> Any:
+    """fn(*args, **kwargs) через COMPUTE_CACHE; fn должна быть чистой функцией своих аргументов."""
+    name = _function_name(fn)
+    key = (name, hash_data(args, sorted(kwargs.items())))
+    sentinel = object()
+    value = COMPUTE_CACHE.get(key, sentinel)
+    hit = value is not sentinel
+    with _stats_lock:
+        counters = FUNCTION_STATS.setdefault(name, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+    if hit:
+        return value
+    value = fn(*args, **kwargs)
+    COMPUTE_CACHE.put(key, value)
+    return value
+
+
+def memoize(fn: Callable) -> Callable:
+    """Декоратор: все вызовы fn идут через cached_call."""
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return cached_call(fn, *args, **kwargs)
+
+    return wrapper
+
+
+def cache_report() -> pd.DataFrame:
+    """
+    Попадания/промахи: по одной строке на каждый именованный кэш процесса
+    (kind="cache", с числом записей и объёмом) и на каждую функцию из cached_call
+    (kind="function").
+    """
+    rows = [{"kind": "cache", "name": name, **cache.stats()} for name, cache in CACHES.items()]
+    with _stats_lock:
+        rows += [{"kind": "function", "name": name, **counters} for name, counters in FUNCTION_STATS.items()]
+    table = pd.DataFrame(rows, columns=["kind", "name", "hits", "misses", "entries", "bytes"])
+    lookups = table["hits"] + table["misses"]
+    table["hit_rate"] = (table["hits"] / lookups.where(lookups > 0)).round(3)
+    return table
+
+
+def clear_all() -> None:
+    """Очистить все именованные кэши и обнулить счётчики функций."""
+    for cache in CACHES.values():
+        cache.clear()
+    with _stats_lock:
+        FUNCTION_STATS.clear()
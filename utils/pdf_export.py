@@ -1,7 +1,7 @@
 # utils/pdf_export.py
 from io import BytesIO
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 import os
 import pandas as pd
 
@@ -22,12 +22,20 @@ from reportlab.platypus import (
     KeepTogether,
 )
 
+from utils.figures import rasterize_figures, resolve_dpi
 from utils.signature_block import make_signature_block
 
 # Single source for headers; stored as unicode escapes to avoid encoding issues
 HEADERS = ["\u2116", "\u041d\u043e\u043c\u0435\u0440 \u0441\u0435\u0440\u0438\u0438", "\u0417\u043d\u0430\u0447\u0435\u043d\u0438\u0435"]
-FONT_PATH = os.path.join(os.getcwd(), "DejaVuSans.ttf")
-pdfmetrics.registerFont(TTFont("DejaVu", FONT_PATH))
+HIGHLIGHT_COLOR = colors.HexColor("#F8D7DA")
+# Font ships in the repository root, independent of the working directory
+FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DejaVuSans.ttf")
+
+
+def _ensure_font() -> None:
+    """Register DejaVu on first use rather than at import time."""
+    if "DejaVu" not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont("DejaVu", FONT_PATH))
 
 
 @dataclass
@@ -36,13 +44,8 @@ class PdfSection:
     body_html: Optional[str] = None
     table_df: Optional[pd.DataFrame] = None
     show_heading: bool = True
-
-
-def _fig_to_png_bytes(fig) -> BytesIO:
-    buf = BytesIO()
-    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
-    buf.seek(0)
-    return buf
+    # 0-based rows of table_df to shade (e.g. control-rule violations)
+    highlight_rows: Optional[Sequence[int]] = None
 
 
 def _strip_spans(html: str) -> str:
@@ -65,37 +68,52 @@ def _prepare_paragraph_html(html: str) -> str:
 
 
 class NumberedCanvas(canvas.Canvas):
-    """Canvas with total page count for the footer."""
+    """
+    Canvas with total page count for the footer.
+
+    Each page only references a form XObject with its footer; the forms are
+    drawn in save() once the total is known, so no per-page canvas state is kept.
+    """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._saved_page_states = []
+        self._page_count = 0
+
+    @staticmethod
+    def _footer_form(page: int) -> str:
+        return f"pageFooter{page}"
 
     def showPage(self):
-        self._saved_page_states.append(dict(self.__dict__))
-        self._startPage()
+        self._page_count += 1
+        self.doForm(self._footer_form(self._page_count))
+        super().showPage()
 
     def save(self):
-        total_pages = len(self._saved_page_states)
-        for state in self._saved_page_states:
-            self.__dict__.update(state)
-            self._draw_page_number(total_pages)
-            super().showPage()
+        total_pages = self._page_count
+        for page in range(1, total_pages + 1):
+            self.beginForm(self._footer_form(page))
+            self._draw_page_number(page, total_pages)
+            self.endForm()
         super().save()
 
-    def _draw_page_number(self, total_pages: int):
+    def _draw_page_number(self, current: int, total_pages: int):
         # Footer: "Page X of Y"
         self.saveState()
         self.setFont("DejaVu", 9)
         page_w, _ = A4
         y = 18
-        current = self.getPageNumber()
         text = f"\u0421\u0442\u0440\u0430\u043d\u0438\u0446\u0430 {current} \u0438\u0437 {total_pages}"
         self.drawCentredString(page_w / 2, y, text)
         self.restoreState()
 
 
-def _df_to_series_value_page(df: pd.DataFrame, styles, rows_per_col: int = 23, start_index: int = 1):
+def _df_to_series_value_page(
+    df: pd.DataFrame,
+    styles,
+    rows_per_col: int = 23,
+    start_index: int = 1,
+    highlight_rows: Sequence[int] = (),
+):
     """Render a single two-up page with exactly three columns: №, series id, value."""
     work = df.copy().reset_index(drop=True)
     if work.shape[1] != 2:
@@ -121,7 +139,9 @@ def _df_to_series_value_page(df: pd.DataFrame, styles, rows_per_col: int = 23, s
         text = "" if pd.isna(x) else str(x)
         return Paragraph(text.replace("\n", "<br/>"), cell_style)
 
-    def make_table(part: pd.DataFrame):
+    highlight = set(highlight_rows)
+
+    def make_table(part: pd.DataFrame, offset: int):
         data = [list(part.columns)] + [[to_para(v) for v in row] for row in part.values.tolist()]
         usable_half = (A4[0] - 60 - 10) / 2  # width per half-page minus 10 px gap
         col_widths = [
@@ -143,10 +163,13 @@ def _df_to_series_value_page(df: pd.DataFrame, styles, rows_per_col: int = 23, s
             ("TOPPADDING", (0, 0), (-1, -1), 2),
             ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
         ]))
+        for r in range(len(part)):
+            if offset + r in highlight:
+                t.setStyle(TableStyle([("BACKGROUND", (0, r + 1), (-1, r + 1), HIGHLIGHT_COLOR)]))
         return t
 
-    t_left = make_table(left)
-    t_right = make_table(right)
+    t_left = make_table(left, 0)
+    t_right = make_table(right, rows_per_col)
 
     page_w = A4[0] - 60
     gap = 10  # расстояние между двумя таблицами
@@ -164,7 +187,12 @@ def _df_to_series_value_page(df: pd.DataFrame, styles, rows_per_col: int = 23, s
     return container
 
 
-def build_series_value_tables(df: pd.DataFrame, styles, rows_per_col: int = 23):
+def build_series_value_tables(
+    df: pd.DataFrame,
+    styles,
+    rows_per_col: int = 23,
+    highlight_rows: Optional[Sequence[int]] = None,
+):
     """Split the dataframe across pages while keeping numbering continuous."""
     if df.shape[1] != 2:
         raise ValueError(f"Expected 2 columns (Series, Value), got {df.shape[1]}")
@@ -172,10 +200,14 @@ def build_series_value_tables(df: pd.DataFrame, styles, rows_per_col: int = 23):
     flow = []
     rows_per_page = rows_per_col * 2
     start = 0
+    highlight = set(highlight_rows or ())
 
     while start < len(df):
         chunk = df.iloc[start:start + rows_per_page].copy()
-        tbl = _df_to_series_value_page(chunk, styles, rows_per_col=rows_per_col, start_index=start + 1)
+        page_highlight = [r for r in range(len(chunk)) if start + r in highlight]
+        tbl = _df_to_series_value_page(
+            chunk, styles, rows_per_col=rows_per_col, start_index=start + 1, highlight_rows=page_highlight
+        )
         flow.append(tbl)
         flow.append(Spacer(1, 12))
         start += rows_per_page
@@ -235,7 +267,16 @@ def build_pdf(
     after_figures_sections: Optional[List[PdfSection]] = None,
     cover_page: Optional[dict] = None,
     header: Optional[dict] = None,
+    quality="standard",
+    max_workers: Optional[int] = None,
 ) -> BytesIO:
+    """
+    figures: (caption, fig[, description_html]); fig — matplotlib Figure или готовый PNG (bytes).
+    quality: профиль из utils.figures.DPI_PROFILES ("draft" | "standard" | "print") или число dpi.
+    Все фигуры растеризуются до сборки документа, при большом числе — параллельно
+    (max_workers процессов; 1 — последовательно).
+    """
+    _ensure_font()
     base_top_margin = 30
     header_height = header.get("height", 0) if header else 0
     top_margin = base_top_margin + header_height
@@ -297,7 +338,9 @@ def build_pdf(
 
         if sec.table_df is not None and not sec.table_df.empty:
             if sec.table_df.shape[1] == 2:
-                tables = build_series_value_tables(sec.table_df, styles, rows_per_col=23)
+                tables = build_series_value_tables(
+                    sec.table_df, styles, rows_per_col=23, highlight_rows=sec.highlight_rows
+                )
                 story.extend(tables)
             elif sec.table_df.shape[1] == 1:
                 story.append(df_to_single_col_table(sec.table_df, styles))
@@ -314,14 +357,14 @@ def build_pdf(
     if figures:
         story.append(Paragraph("\u0413\u0440\u0430\u0444\u0438\u043a\u0438", styles["Heading2"]))
         story.append(Spacer(1, 6))
-        for item in figures:
+        pngs = rasterize_figures([item[1] for item in figures], dpi=resolve_dpi(quality), max_workers=max_workers)
+        for item, png in zip(figures, pngs):
             # allow (caption, fig) or (caption, fig, description_html)
-            caption, fig = item[0], item[1]
+            caption = item[0]
             desc_html = item[2] if len(item) > 2 else None
-            img_buf = _fig_to_png_bytes(fig)
             block = [
                 Paragraph(caption, styles["BodyText"]),
-                Image(img_buf, width=500, height=280),
+                Image(BytesIO(png), width=500, height=280),
             ]
             if desc_html:
                 safe_desc = _prepare_paragraph_html(desc_html)
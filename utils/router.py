@@ -0,0 +1,30 @@
+# utils/router.py
+"""
+Ленивая загрузка страниц: модуль страницы (и его тяжёлые зависимости —
+matplotlib, scipy, reportlab, st_aggrid …) импортируется только тогда,
+когда пункт меню выбран впервые в этом процессе.
+"""
+import sys
+import time
+from importlib import import_module
+from types import ModuleType
+from typing import Dict, Tuple
+
+__all__ = ["IMPORT_TIMES", "load_page"]
+
+# Время первого импорта каждого модуля страницы в этом процессе, секунды
+IMPORT_TIMES: Dict[str, float] = {}
+
+
+def load_page(module_path: str) -> Tuple[ModuleType, float, bool]:
+    """
+    Импортировать модуль страницы по пути ("AppPages.control_charts").
+    Возвращает (модуль, время импорта в секундах, был ли это первый импорт).
+    """
+    if module_path in sys.modules:
+        return sys.modules[module_path], 0.0, False
+    started = time.perf_counter()
+    module = import_module(module_path)
+    elapsed = time.perf_counter() - started
+    IMPORT_TIMES[module_path] = elapsed
+    return module, elapsed, True
@@ -0,0 +1,14 @@
+# utils/spc/__init__.py
+from .batch import compute_imr_columns, imr_summary_table, numeric_columns
+from .cusum import CusumResult, compute_cusum, plot_cusum
+from .ewma import EwmaResult, compute_ewma, plot_ewma
+from .imr import ImRResult, compute_imr, plot_imr
+from .rules import RULE_NAMES, RuleViolations, evaluate_rules
+from .xbar import CONSTANTS, XbarResult, compute_xbar, plot_xbar, subgroup_stats
+
+__all__ = [
+    "ImRResult", "compute_imr", "plot_imr", "RULE_NAMES", "RuleViolations", "evaluate_rules",
+    "compute_imr_columns", "imr_summary_table", "numeric_columns",
+    "CONSTANTS", "XbarResult", "compute_xbar", "plot_xbar", "subgroup_stats",
+    "EwmaResult", "compute_ewma", "plot_ewma", "CusumResult", "compute_cusum", "plot_cusum",
+]
@@ -0,0 +1,71 @@
+# utils/spc/batch.py
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .imr import ImRResult, compute_imr
+from .rules import ALL_RULES
+
+__all__ = ["numeric_columns", "compute_imr_columns", "imr_summary_table"]
+
+
+def _column_values(series: pd.Series) -> np.ndarray:
+    return pd.to_numeric(series, errors="coerce").dropna().to_numpy(dtype=float)
+
+
+def numeric_columns(df: pd.DataFrame, min_points: int = 2) -> list:
+    """Столбцы, в которых после приведения к числам есть хотя бы min_points значений."""
+    counts = df.apply(lambda s: pd.to_numeric(s, errors="coerce").notna().sum())
+    return [c for c in df.columns if counts[c] >= min_points]
+
+
+def compute_imr_columns(
+    df: pd.DataFrame,
+    columns: Optional[Sequence] = None,
+    rules: Iterable[int] = ALL_RULES,
+    max_workers: Optional[int] = None,
+) -> Dict[object, ImRResult]:
+    """
+    Карта I-MR для каждого столбца (NaN и нечисловые значения отбрасываются),
+    столбцы считаются параллельно в пуле потоков — расчёт идёт в NumPy.
+    Столбцы меньше чем из двух чисел пропускаются. Порядок ключей = порядок columns.
+    """
+    columns = numeric_columns(df) if columns is None else list(columns)
+    rules = tuple(rules)
+    arrays = {c: _column_values(df[c]) for c in columns}
+    arrays = {c: v for c, v in arrays.items() if v.shape[0] >= 2}
+    if not arrays:
+        return {}
+    if max_workers == 1 or len(arrays) == 1:
+        return {c: compute_imr(v, rules) for c, v in arrays.items()}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        charts = pool.map(lambda v: compute_imr(v, rules), arrays.values())
+        return dict(zip(arrays, charts))
+
+
+def imr_summary_table(charts: Dict[object, ImRResult]) -> pd.DataFrame:
+    """
+    Сводка стабильности: столбец, n, CL/UCL/LCL карты I, CL/UCL карты MR,
+    число точек с нарушением каждого правила 1–8, точек MR выше UCL и вердикт.
+    """
+    rows = []
+    for col, chart in charts.items():
+        row = {
+            "column": col,
+            "n": chart.n,
+            "CL": chart.i_cl,
+            "UCL": chart.i_ucl,
+            "LCL": chart.i_lcl,
+            "MR_CL": chart.mr_cl,
+            "MR_UCL": chart.mr_ucl,
+        }
+        totals = chart.violations.sum(axis=0)
+        row.update({f"rule_{r}": int(totals[r - 1]) for r in ALL_RULES})
+        row["MR"] = int(chart.mr_violations.sum())
+        row["stable"] = chart.stable()
+        rows.append(row)
+    columns = ["column", "n", "CL", "UCL", "LCL", "MR_CL", "MR_UCL",
+               *(f"rule_{r}" for r in ALL_RULES), "MR", "stable"]
+    return pd.DataFrame(rows, columns=columns)
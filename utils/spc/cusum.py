@@ -0,0 +1,129 @@
+# utils/spc/cusum.py
+"""
+Табличная карта CUSUM (верхняя и нижняя суммы).
+
+C⁺_t = max(0, C⁺_{t−1} + x_t − μ0 − K) — рекурсия Линдли, у неё есть
+замкнутая форма: C⁺_t = S_t − min(0, S_1..S_t), где S — накопленная сумма
+(x − μ0 − K). Поэтому обе суммы считаются через cumsum и
+minimum.accumulate без цикла по точкам. K = k·σ, H = h·σ.
+"""
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.decimation import decimate_indices
+
+from .ewma import mr_sigma
+
+__all__ = ["CusumResult", "compute_cusum", "plot_cusum"]
+
+
+def _lindley(steps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(C_t, N_t): C_t = max(0, C_{t−1} + steps_t), N_t — число точек с последнего обнуления."""
+    s = np.cumsum(steps)
+    c = s - np.minimum(np.minimum.accumulate(s), 0.0)
+    t = np.arange(1, steps.shape[0] + 1)
+    last_zero = np.maximum.accumulate(np.where(c <= 0, t, 0))
+    return np.maximum(c, 0.0), t - last_zero
+
+
+@dataclass
+class CusumResult:
+    values: np.ndarray
+    target: float
+    sigma: float
+    k: float
+    h: float
+    upper: np.ndarray               # C⁺
+    lower: np.ndarray               # C⁻ (неотрицательная)
+    n_upper: np.ndarray             # N⁺ — длина текущей серии C⁺ > 0
+    n_lower: np.ndarray
+    signals_upper: np.ndarray
+    signals_lower: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return int(self.values.shape[0])
+
+    @property
+    def K(self) -> float:
+        return self.k * self.sigma
+
+    @property
+    def H(self) -> float:
+        return self.h * self.sigma
+
+    @property
+    def signals(self) -> np.ndarray:
+        return self.signals_upper | self.signals_lower
+
+    def stable(self) -> bool:
+        return not self.signals.any()
+
+    def shift_estimate(self) -> np.ndarray:
+        """Оценка нового среднего в точках сигнала: μ0 ± (K + C/N); NaN без сигнала."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            up = self.target + self.K + self.upper / self.n_upper
+            down = self.target - self.K - self.lower / self.n_lower
+        return np.where(self.signals_upper, up, np.where(self.signals_lower, down, np.nan))
+
+    def data(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "value": self.values,
+            "C+": self.upper,
+            "C-": self.lower,
+            "N+": self.n_upper,
+            "N-": self.n_lower,
+            "H": np.full(self.n, self.H),
+            "signal": self.signals,
+        })
+
+
+def compute_cusum(
+    values: Sequence[float],
+    k: float = 0.5,
+    h: float = 5.0,
+    target: Optional[float] = None,
+    sigma: Optional[float] = None,
+) -> CusumResult:
+    """Табличный CUSUM (NaN удаляются заранее); k, h — в долях σ, по умолчанию 0.5 и 5."""
+    x = np.asarray(values, dtype=float).ravel()
+    if x.shape[0] < 2:
+        raise ValueError("CUSUM chart requires at least 2 observations")
+    target = float(x.mean()) if target is None else float(target)
+    sigma = mr_sigma(x) if sigma is None else float(sigma)
+
+    K, H = k * sigma, h * sigma
+    upper, n_upper = _lindley(x - target - K)
+    lower, n_lower = _lindley(target - K - x)
+    return CusumResult(
+        values=x, target=target, sigma=sigma, k=float(k), h=float(h),
+        upper=upper, lower=lower, n_upper=n_upper, n_lower=n_lower,
+        signals_upper=upper > H, signals_lower=lower > H,
+    )
+
+
+def plot_cusum(result: CusumResult, xlabel: str = "", ylabel: str = "CUSUM", figsize=(12, 5)):
+    """C⁺ вверх, C⁻ вниз от нуля; пределы ±H."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=figsize)
+    pos = np.arange(1, result.n + 1)
+    for y, flagged, color in ((result.upper, result.signals_upper, "tab:blue"),
+                              (-result.lower, result.signals_lower, "tab:orange")):
+        shown = decimate_indices(None, y, keep=flagged)
+        ax.plot(pos[shown], y[shown], marker="o" if shown.size == result.n else None, markersize=3, color=color)
+        if flagged.any():
+            ax.plot(pos[flagged], y[flagged], "o", color="red", markersize=5)
+    ax.axhline(0, color="green", linewidth=1)
+    for level, name in ((result.H, "H"), (-result.H, "-H")):
+        ax.axhline(level, color="red", linestyle="--", linewidth=1)
+        ax.annotate(f"{name}={level:.4g}", xy=(1, level), xycoords=("axes fraction", "data"),
+                    xytext=(4, 0), textcoords="offset points", va="center", fontsize=8)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,109 @@
+# utils/spc/ewma.py
+"""
+Карта EWMA для обнаружения небольших устойчивых сдвигов среднего.
+
+z_t = λ·x_t + (1 − λ)·z_{t−1}, z_0 = μ0 — линейный рекурсивный фильтр,
+считается одним вызовом scipy.signal.lfilter. Пределы:
+μ0 ± L·σ·√(λ/(2−λ)·(1 − (1−λ)^{2t})), σ — по среднему скользящему размаху
+(как у карты I-MR), если не задана явно.
+"""
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.decimation import decimate_indices
+
+from .imr import D2
+
+__all__ = ["EwmaResult", "compute_ewma", "plot_ewma", "mr_sigma"]
+
+
+def mr_sigma(x: np.ndarray) -> float:
+    """σ внутри процесса по среднему скользящему размаху: MR̄ / d2."""
+    return float(np.abs(np.diff(x)).mean() / D2)
+
+
+@dataclass
+class EwmaResult:
+    values: np.ndarray
+    ewma: np.ndarray
+    target: float
+    sigma: float
+    lam: float
+    L: float
+    ucl: np.ndarray
+    lcl: np.ndarray
+    signals: np.ndarray             # (n,) z вне пределов
+
+    @property
+    def n(self) -> int:
+        return int(self.values.shape[0])
+
+    def stable(self) -> bool:
+        return not self.signals.any()
+
+    def data(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "value": self.values,
+            "EWMA": self.ewma,
+            "CL": np.full(self.n, self.target),
+            "UCL": self.ucl,
+            "LCL": self.lcl,
+            "signal": self.signals,
+        })
+
+
+def compute_ewma(
+    values: Sequence[float],
+    lam: float = 0.2,
+    L: float = 3.0,
+    target: Optional[float] = None,
+    sigma: Optional[float] = None,
+) -> EwmaResult:
+    """Карта EWMA (NaN удаляются заранее); target/sigma по умолчанию — среднее и MR̄/d2."""
+    from scipy.signal import lfilter
+
+    x = np.asarray(values, dtype=float).ravel()
+    if x.shape[0] < 2:
+        raise ValueError("EWMA chart requires at least 2 observations")
+    if not 0 < lam <= 1:
+        raise ValueError("lambda must be in (0, 1]")
+    target = float(x.mean()) if target is None else float(target)
+    sigma = mr_sigma(x) if sigma is None else float(sigma)
+
+    z, _ = lfilter([lam], [1.0, lam - 1.0], x, zi=[(1.0 - lam) * target])
+    t = np.arange(1, x.shape[0] + 1)
+    width = L * sigma * np.sqrt(lam / (2.0 - lam) * (1.0 - (1.0 - lam) ** (2 * t)))
+    ucl, lcl = target + width, target - width
+    return EwmaResult(
+        values=x, ewma=z, target=target, sigma=sigma, lam=float(lam), L=float(L),
+        ucl=ucl, lcl=lcl, signals=(z > ucl) | (z < lcl),
+    )
+
+
+def plot_ewma(result: EwmaResult, xlabel: str = "", ylabel: str = "EWMA", figsize=(12, 5)):
+    """EWMA с расширяющимися до асимптоты пределами; исходные значения — бледным фоном."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=figsize)
+    pos = np.arange(1, result.n + 1)
+    raw = decimate_indices(None, result.values)
+    ax.plot(pos[raw], result.values[raw], color="tab:gray", alpha=0.3, linewidth=0.8)
+    shown = decimate_indices(None, result.ewma, keep=result.signals)
+    ax.plot(pos[shown], result.ewma[shown], marker="o" if shown.size == result.n else None, markersize=3,
+            color="tab:blue")
+    if result.signals.any():
+        ax.plot(pos[result.signals], result.ewma[result.signals], "o", color="red", markersize=5)
+    ax.axhline(result.target, color="green", linewidth=1)
+    for limit in (result.ucl, result.lcl):
+        ax.plot(pos[shown], limit[shown], color="red", linestyle="--", linewidth=1)
+    for level, name in ((result.ucl[-1], "UCL"), (result.target, "CL"), (result.lcl[-1], "LCL")):
+        ax.annotate(f"{name}={level:.4g}", xy=(1, level), xycoords=("axes fraction", "data"),
+                    xytext=(4, 0), textcoords="offset points", va="center", fontsize=8)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    return fig
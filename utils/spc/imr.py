@@ -0,0 +1,141 @@
+# utils/spc/imr.py
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.decimation import decimate_indices
+
+from .rules import ALL_RULES, RuleViolations, evaluate_rules
+
+__all__ = ["ImRResult", "compute_imr", "plot_imr"]
+
+# Константы для n = 2 (скользящий размах из двух соседних точек)
+D2 = 1.128
+D3 = 0.0
+D4 = 3.267
+
+
+@dataclass
+class ImRResult:
+    """
+    Результат расчёта карты I-MR: всё считается один раз и переиспользуется
+    графиком, таблицами и вердиктом стабильности.
+    """
+    values: np.ndarray
+    moving_range: np.ndarray
+    i_cl: float
+    i_ucl: float
+    i_lcl: float
+    mr_cl: float
+    mr_ucl: float
+    mr_lcl: float
+    sigma: float
+    rules: RuleViolations           # (n × 8) правила по карте I
+    mr_violations: np.ndarray       # (n-1,) точки MR выше UCL
+    _shapiro_p: Optional[float] = field(default=None, repr=False)
+
+    @property
+    def violations(self) -> np.ndarray:
+        return self.rules.matrix
+
+    @property
+    def n(self) -> int:
+        return int(self.values.shape[0])
+
+    def stable(self) -> bool:
+        """Процесс стабилен, если ни одно правило не сработало ни на I, ни на MR."""
+        return not (self.violations.any() or self.mr_violations.any())
+
+    def shapiro_pvalue(self) -> float:
+        if self._shapiro_p is None:
+            from scipy.stats import shapiro
+            # Постоянный ряд: тест не определён (scipy предупреждает о нулевом размахе)
+            defined = self.n >= 3 and np.ptp(self.values) > 0
+            self._shapiro_p = float(shapiro(self.values).pvalue) if defined else float("nan")
+        return self._shapiro_p
+
+    def normally_distributed(self, significance_level: float = 0.05) -> bool:
+        return bool(self.shapiro_pvalue() > significance_level)
+
+    def data(self, chart: int = 0) -> pd.DataFrame:
+        """Таблица по точкам, как SPC.ImRControlChart.data: 0 — карта I, 1 — карта MR."""
+        if chart == 0:
+            vals, cl, ucl, lcl = self.values, self.i_cl, self.i_ucl, self.i_lcl
+        else:
+            vals, cl, ucl, lcl = self.moving_range, self.mr_cl, self.mr_ucl, self.mr_lcl
+        k = vals.shape[0]
+        return pd.DataFrame({
+            "value": vals,
+            "CL": np.full(k, cl),
+            "UCL": np.full(k, ucl),
+            "LCL": np.full(k, lcl),
+        })
+
+
+def compute_imr(values: Sequence[float], rules: Iterable[int] = ALL_RULES) -> ImRResult:
+    """Карта I-MR по одномерному ряду (NaN должны быть удалены заранее)."""
+    x = np.asarray(values, dtype=float).ravel()
+    if x.shape[0] < 2:
+        raise ValueError("I-MR chart requires at least 2 observations")
+
+    mr = np.abs(np.diff(x))
+    mr_bar = float(mr.mean())
+    cl = float(x.mean())
+    sigma = mr_bar / D2
+
+    return ImRResult(
+        values=x,
+        moving_range=mr,
+        i_cl=cl,
+        i_ucl=cl + 3 * sigma,
+        i_lcl=cl - 3 * sigma,
+        mr_cl=mr_bar,
+        mr_ucl=D4 * mr_bar,
+        mr_lcl=D3 * mr_bar,
+        sigma=sigma,
+        rules=evaluate_rules(x, cl, sigma, rules),
+        mr_violations=mr > D4 * mr_bar,
+    )
+
+
+def plot_imr(
+    result: ImRResult,
+    xlabel: str = "",
+    ylabel_top: str = "I",
+    ylabel_bottom: str = "MR",
+    figsize=(12, 8),
+):
+    """
+    Две панели (I сверху, MR снизу). Ось X — номера наблюдений 1..n и 1..n-1,
+    как в SPC.ImRControlChart, чтобы подписи можно было переопределить снаружи.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, (ax_i, ax_mr) = plt.subplots(2, 1, figsize=figsize)
+
+    def _panel(ax, y, cl, ucl, lcl, flagged, ylabel):
+        pos = np.arange(1, y.shape[0] + 1)
+        # Длинные ряды прореживаются (маркеры тогда не рисуем); точки с сигналами остаются всегда
+        shown = decimate_indices(None, y, keep=flagged)
+        ax.plot(pos[shown], y[shown], marker="o" if shown.size == y.shape[0] else None, markersize=3,
+                linestyle="-", color="tab:blue")
+        if flagged.any():
+            ax.plot(pos[flagged], y[flagged], "o", color="red", markersize=5)
+        ax.axhline(cl, color="green", linestyle="-", linewidth=1)
+        ax.axhline(ucl, color="red", linestyle="--", linewidth=1)
+        ax.axhline(lcl, color="red", linestyle="--", linewidth=1)
+        for level, name in ((ucl, "UCL"), (cl, "CL"), (lcl, "LCL")):
+            ax.annotate(f"{name}={level:.4g}", xy=(1, level), xycoords=("axes fraction", "data"),
+                        xytext=(4, 0), textcoords="offset points", va="center", fontsize=8)
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+
+    _panel(ax_i, result.values, result.i_cl, result.i_ucl, result.i_lcl,
+           result.rules.points(), ylabel_top)
+    _panel(ax_mr, result.moving_range, result.mr_cl, result.mr_ucl, result.mr_lcl,
+           result.mr_violations, ylabel_bottom)
+    ax_mr.set_xlabel(xlabel)
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,210 @@
+# utils/spc/monitor.py
+import json
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.cache import hash_data
+
+from .imr import D4, compute_imr
+from .rules import ALL_RULES, evaluate_rules
+
+__all__ = ["ImRMonitor", "MONITOR_DIR", "find_monitor", "monitor_path"]
+
+# Самое длинное окно среди правил 1–8 (правило 7: 15 точек подряд)
+RULE_WINDOW = 15
+
+MONITOR_DIR = os.path.join(os.path.expanduser("~"), ".pharmstat", "monitors")
+
+
+def _safe(part) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(part))
+
+
+def monitor_path(*parts: str, directory: str = MONITOR_DIR) -> str:
+    """Путь к файлу состояния монитора по произвольному ключу (столбец, хэш базы …)."""
+    return os.path.join(directory, "__".join(_safe(p) for p in parts) + ".json")
+
+
+def find_monitor(values: Sequence[float], column: str, directory: str = MONITOR_DIR) -> Optional[str]:
+    """
+    Путь к сохранённому монитору столбца column, базовый период которого
+    совпадает с началом values (по хэшу содержимого), или None. Имя
+    загруженного файла в ключ не входит: разные файлы с одинаковым именем не
+    делят состояние, а переименованная выгрузка того же ряда его находит.
+    """
+    if not os.path.isdir(directory):
+        return None
+    x = np.asarray(values, dtype=float)
+    prefix = _safe(column)
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json") or name[:-5].rsplit("__", 1)[0] != prefix:
+            continue
+        path = os.path.join(directory, name)
+        mon = ImRMonitor.load(path)
+        if mon is not None and mon.baseline_n <= len(x) and mon.baseline_hash == _values_hash(x[:mon.baseline_n]):
+            return path
+    return None
+
+
+def _values_hash(values: Sequence[float]) -> str:
+    return hash_data(np.asarray(values, dtype=float))
+
+
+@dataclass
+class ImRMonitor:
+    """
+    Инкрементальная карта I-MR с замороженными пределами базового периода.
+    Каждая новая точка обрабатывается за O(1): правила проверяются только
+    по буферу последних RULE_WINDOW значений, история не пересчитывается.
+
+    ingest() дописывает только точки после уже обработанных n и сначала
+    сверяет обработанное начало ряда с source_hash: исправленные задним числом
+    значения не принимаются молча (matches() = False, нужна новая база).
+    Тревоги последнего приёма (new_alarms) хранятся в состоянии и видны при
+    повторных показах.
+    """
+    cl: float
+    sigma: float
+    mr_bar: float
+    rules: Sequence[int] = ALL_RULES
+    n: int = 0
+    buffer: Deque[float] = field(default_factory=lambda: deque(maxlen=RULE_WINDOW))
+    alarms: List[Dict] = field(default_factory=list)
+    baseline_n: int = 0
+    baseline_hash: str = ""
+    source_hash: str = ""           # хэш values[:source_n] — начала ряда, принятого ingest()
+    source_n: int = 0
+    last_start: int = 0             # alarms[last_start:] — тревоги последнего приёма
+
+    @property
+    def i_ucl(self) -> float:
+        return self.cl + 3 * self.sigma
+
+    @property
+    def i_lcl(self) -> float:
+        return self.cl - 3 * self.sigma
+
+    @property
+    def mr_ucl(self) -> float:
+        return D4 * self.mr_bar
+
+    @property
+    def new_alarms(self) -> List[Dict]:
+        return self.alarms[self.last_start:]
+
+    @property
+    def last(self) -> Optional[float]:
+        return self.buffer[-1] if self.buffer else None
+
+    @classmethod
+    def from_baseline(cls, values: Sequence[float], rules: Sequence[int] = ALL_RULES) -> "ImRMonitor":
+        """Заморозить CL/σ по базовому периоду; базовые точки сами не порождают тревог."""
+        base = compute_imr(values, rules)
+        mon = cls(cl=base.i_cl, sigma=base.sigma, mr_bar=base.mr_cl, rules=tuple(rules), n=base.n,
+                  baseline_n=base.n, baseline_hash=_values_hash(base.values))
+        mon.source_n, mon.source_hash = mon.baseline_n, mon.baseline_hash
+        mon.buffer.extend(base.values[-RULE_WINDOW:].tolist())
+        return mon
+
+    def update(self, value: float) -> List[str]:
+        """
+        Добавить точку; вернуть список сработавших на ней сигналов:
+        номера правил карты I ("1".."8") и "MR" для скользящего размаха выше UCL.
+        """
+        value = float(value)
+        prev = self.last
+        self.buffer.append(value)
+        self.n += 1
+
+        window = np.fromiter(self.buffer, dtype=float, count=len(self.buffer))
+        fired = [str(r) for r in evaluate_rules(window, self.cl, self.sigma, self.rules).fired(len(window) - 1)]
+        if prev is not None and abs(value - prev) > self.mr_ucl:
+            fired.append("MR")
+        if fired:
+            self.alarms.append({"index": self.n - 1, "value": value, "rules": fired})
+        return fired
+
+    def extend(self, values: Sequence[float]) -> List[Dict]:
+        """Добавить несколько точек; вернуть только новые тревоги."""
+        start = len(self.alarms)
+        for v in values:
+            self.update(v)
+        if len(values):
+            self.last_start = start
+        return self.alarms[start:]
+
+    def matches(self, values: Sequence[float]) -> bool:
+        """Начало values совпадает с уже принятыми точками (по хэшу содержимого)."""
+        x = np.asarray(values, dtype=float)
+        if x.shape[0] < self.n:
+            return False
+        return _values_hash(x[:self.source_n]) == self.source_hash
+
+    def ingest(self, values: Sequence[float]) -> bool:
+        """
+        Принять весь ряд (с начала базового периода) и дописать точки после уже
+        обработанных n. True — состояние изменилось и его нужно сохранить.
+        Если обработанное начало ряда изменилось — ValueError, состояние не трогается.
+        """
+        x = np.asarray(values, dtype=float)
+        if not self.matches(x):
+            raise ValueError("monitored series changed before the last processed point; start a new baseline")
+        if x.shape[0] == self.n:
+            return False
+        self.extend(x[self.n:])
+        self.source_n, self.source_hash = x.shape[0], _values_hash(x)
+        return True
+
+    # ---------- сохранение состояния ----------
+    def to_dict(self) -> Dict:
+        return {
+            "cl": self.cl,
+            "sigma": self.sigma,
+            "mr_bar": self.mr_bar,
+            "rules": list(self.rules),
+            "n": self.n,
+            "buffer": list(self.buffer),
+            "alarms": self.alarms,
+            "baseline_n": self.baseline_n,
+            "baseline_hash": self.baseline_hash,
+            "source_hash": self.source_hash,
+            "source_n": self.source_n,
+            "last_start": self.last_start,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "ImRMonitor":
+        mon = cls(
+            cl=state["cl"],
+            sigma=state["sigma"],
+            mr_bar=state["mr_bar"],
+            rules=tuple(state.get("rules", ALL_RULES)),
+            n=state["n"],
+            alarms=list(state.get("alarms", [])),
+            baseline_n=state.get("baseline_n", 0),
+            baseline_hash=state.get("baseline_hash", ""),
+            source_hash=state.get("source_hash") or state.get("baseline_hash", ""),
+            source_n=state.get("source_n", state["n"] if state.get("source_hash") else state.get("baseline_n", 0)),
+            last_start=state.get("last_start", len(state.get("alarms", []))),
+        )
+        mon.buffer.extend(state.get("buffer", []))
+        return mon
+
+    def save(self, path: str) -> None:
+        """Атомарная запись: сначала во временный файл, затем переименование."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ImRMonitor"]:
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
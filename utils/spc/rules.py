@@ -0,0 +1,119 @@
+# utils/spc/rules.py
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+__all__ = ["RULE_NAMES", "RuleViolations", "evaluate_rules"]
+
+# Правила Вестерн Электрик / Нельсона в порядке Rule01 … Rule08 пакета SPC
+RULE_NAMES = [
+    "1 point beyond 3σ",
+    "9 points in a row on one side of CL",
+    "6 points in a row steadily increasing or decreasing",
+    "14 points in a row alternating up and down",
+    "2 of 3 points beyond 2σ on one side",
+    "4 of 5 points beyond 1σ on one side",
+    "15 points in a row within 1σ",
+    "8 points in a row beyond 1σ on both sides",
+]
+ALL_RULES = tuple(range(1, len(RULE_NAMES) + 1))
+
+
+def _window_count(flags: np.ndarray, window: int) -> np.ndarray:
+    """Число True в скользящем окне длины window, оканчивающемся в точке i (0 для неполных окон)."""
+    n = flags.shape[0]
+    out = np.zeros(n, dtype=np.int64)
+    if n < window:
+        return out
+    csum = np.concatenate(([0], np.cumsum(flags, dtype=np.int64)))
+    out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+
+@dataclass
+class RuleViolations:
+    """
+    Булева матрица нарушений (n точек × 8 правил). Правило отмечается в точке,
+    на которой оно срабатывает (последняя точка окна). Столбцы неактивных правил — False.
+    """
+    matrix: np.ndarray
+    rules: Sequence[int] = ALL_RULES
+
+    def any(self) -> bool:
+        return bool(self.matrix.any())
+
+    def points(self) -> np.ndarray:
+        """Маска точек, на которых сработало хотя бы одно правило."""
+        return self.matrix.any(axis=1)
+
+    def indices(self, rule: Optional[int] = None) -> np.ndarray:
+        """Индексы (с 0) точек с нарушением правила rule (1..8) или любого правила."""
+        col = self.points() if rule is None else self.matrix[:, rule - 1]
+        return np.flatnonzero(col)
+
+    def counts(self) -> Dict[int, int]:
+        totals = self.matrix.sum(axis=0)
+        return {r: int(totals[r - 1]) for r in self.rules}
+
+    def fired(self, i: int) -> List[int]:
+        """Номера правил, сработавших в точке i."""
+        return [r for r in self.rules if self.matrix[i, r - 1]]
+
+    def to_frame(self, labels: Optional[Sequence] = None) -> pd.DataFrame:
+        """Таблица только по точкам с нарушениями: индекс/метка и список правил."""
+        idx = self.indices()
+        return pd.DataFrame({
+            "point": idx + 1 if labels is None else [labels[i] for i in idx],
+            "rules": [", ".join(str(r) for r in self.fired(i)) for i in idx],
+        })
+
+
+def evaluate_rules(
+    x: Sequence[float],
+    cl: float,
+    sigma: float,
+    rules: Iterable[int] = ALL_RULES,
+) -> RuleViolations:
+    """
+    Все правила за один проход по ряду: каждое окно «k из m» сводится
+    к разности кумулятивных сумм булевого признака — O(n) на правило, без циклов Python.
+    """
+    x = np.asarray(x, dtype=float)
+    rules = tuple(sorted(set(rules)))
+    n = x.shape[0]
+    m = np.zeros((n, len(RULE_NAMES)), dtype=bool)
+    if n == 0 or not np.isfinite(sigma):
+        return RuleViolations(m, rules)
+
+    dev = x - cl
+    step = np.zeros(n)
+    step[1:] = np.diff(x)
+
+    def rule(k: int) -> np.ndarray:
+        if k == 1:
+            return np.abs(dev) > 3 * sigma
+        if k == 2:
+            return (_window_count(dev > 0, 9) == 9) | (_window_count(dev < 0, 9) == 9)
+        if k == 3:
+            return (_window_count(step > 0, 5) == 5) | (_window_count(step < 0, 5) == 5)
+        if k == 4:
+            alt = np.zeros(n, dtype=bool)
+            alt[2:] = step[2:] * step[1:-1] < 0
+            return _window_count(alt, 12) == 12
+        if k == 5:
+            return (_window_count(dev > 2 * sigma, 3) >= 2) | (_window_count(dev < -2 * sigma, 3) >= 2)
+        if k == 6:
+            return (_window_count(dev > sigma, 5) >= 4) | (_window_count(dev < -sigma, 5) >= 4)
+        if k == 7:
+            return _window_count(np.abs(dev) < sigma, 15) == 15
+        return (
+            (_window_count(np.abs(dev) > sigma, 8) == 8)
+            & (_window_count(dev > sigma, 8) > 0)
+            & (_window_count(dev < -sigma, 8) > 0)
+        )
+
+    for k in rules:
+        m[:, k - 1] = rule(k)
+    return RuleViolations(m, rules)
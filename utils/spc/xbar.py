@@ -0,0 +1,258 @@
+# utils/spc/xbar.py
+"""
+Карты по подгруппам: X̄-R и X̄-S.
+
+Статистики подгрупп (размер, среднее, размах, стандартное отклонение)
+считаются за один проход: если подгруппы равного размера идут подряд — через
+reshape (k × n), иначе через коды подгрупп и bincount/reduceat. Константы
+d2, d3, c4, A2, D3, D4, A3, B3, B4 берутся из таблицы по размеру подгруппы,
+поэтому подгруппы разного размера получают свои пределы.
+"""
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.decimation import decimate_indices
+
+from .rules import ALL_RULES, RuleViolations, evaluate_rules
+
+__all__ = ["CONSTANTS", "SubgroupStats", "XbarResult", "subgroup_stats", "compute_xbar", "plot_xbar"]
+
+# d2, d3 для n = 2..25 (ASTM E2587 / Montgomery, табл. VI)
+_D2 = [1.128, 1.693, 2.059, 2.326, 2.534, 2.704, 2.847, 2.970, 3.078, 3.173, 3.258, 3.336,
+       3.407, 3.472, 3.532, 3.588, 3.640, 3.689, 3.735, 3.778, 3.819, 3.858, 3.895, 3.931]
+_D3 = [0.853, 0.888, 0.880, 0.864, 0.848, 0.833, 0.820, 0.808, 0.797, 0.787, 0.778, 0.770,
+       0.763, 0.756, 0.750, 0.744, 0.739, 0.734, 0.729, 0.724, 0.720, 0.716, 0.712, 0.708]
+MAX_SUBGROUP = 25
+
+
+def _constants_table() -> pd.DataFrame:
+    from scipy.special import gammaln
+
+    n = np.arange(2, MAX_SUBGROUP + 1)
+    d2, d3 = np.array(_D2), np.array(_D3)
+    c4 = np.sqrt(2.0 / (n - 1)) * np.exp(gammaln(n / 2) - gammaln((n - 1) / 2))
+    c4_spread = 3 * np.sqrt(1 - c4 ** 2) / c4
+    return pd.DataFrame({
+        "d2": d2,
+        "d3": d3,
+        "c4": c4,
+        "A2": 3 / (d2 * np.sqrt(n)),
+        "D3": np.maximum(0.0, 1 - 3 * d3 / d2),
+        "D4": 1 + 3 * d3 / d2,
+        "A3": 3 / (c4 * np.sqrt(n)),
+        "B3": np.maximum(0.0, 1 - c4_spread),
+        "B4": 1 + c4_spread,
+    }, index=pd.Index(n, name="n"))
+
+
+# Константы карт по размеру подгруппы (индекс — n)
+CONSTANTS = _constants_table()
+
+
+@dataclass
+class SubgroupStats:
+    labels: np.ndarray
+    size: np.ndarray
+    mean: np.ndarray
+    range: np.ndarray
+    std: np.ndarray
+
+    @property
+    def k(self) -> int:
+        return int(self.size.shape[0])
+
+
+def subgroup_stats(
+    values: Sequence[float],
+    subgroups: Optional[Sequence] = None,
+    size: Optional[int] = None,
+) -> SubgroupStats:
+    """
+    Размер, среднее, размах и std (ddof=1) каждой подгруппы.
+    subgroups — метка подгруппы для каждого значения (порядок подгрупп — порядок
+    первого появления); либо size — подряд идущие блоки по size значений
+    (неполный последний блок отбрасывается). NaN не учитываются.
+    """
+    x = np.asarray(values, dtype=float)
+    if subgroups is None:
+        if not size or size < 2:
+            raise ValueError("either subgroup labels or a subgroup size >= 2 is required")
+        k = x.shape[0] // size
+        codes = np.repeat(np.arange(k), size)
+        x = x[:k * size]
+        labels = np.arange(1, k + 1)
+    else:
+        codes, labels = pd.factorize(np.asarray(subgroups), sort=False)
+        labels = np.asarray(labels)
+    ok = ~np.isnan(x) & (codes >= 0)
+    x, codes = x[ok], codes[ok]
+    k = len(labels)
+
+    n = np.bincount(codes, minlength=k)
+    if k and (n == n[0]).all() and (np.diff(codes) >= 0).all():
+        # Ровные подгруппы подряд — одна матрица (k × n)
+        block = x.reshape(k, n[0])
+        mean = block.mean(axis=1)
+        rng = np.ptp(block, axis=1)
+        std = block.std(axis=1, ddof=1) if n[0] > 1 else np.full(k, np.nan)
+    else:
+        order = np.argsort(codes, kind="stable")
+        xs, cs = x[order], codes[order]
+        present = n > 0
+        starts = np.flatnonzero(np.diff(cs, prepend=-1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(cs, weights=xs, minlength=k) / n
+            dev = xs - mean[cs]
+            std = np.sqrt(np.bincount(cs, weights=dev * dev, minlength=k) / (n - 1))
+        rng = np.full(k, np.nan)
+        if starts.size:
+            rng[present] = np.maximum.reduceat(xs, starts) - np.minimum.reduceat(xs, starts)
+        std = np.where(n > 1, std, np.nan)
+    return SubgroupStats(labels=labels, size=n, mean=mean, range=rng, std=std)
+
+
+@dataclass
+class XbarResult:
+    """
+    Карта X̄-R или X̄-S. Пределы — массивы по подгруппам (при равных
+    размерах все элементы одинаковы). Правила 1–8 проверяются на карте X̄
+    по стандартизованным средним; на карте R/S — выход за пределы.
+    """
+    kind: str                   # "R" или "S"
+    stats: SubgroupStats
+    center: float               # общее среднее
+    sigma: float                # оценка σ внутри подгрупп: mean(R/d2) или mean(S/c4)
+    x_ucl: np.ndarray
+    x_lcl: np.ndarray
+    spread: np.ndarray          # размахи или std подгрупп
+    spread_cl: np.ndarray
+    spread_ucl: np.ndarray
+    spread_lcl: np.ndarray
+    rules: RuleViolations
+    spread_violations: np.ndarray
+
+    @property
+    def k(self) -> int:
+        return self.stats.k
+
+    @property
+    def means(self) -> np.ndarray:
+        return self.stats.mean
+
+    @property
+    def equal_sizes(self) -> bool:
+        return bool((self.stats.size == self.stats.size[0]).all())
+
+    def stable(self) -> bool:
+        return not (self.rules.any() or self.spread_violations.any())
+
+    def constants(self) -> Optional[pd.Series]:
+        """Константы для размера подгрупп (только при равных размерах)."""
+        if not self.equal_sizes:
+            return None
+        cols = ["d2", "A2", "D3", "D4"] if self.kind == "R" else ["c4", "A3", "B3", "B4"]
+        return CONSTANTS.loc[int(self.stats.size[0]), cols]
+
+    def data(self, chart: int = 0) -> pd.DataFrame:
+        """Таблица по подгруппам: 0 — карта X̄, 1 — карта R/S."""
+        if chart == 0:
+            vals, cl, ucl, lcl = self.means, np.full(self.k, self.center), self.x_ucl, self.x_lcl
+        else:
+            vals, cl, ucl, lcl = self.spread, self.spread_cl, self.spread_ucl, self.spread_lcl
+        return pd.DataFrame({
+            "subgroup": self.stats.labels,
+            "n": self.stats.size,
+            "value": vals,
+            "CL": cl,
+            "UCL": ucl,
+            "LCL": lcl,
+        })
+
+
+def compute_xbar(
+    values: Sequence[float],
+    subgroups: Optional[Sequence] = None,
+    size: Optional[int] = None,
+    kind: str = "R",
+    rules: Iterable[int] = ALL_RULES,
+) -> XbarResult:
+    """
+    Карта X̄-R (kind="R") или X̄-S (kind="S"). Подгруппы меньше двух значений
+    отбрасываются; для R размер подгруппы не больше 25 (таблица d2).
+    """
+    kind = kind.upper()
+    if kind not in ("R", "S"):
+        raise ValueError("kind must be 'R' or 'S'")
+    stats = subgroup_stats(values, subgroups, size)
+    keep = stats.size >= 2
+    stats = SubgroupStats(*(a[keep] for a in (stats.labels, stats.size, stats.mean, stats.range, stats.std)))
+    if stats.k < 2:
+        raise ValueError("subgroup chart requires at least 2 subgroups of size >= 2")
+    if stats.size.max() > MAX_SUBGROUP:
+        raise ValueError(f"subgroup size above {MAX_SUBGROUP} is not supported")
+
+    const = CONSTANTS.loc[stats.size]
+    n = stats.size.astype(float)
+    center = float((stats.mean * n).sum() / n.sum())
+    if kind == "R":
+        spread = stats.range
+        unit = const["d2"].to_numpy()
+        lo, hi = const["D3"].to_numpy(), const["D4"].to_numpy()
+    else:
+        spread = stats.std
+        unit = const["c4"].to_numpy()
+        lo, hi = const["B3"].to_numpy(), const["B4"].to_numpy()
+    # Равные размеры: σ = R̄/d2 (S̄/c4), т.е. X̄ ± A2·R̄ (A3·S̄), R: D3·R̄ … D4·R̄ (S: B3·S̄ … B4·S̄)
+    sigma = float((spread / unit).mean())
+    sigma_mean = sigma / np.sqrt(n)
+    spread_cl = unit * sigma
+
+    z = (stats.mean - center) / sigma_mean
+    return XbarResult(
+        kind=kind,
+        stats=stats,
+        center=center,
+        sigma=sigma,
+        x_ucl=center + 3 * sigma_mean,
+        x_lcl=center - 3 * sigma_mean,
+        spread=spread,
+        spread_cl=spread_cl,
+        spread_ucl=hi * spread_cl,
+        spread_lcl=lo * spread_cl,
+        rules=evaluate_rules(z, 0.0, 1.0, rules),
+        spread_violations=(spread > hi * spread_cl) | (spread < lo * spread_cl),
+    )
+
+
+def plot_xbar(result: XbarResult, xlabel: str = "", ylabel_top: str = "X̄", ylabel_bottom: Optional[str] = None,
+              figsize=(12, 8)):
+    """Две панели (X̄ сверху, R/S снизу); пределы — ступенчатые линии при разных размерах подгрупп."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax_x, ax_s) = plt.subplots(2, 1, figsize=figsize)
+    pos = np.arange(1, result.k + 1)
+
+    def _panel(ax, y, cl, ucl, lcl, flagged, ylabel):
+        shown = decimate_indices(None, y, keep=flagged)
+        ax.plot(pos[shown], y[shown], marker="o" if shown.size == y.shape[0] else None, markersize=3,
+                linestyle="-", color="tab:blue")
+        if flagged.any():
+            ax.plot(pos[flagged], y[flagged], "o", color="red", markersize=5)
+        for level, style, color in ((cl, "-", "green"), (ucl, "--", "red"), (lcl, "--", "red")):
+            ax.plot(pos, np.broadcast_to(level, pos.shape), linestyle=style, color=color, linewidth=1,
+                    drawstyle="steps-mid")
+        for level, name in ((ucl[-1], "UCL"), (np.ravel(cl)[-1], "CL"), (lcl[-1], "LCL")):
+            ax.annotate(f"{name}={level:.4g}", xy=(1, level), xycoords=("axes fraction", "data"),
+                        xytext=(4, 0), textcoords="offset points", va="center", fontsize=8)
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+
+    _panel(ax_x, result.means, result.center, result.x_ucl, result.x_lcl, result.rules.points(), ylabel_top)
+    _panel(ax_s, result.spread, result.spread_cl, result.spread_ucl, result.spread_lcl,
+           result.spread_violations, ylabel_bottom or result.kind)
+    ax_s.set_xlabel(xlabel)
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,349 @@
+# utils/stability.py
+"""
+Оценка срока годности по ICH Q1E для портфеля стабильностных исследований.
+
+Все исследования и серии считаются одним вызовом: данные укладываются в
+массивы (исследования × временные точки × серии) с NaN на месте пропусков,
+а регрессии всех моделей ANCOVA получаются из замкнутых формул по маскированным
+суммам (Σt, Σy, Σt², Σty, Σy²) — без циклов по сериям и исследованиям.
+
+Схема ICH Q1E:
+  1. равенство наклонов (отдельные прямые против общего наклона), p > 0.25 -> общий наклон;
+  2. при общем наклоне — равенство свободных членов, p > 0.25 -> полное объединение серий;
+  3. срок годности — момент, когда односторонняя 95% доверительная граница
+     средней линии пересекает Min (нижняя граница) или Max (верхняя);
+     без объединения берётся минимальный срок по сериям.
+"""
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "MODELS",
+    "StabilityResult",
+    "batch_linregress",
+    "fit_stability",
+    "study_arrays",
+    "stack_studies",
+]
+
+# Выбранная модель по результатам тестов объединения
+MODELS = ("separate", "common_slope", "pooled")
+
+# Уровень значимости тестов объединения по ICH Q1E
+POOLING_ALPHA = 0.25
+
+
+def study_arrays(df: pd.DataFrame, series: Optional[Sequence[str]] = None):
+    """
+    Разобрать книгу в формате страницы «Стабильность»: Parameter, Time, Min, Max, далее серии.
+    Возвращает (time (T,), values (T, B), min_spec, max_spec, имена серий).
+    """
+    time = pd.to_numeric(df["Time"], errors="coerce").to_numpy(dtype=float)
+    names = list(series) if series is not None else list(df.columns[4:])
+    values = df[names].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    min_spec = pd.to_numeric(df["Min"], errors="coerce").iloc[0]
+    max_spec = pd.to_numeric(df["Max"], errors="coerce").iloc[0]
+    return time, values, float(min_spec), float(max_spec), names
+
+
+def stack_studies(studies: Sequence[Tuple[np.ndarray, np.ndarray]]):
+    """
+    Сложить исследования разного размера в общие массивы с NaN-заполнением:
+    [(time (T_i,), values (T_i, B_i)), ...] -> time (S, T), values (S, T, B).
+    """
+    t_max = max(len(t) for t, _ in studies)
+    b_max = max(np.asarray(v).reshape(len(t), -1).shape[1] for t, v in studies)
+    time = np.full((len(studies), t_max), np.nan)
+    values = np.full((len(studies), t_max, b_max), np.nan)
+    for i, (t, v) in enumerate(studies):
+        v = np.asarray(v, dtype=float).reshape(len(t), -1)
+        time[i, :len(t)] = t
+        values[i, :len(t), :v.shape[1]] = v
+    return time, values
+
+
+@dataclass
+class StabilityResult:
+    """
+    Результаты для S исследований и B серий (лишние серии — NaN).
+    Поля с формой (S, B) относятся к сериям, (S,) — к исследованию.
+    """
+    n: np.ndarray                   # (S, B) число точек серии
+    slope: np.ndarray               # (S, B) отдельные регрессии
+    intercept: np.ndarray           # (S, B)
+    p_slopes: np.ndarray            # (S,) тест равенства наклонов
+    p_intercepts: np.ndarray        # (S,) тест равенства свободных членов (при общем наклоне)
+    model: np.ndarray               # (S,) "separate" | "common_slope" | "pooled"
+    batch_shelf_life: np.ndarray    # (S, B) срок по выбранной модели
+    shelf_life: np.ndarray          # (S,) минимальный по сериям; inf — не пересекает в пределах horizon
+    limiting_batch: np.ndarray      # (S,) индекс серии, задающей срок (-1 — нет)
+    extrapolation_limit: np.ndarray  # (S,) ICH Q1E: не дальше 2× периода данных и +12 мес.
+    lower: np.ndarray               # (S,) Min
+    upper: np.ndarray               # (S,) Max
+    # Параметры средней линии выбранной модели: ŷ(t) = ybar + b (t - tbar),
+    # se(t) = sqrt(s2 * (1/n_eff + (t - tbar)² / sxx)), критическое значение t_crit
+    _ybar: np.ndarray
+    _tbar: np.ndarray
+    _b: np.ndarray
+    _n_eff: np.ndarray
+    _sxx: np.ndarray
+    _s2: np.ndarray
+    _t_crit: np.ndarray
+
+    @property
+    def studies(self) -> int:
+        return int(self.n.shape[0])
+
+    def curves(self, t: np.ndarray, study: int = 0):
+        """Средняя линия и односторонние границы выбранной модели: три массива (B, len(t))."""
+        t = np.asarray(t, dtype=float)
+        return _bounds(
+            t,
+            self._ybar[study][:, None], self._tbar[study][:, None], self._b[study][:, None],
+            self._n_eff[study][:, None], self._sxx[study][:, None], self._s2[study][:, None],
+            self._t_crit[study][:, None],
+        )
+
+    def summary(self, study: int = 0) -> Dict:
+        return {
+            "model": str(self.model[study]),
+            "p_slopes": _finite(self.p_slopes[study]),
+            "p_intercepts": _finite(self.p_intercepts[study]),
+            "shelf_life": _finite(self.shelf_life[study]),
+            "limiting_batch": int(self.limiting_batch[study]),
+            "extrapolation_limit": _finite(self.extrapolation_limit[study]),
+        }
+
+    def to_frame(self, study: int = 0, names: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Таблица по сериям одного исследования (только серии с данными)."""
+        valid = self.n[study] > 0
+        idx = np.flatnonzero(valid)
+        labels = [names[i] if names is not None else i for i in idx]
+        return pd.DataFrame({
+            "series": labels,
+            "n": self.n[study, idx].astype(int),
+            "slope": self.slope[study, idx],
+            "intercept": self.intercept[study, idx],
+            "shelf_life": self.batch_shelf_life[study, idx],
+        })
+
+
+def _finite(value) -> Optional[float]:
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _bounds(t, ybar, tbar, b, n_eff, sxx, s2, t_crit):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        center = ybar + b * (t - tbar)
+        half = t_crit * np.sqrt(s2 * (1.0 / n_eff + (t - tbar) ** 2 / sxx))
+    return center, center - half, center + half
+
+
+def _centered_sums(t: np.ndarray, y: np.ndarray):
+    """
+    Маскированные суммы по оси времени (предпоследней): n, средние и центрированные
+    суммы Sxx, Sxy, Syy для каждой серии. Пропуски (NaN в t или y) не учитываются.
+    """
+    t = np.broadcast_to(t, y.shape)
+    mask = ~np.isnan(y) & ~np.isnan(t)
+    n = mask.sum(axis=-2).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tbar = np.where(mask, t, 0.0).sum(axis=-2) / n
+        ybar = np.where(mask, y, 0.0).sum(axis=-2) / n
+        dt = np.where(mask, t - np.expand_dims(tbar, -2), 0.0)
+        dy = np.where(mask, y - np.expand_dims(ybar, -2), 0.0)
+    return n, tbar, ybar, (dt * dt).sum(axis=-2), (dt * dy).sum(axis=-2), (dy * dy).sum(axis=-2)
+
+
+def batch_linregress(x, Y) -> pd.DataFrame:
+    """
+    Линейная регрессия Y[:, j] от x для всех серий за один проход — как
+    scipy.stats.linregress по каждой серии после dropna.
+    x: (T,); Y: (T, B) массив или DataFrame, NaN — пропуск.
+    Возвращает DataFrame (строка на серию): n, slope, intercept, rvalue, pvalue, stderr;
+    для серий меньше чем из двух точек (или с постоянным x) — NaN.
+    """
+    from scipy.stats import t as t_dist
+
+    index = Y.columns if isinstance(Y, pd.DataFrame) else None
+    x = np.asarray(x, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    n, xbar, ybar, sxx, sxy, syy = _centered_sums(x[:, None], Y)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ok = (n >= 2) & (sxx > 0)
+        slope = np.where(ok, sxy / sxx, np.nan)
+        intercept = ybar - slope * xbar
+        # Как в scipy: для постоянного y корреляция не определена — r (и p, stderr при n > 2) NaN
+        r = np.where(syy > 0, sxy / np.sqrt(sxx * syy), np.nan)
+        r = np.clip(r, -1.0, 1.0)
+        df = n - 2
+        # Для двух точек p = 0 (или 1 для горизонтальной прямой), stderr = 0
+        tstat = r * np.sqrt(df / ((1.0 - r) * (1.0 + r) + 1e-20))
+        pvalue = np.where(df > 0, 2 * t_dist.sf(np.abs(tstat), np.maximum(df, 1)), np.where(syy > 0, 0.0, 1.0))
+        stderr = np.where(df > 0, np.sqrt((1 - r * r) * syy / sxx / df), 0.0)
+
+    out = pd.DataFrame({
+        "n": n.astype(int),
+        "slope": slope,
+        "intercept": intercept,
+        "rvalue": np.where(ok, r, np.nan),
+        "pvalue": np.where(ok, pvalue, np.nan),
+        "stderr": np.where(ok, stderr, np.nan),
+    }, index=index)
+    return out
+
+
+def fit_stability(
+    time: np.ndarray,
+    values: np.ndarray,
+    lower=None,
+    upper=None,
+    confidence: float = 0.95,
+    pooling_alpha: float = POOLING_ALPHA,
+    horizon: Optional[float] = None,
+    grid_points: int = 241,
+) -> StabilityResult:
+    """
+    time: (T,) или (S, T); values: (T, B) или (S, T, B); NaN — нет измерения.
+    lower/upper: Min/Max — скаляр или (S,); None/NaN — граница не задана.
+    horizon: до какого момента искать пересечение (по умолчанию 5× последней точки).
+    """
+    from scipy.stats import f as f_dist, t as t_dist
+
+    time = np.asarray(time, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 2:
+        time, values = time[None, :], values[None, :, :]
+    if values.shape[2] == 0:
+        raise ValueError("stability fit requires at least one batch (values has no columns)")
+    S = values.shape[0]
+    lower = np.broadcast_to(np.asarray(np.nan if lower is None else lower, dtype=float), (S,)).copy()
+    upper = np.broadcast_to(np.asarray(np.nan if upper is None else upper, dtype=float), (S,)).copy()
+
+    n, tbar, ybar, sxx, sxy, syy_c = _centered_sums(time[:, :, None], values)
+    mask = ~np.isnan(values) & ~np.isnan(np.broadcast_to(time[:, :, None], values.shape))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Серии, по которым можно построить прямую
+        valid = (n >= 2) & (sxx > 1e-12)
+        sxx_v = np.where(valid, sxx, np.nan)
+        slope = sxy / sxx_v
+        intercept = ybar - slope * tbar
+        k = valid.sum(axis=1).astype(float)
+        N = np.where(valid, n, 0).sum(axis=1)
+
+        def vsum(a):
+            return np.where(valid, a, 0.0).sum(axis=1)
+
+        # Модель 1: отдельные наклоны и свободные члены
+        sse_full = vsum(syy_c - sxy * sxy / sxx_v)
+        df_full = N - 2 * k
+        # Модель 2: общий наклон, отдельные свободные члены
+        sxx_w, sxy_w = vsum(sxx), vsum(sxy)
+        b_common = sxy_w / sxx_w
+        sse_cs = vsum(syy_c) - sxy_w * sxy_w / sxx_w
+        df_cs = N - k - 1
+        # Модель 3: все серии вместе (суммы квадратов раскладываются на внутри- и межсерийные)
+        T_n = N
+        T_tbar, T_ybar = vsum(n * tbar) / T_n, vsum(n * ybar) / T_n
+        dt, dy = tbar - T_tbar[:, None], ybar - T_ybar[:, None]
+        T_sxx = vsum(sxx + n * dt * dt)
+        T_sxy = vsum(sxy + n * dt * dy)
+        T_syy = vsum(syy_c + n * dy * dy)
+        b_pooled = T_sxy / T_sxx
+        sse_p = T_syy - T_sxy * T_sxy / T_sxx
+        df_p = N - 2
+
+        # Тесты объединения (F-тесты ANCOVA)
+        f_slopes = ((sse_cs - sse_full) / (k - 1)) / (sse_full / df_full)
+        f_inter = ((sse_p - sse_cs) / (k - 1)) / (sse_cs / df_cs)
+        p_slopes = np.where((k > 1) & (df_full > 0), f_dist.sf(f_slopes, k - 1, np.maximum(df_full, 1)), np.nan)
+        p_inter = np.where((k > 1) & (df_cs > 0), f_dist.sf(f_inter, k - 1, np.maximum(df_cs, 1)), np.nan)
+
+    single = k == 1
+    slopes_pool = single | (p_slopes > pooling_alpha)
+    inter_pool = slopes_pool & (single | (p_inter > pooling_alpha))
+    model = np.where(inter_pool, "pooled", np.where(slopes_pool, "common_slope", "separate"))
+
+    # Параметры средней линии выбранной модели для каждой серии: (S, B)
+    sel_p, sel_c = inter_pool[:, None], (slopes_pool & ~inter_pool)[:, None]
+
+    def pick(pooled, common, separate):
+        out = np.where(sel_p, pooled, np.where(sel_c, common, separate))
+        return np.broadcast_to(out, valid.shape).copy()
+
+    def col(a):
+        return np.asarray(a, dtype=float)[:, None]
+
+    m_ybar = pick(col(T_ybar), ybar, ybar)
+    m_tbar = pick(col(T_tbar), tbar, tbar)
+    m_b = pick(col(b_pooled), col(b_common), slope)
+    m_n = pick(col(T_n), n, n)
+    m_sxx = pick(col(T_sxx), col(sxx_w), sxx_v)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        m_s2 = pick(col(sse_p / df_p), col(sse_cs / df_cs), col(sse_full / df_full))
+    m_df = pick(col(df_p), col(df_cs), col(df_full))
+    m_tcrit = np.where(m_df > 0, t_dist.ppf(confidence, np.maximum(m_df, 1)), np.nan)
+    for a in (m_ybar, m_tbar, m_b, m_n, m_sxx, m_s2, m_tcrit):
+        a[~valid] = np.nan
+
+    # Пересечение границ: сетка, затем бисекция между соседними узлами
+    t_last = np.nanmax(np.where(mask.any(axis=2), time, np.nan), axis=1)
+    if horizon is None:
+        horizon = 5.0 * np.nanmax(t_last)
+    grid = np.linspace(0.0, float(horizon), grid_points)
+    params = tuple(a[:, :, None] for a in (m_ybar, m_tbar, m_b, m_n, m_sxx, m_s2, m_tcrit))
+    lo3, up3 = lower[:, None, None], upper[:, None, None]
+
+    def crossed(tt):
+        _, lo_b, up_b = _bounds(tt, *params)
+        with np.errstate(invalid="ignore"):
+            return (lo_b < lo3) | (up_b > up3)
+
+    hit = crossed(grid[None, None, :])                       # (S, B, G)
+    any_hit = hit.any(axis=2)
+    first = hit.argmax(axis=2)
+    left = grid[np.maximum(first - 1, 0)]
+    right = grid[first]
+    for _ in range(40):
+        mid = (left + right) / 2
+        c = crossed(mid[:, :, None])[:, :, 0]
+        right = np.where(c, mid, right)
+        left = np.where(c, left, mid)
+    batch_life = np.where(any_hit, np.where(first == 0, 0.0, right), np.inf)
+    batch_life = np.where(valid & np.isfinite(m_tcrit), batch_life, np.nan)
+
+    all_nan = np.isnan(batch_life).all(axis=1)
+    filled = np.where(np.isnan(batch_life), np.inf, batch_life)
+    shelf_life = np.where(all_nan, np.nan, filled.min(axis=1))
+    # При полном объединении линия общая — лимитирующей серии нет
+    limiting = np.where(all_nan | np.isinf(shelf_life) | inter_pool, -1, filled.argmin(axis=1))
+
+    return StabilityResult(
+        n=n,
+        slope=slope,
+        intercept=intercept,
+        p_slopes=p_slopes,
+        p_intercepts=np.where(slopes_pool, p_inter, np.nan),
+        model=model,
+        batch_shelf_life=batch_life,
+        shelf_life=shelf_life,
+        limiting_batch=limiting,
+        extrapolation_limit=np.minimum(2 * t_last, t_last + 12),
+        lower=lower,
+        upper=upper,
+        _ybar=m_ybar,
+        _tbar=m_tbar,
+        _b=m_b,
+        _n_eff=m_n,
+        _sxx=m_sxx,
+        _s2=m_s2,
+        _t_crit=m_tcrit,
+    )
@@ -0,0 +1,614 @@
+# utils/temp_humidity.py
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "crossing_mask",
+    "find_threshold_crossings",
+    "excursion_events",
+    "interval_weights",
+    "mean_kinetic_temperature",
+    "rolling_mkt",
+    "time_out_of_range",
+    "period_summary",
+    "LOGGER_COLUMNS",
+    "normalize_logger_frame",
+    "LoggerAccumulator",
+    "summarize_bins",
+    "rolling_mkt_bins",
+]
+
+# {имя столбца: (нижний лимит, верхний лимит)}
+Limits = Dict[str, Tuple[float, float]]
+
+# ΔH/R для средней кинетической температуры (USP <1079>: ΔH = 83.144 кДж/моль), К
+DELTA_H_R = 10000.0
+KELVIN = 273.15
+
+
+def crossing_mask(values: np.ndarray, lower: float, upper: float) -> np.ndarray:
+    """
+    Булев массив длины n: True в точке i, если между i-1 и i значение пересекло
+    нижний или верхний лимит. Семантика совпадает с прежним построчным циклом:
+      нижний:  prev <  L <= curr  или  prev >= L >  curr
+      верхний: prev <  U <= curr  или  prev >  U >= curr
+    Точка 0 никогда не считается пересечением.
+    """
+    v = np.asarray(values, dtype=float)
+    mask = np.zeros(v.shape[0], dtype=bool)
+    if v.shape[0] < 2:
+        return mask
+    prev, curr = v[:-1], v[1:]
+    mask[1:] = (
+        ((prev < lower) & (lower <= curr)) | ((prev >= lower) & (lower > curr)) |
+        ((prev < upper) & (upper <= curr)) | ((prev > upper) & (upper >= curr))
+    )
+    return mask
+
+
+def find_threshold_crossings(df: pd.DataFrame, limits: Limits, time_col: str = "time") -> pd.DataFrame:
+    """
+    Строки, в которых хотя бы один параметр пересёк свой лимит.
+    Возвращает таблицу того же вида, что и раньше: time + значения параметров.
+    """
+    columns = [time_col] + list(limits)
+    mask = np.zeros(len(df), dtype=bool)
+    for col, (lower, upper) in limits.items():
+        mask |= crossing_mask(df[col].to_numpy(), lower, upper)
+    return df.loc[mask, columns].reset_index(drop=True)
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Начала и концы (не включая) непрерывных серий True."""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def excursion_events(df: pd.DataFrame, limits: Limits, time_col: str = "time") -> pd.DataFrame:
+    """
+    События выхода за лимиты: по каждому параметру и каждой границе —
+    начало, конец (первая точка после возврата в диапазон либо последняя точка),
+    длительность, число точек и экстремальное значение внутри события.
+    """
+    times = df[time_col].to_numpy()
+    n = len(df)
+    frames = []
+    for col, (lower, upper) in limits.items():
+        v = df[col].to_numpy(dtype=float)
+        for side, limit, out, reduce, fill in (
+            ("lower", lower, v < lower, np.minimum, np.inf),
+            ("upper", upper, v > upper, np.maximum, -np.inf),
+        ):
+            starts, stops = _runs(out)
+            if starts.size == 0:
+                continue
+            # reduceat берёт отрезки [start_i, start_{i+1}); точки в диапазоне
+            # между событиями заполнены нейтральным значением и не влияют на экстремум
+            extreme = reduce.reduceat(np.where(out, v, fill), starts)
+            ends = times[np.minimum(stops, n - 1)]
+            frames.append(pd.DataFrame({
+                "parameter": col,
+                "limit": side,
+                "limit_value": limit,
+                "start": times[starts],
+                "end": ends,
+                "duration": ends - times[starts],
+                "points": stops - starts,
+                "extreme": extreme,
+            }))
+    if not frames:
+        return pd.DataFrame(columns=[
+            "parameter", "limit", "limit_value", "start", "end", "duration", "points", "extreme",
+        ])
+    return pd.concat(frames, ignore_index=True).sort_values("start", kind="stable").reset_index(drop=True)
+
+
+# --------- GDP: время вне диапазона, MKT, агрегаты по периодам ---------
+#
+# Все расчёты взвешены по времени: точка i «действует» до следующей точки
+# (вес t[i+1] - t[i]), последняя точка имеет нулевой вес. Тогда время вне
+# диапазона по границе совпадает с суммой длительностей excursion_events.
+
+def _interval_ns(times) -> np.ndarray:
+    """Вес каждой точки в наносекундах: интервал до следующей точки, у последней — 0."""
+    ns = pd.to_datetime(np.asarray(times)).asi8 if len(times) else np.zeros(0, dtype=np.int64)
+    return np.diff(ns, append=ns[-1:]) if len(ns) else ns
+
+
+def interval_weights(times) -> np.ndarray:
+    """Веса точек для взвешивания по времени, в секундах (см. выше)."""
+    return _interval_ns(times) / 1e9
+
+
+def _arrhenius(temps_c: np.ndarray, delta_h_r: float) -> np.ndarray:
+    return -delta_h_r / (np.asarray(temps_c, dtype=float) + KELVIN)
+
+
+def _mkt_from_sums(exp_sum, weight_sum, shift, delta_h_r):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return delta_h_r / -(shift + np.log(exp_sum / weight_sum)) - KELVIN
+
+
+def mean_kinetic_temperature(temps_c, weights=None, delta_h_r: float = DELTA_H_R) -> float:
+    """
+    Средняя кинетическая температура, °C:
+        MKT = (ΔH/R) / -ln( Σ w·exp(-ΔH/(R·T)) / Σ w ) - 273.15
+    weights — длительности точек (None или все нули — равные веса). NaN не учитываются.
+    """
+    a = _arrhenius(temps_c, delta_h_r)
+    w = np.ones_like(a) if weights is None else np.asarray(weights, dtype=float)
+    ok = ~np.isnan(a)
+    if not ok.any():
+        return float("nan")
+    if not (w[ok] > 0).any():
+        w = np.ones_like(a)
+    # Сдвиг на максимум показателя — экспоненты порядка 1e-15 не теряют точность
+    shift = a[ok].max()
+    return float(_mkt_from_sums((w[ok] * np.exp(a[ok] - shift)).sum(), w[ok].sum(), shift, delta_h_r))
+
+
+def rolling_mkt(
+    df: pd.DataFrame,
+    window: str = "30D",
+    col: str = "temperature",
+    time_col: str = "time",
+    delta_h_r: float = DELTA_H_R,
+) -> pd.Series:
+    """
+    Скользящая MKT по временному окну (pandas offset: "24h", "7D", "30D").
+    df должен быть отсортирован по времени. Индекс результата — время.
+    """
+    times = pd.DatetimeIndex(df[time_col])
+    w = interval_weights(times)
+    a = _arrhenius(df[col].to_numpy(), delta_h_r)
+    ok = ~np.isnan(a)
+    shift = a[ok].max() if ok.any() else 0.0
+    sums = pd.DataFrame({
+        "e": np.where(ok, w * np.exp(np.where(ok, a, shift) - shift), 0.0),
+        "w": np.where(ok, w, 0.0),
+    }, index=times).rolling(window).sum()
+    # Окно из одной последней точки имеет нулевой вес
+    return pd.Series(_mkt_from_sums(sums["e"].to_numpy(), sums["w"].to_numpy(), shift, delta_h_r),
+                     index=times, name="mkt")
+
+
+def time_out_of_range(df: pd.DataFrame, limits: Limits, time_col: str = "time") -> pd.DataFrame:
+    """
+    Суммарное время вне диапазона по каждой границе: длительность, доля от
+    периода записи (%), число событий и самое длинное событие.
+    """
+    w = _interval_ns(df[time_col])
+    total = w.sum()
+    events = excursion_events(df, limits, time_col=time_col)
+    rows = []
+    for col, (lower, upper) in limits.items():
+        v = df[col].to_numpy(dtype=float)
+        for side, limit, out in (("lower", lower, v < lower), ("upper", upper, v > upper)):
+            ev = events[(events["parameter"] == col) & (events["limit"] == side)]
+            out_ns = int(w[out].sum())
+            rows.append({
+                "parameter": col,
+                "limit": side,
+                "limit_value": limit,
+                "time_out": pd.Timedelta(out_ns, "ns"),
+                "percent": out_ns / total * 100 if total else 0.0,
+                "events": int(len(ev)),
+                "longest": pd.Timedelta(ev["duration"].max()) if len(ev) else pd.Timedelta(0),
+            })
+    return pd.DataFrame(rows)
+
+
+def _mkt_shift(delta_h_r: float) -> float:
+    """
+    Фиксированный сдвиг показателя экспоненты (опорная точка 25 °C): одинаков для
+    любых частей данных, поэтому частичные суммы можно складывать.
+    """
+    return -delta_h_r / (25.0 + KELVIN)
+
+
+def _bin_sums(
+    df: pd.DataFrame,
+    weights: np.ndarray,
+    key,
+    limits: Limits,
+    mkt_col: Optional[str] = "temperature",
+    delta_h_r: float = DELTA_H_R,
+) -> pd.DataFrame:
+    """
+    Аддитивные суммы по интервалам key: вес, Σw·v, Σv, n, min, max, вес вне
+    диапазона, суммы для MKT. Суммы частей данных объединяет _merge_bins.
+    """
+    w = np.asarray(weights, dtype=float)
+    codes, periods = pd.factorize(np.asarray(key), sort=True)
+    k = len(periods)
+    # Выгрузки почти всегда идут по времени — тогда min/max считаются через reduceat
+    ordered = codes.size == 0 or bool((np.diff(codes) >= 0).all())
+    starts = np.flatnonzero(np.diff(codes, prepend=-1)) if ordered else None
+
+    def total(x):
+        return np.bincount(codes, weights=x, minlength=k)
+
+    def extreme(v, ufunc, how):
+        if ordered:
+            return ufunc.reduceat(v, starts) if k else np.zeros(0)
+        return getattr(pd.Series(v).groupby(codes), how)().reindex(range(k)).to_numpy()
+
+    parts = {"points": np.bincount(codes, minlength=k).astype(float), "_w": total(w)}
+    for col, (lower, upper) in limits.items():
+        v = df[col].to_numpy(dtype=float)
+        ok = ~np.isnan(v)
+        parts[f"{col}_wv"] = total(np.where(ok, w * v, 0.0))
+        parts[f"{col}_ww"] = total(np.where(ok, w, 0.0))
+        parts[f"{col}_sum"] = total(np.where(ok, v, 0.0))
+        parts[f"{col}_n"] = total(ok.astype(float))
+        with np.errstate(invalid="ignore"):
+            parts[f"{col}_min"] = extreme(v, np.fmin, "min")
+            parts[f"{col}_max"] = extreme(v, np.fmax, "max")
+        parts[f"{col}_out"] = total(np.where((v < lower) | (v > upper), w, 0.0))
+    if mkt_col is not None:
+        a = _arrhenius(df[mkt_col].to_numpy(), delta_h_r)
+        ok = ~np.isnan(a)
+        e = np.exp(np.where(ok, a, 0.0) - _mkt_shift(delta_h_r))
+        parts["_e"], parts["_ew"] = total(np.where(ok, w * e, 0.0)), total(np.where(ok, w, 0.0))
+        parts["_e1"], parts["_e1n"] = total(np.where(ok, e, 0.0)), total(ok.astype(float))
+    out = pd.DataFrame(parts, index=pd.DatetimeIndex(periods))
+    out.index.name = "period"
+    return out
+
+
+def _merge_bins(frame: pd.DataFrame) -> pd.DataFrame:
+    """Сложить строки с одинаковым интервалом (min/max — по смыслу)."""
+    grouped = frame.groupby(level=0)
+    mins = [c for c in frame.columns if c.endswith("_min")]
+    maxs = [c for c in frame.columns if c.endswith("_max")]
+    sums = [c for c in frame.columns if c not in mins and c not in maxs]
+    out = pd.concat([grouped[sums].sum(), grouped[mins].min(), grouped[maxs].max()], axis=1)[list(frame.columns)]
+    out.index.name = "period"
+    return out
+
+
+def _summarize_bins(sums: pd.DataFrame, limits: Limits, delta_h_r: float = DELTA_H_R) -> pd.DataFrame:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = pd.DataFrame({"points": sums["points"].astype(int)}, index=sums.index)
+        for col in limits:
+            # Период без веса (одна последняя точка) — обычное среднее
+            weighted = sums[f"{col}_ww"] > 0
+            out[f"{col}_mean"] = np.where(weighted, sums[f"{col}_wv"] / sums[f"{col}_ww"],
+                                          sums[f"{col}_sum"] / sums[f"{col}_n"])
+            out[f"{col}_min"] = sums[f"{col}_min"]
+            out[f"{col}_max"] = sums[f"{col}_max"]
+            out[f"{col}_out_h"] = sums[f"{col}_out"] / 3600.0
+        if "_e" in sums:
+            weighted = sums["_ew"] > 0
+            e = np.where(weighted, sums["_e"], sums["_e1"])
+            n = np.where(weighted, sums["_ew"], sums["_e1n"])
+            out["mkt"] = _mkt_from_sums(e, n, _mkt_shift(delta_h_r), delta_h_r)
+    return out.reset_index()
+
+
+def _period_key(times, freq: str) -> np.ndarray:
+    """Начало периода для каждой точки (недели — с понедельника)."""
+    times = pd.DatetimeIndex(pd.to_datetime(np.asarray(times)))
+    if freq.upper().startswith("W"):
+        return times.to_period(freq).start_time.to_numpy()
+    return times.floor(freq).to_numpy()
+
+
+def period_summary(
+    df: pd.DataFrame,
+    limits: Limits,
+    freq: str = "D",
+    time_col: str = "time",
+    mkt_col: Optional[str] = "temperature",
+    delta_h_r: float = DELTA_H_R,
+) -> pd.DataFrame:
+    """
+    Агрегаты по дням ("D") или неделям ("W"): для каждого параметра —
+    взвешенное по времени среднее, min, max и часы вне диапазона; MKT периода.
+    Интервал точки целиком относится к периоду, в котором она записана.
+    """
+    times = df[time_col]
+    sums = _bin_sums(df, interval_weights(times), _period_key(times, freq), limits, mkt_col, delta_h_r)
+    return _summarize_bins(sums, limits, delta_h_r)
+
+
+# --------- Потоковая обработка больших выгрузок логгеров ---------
+
+LOGGER_COLUMNS = ["time", "temperature", "humidity"]
+
+
+def normalize_logger_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Первые три столбца выгрузки -> time, temperature, humidity; строки без
+    времени или без значений отбрасываются.
+    """
+    work = df.iloc[:, :3].copy()
+    work.columns = LOGGER_COLUMNS
+    work["time"] = pd.to_datetime(work["time"], errors="coerce")
+    work["temperature"] = pd.to_numeric(work["temperature"], errors="coerce")
+    work["humidity"] = pd.to_numeric(work["humidity"], errors="coerce")
+    return work.dropna().reset_index(drop=True)
+
+
+class LoggerAccumulator:
+    """
+    Инкрементальный расчёт по частям выгрузки: статистика, пересечения лимитов, события, время вне диапазона,
+    MKT и почасовые суммы (из них — агрегаты по дням/неделям и скользящая MKT).
+    Память ограничена: строки не хранятся, кроме первых preview_rows, до
+    keep_rows строк для графика и не более max_rows пересечений/событий.
+
+    Последняя строка каждой части ждёт следующую: её вес (интервал до
+    следующей точки) известен только тогда. finish() обрабатывает её с весом 0.
+
+    Потоковый расчёт требует хронологического порядка. Если время идёт назад
+    (например, выгрузка «сначала новые»), накопитель переходит в режим буфера:
+    строки копятся (не больше keep_rows, иначе ValueError), finish() сортирует
+    их по времени и считает заново; в результате unsorted = True.
+    """
+
+    def __init__(
+        self,
+        limits: Limits,
+        bin_freq: str = "h",
+        preview_rows: int = 10,
+        keep_rows: int = 100_000,
+        max_rows: int = 10_000,
+        delta_h_r: float = DELTA_H_R,
+    ):
+        self.limits = dict(limits)
+        self.bin_freq = bin_freq
+        self.preview_rows = preview_rows
+        self.keep_rows = keep_rows
+        self.max_rows = max_rows
+        self.delta_h_r = delta_h_r
+
+        self.rows = 0
+        self.preview = pd.DataFrame(columns=LOGGER_COLUMNS)
+        self._kept: Optional[list] = []
+        self._pending: Optional[pd.DataFrame] = None     # последняя строка, ждущая следующую
+        self._prev_values: Optional[np.ndarray] = None   # значения предыдущей обработанной строки
+        # Статистика по Чану: n, среднее, M2, min, max
+        self._stats = {col: [0, 0.0, 0.0, np.inf, -np.inf] for col in self.limits}
+        self._bins: list = []
+        self._crossings: list = []
+        self.crossing_count = 0
+        # События: закрытые (не более max_rows строк) и открытые по (параметр, граница)
+        self._events: list = []
+        self.event_count = 0
+        self._open: Dict[Tuple[str, str], dict] = {}
+        self._longest = {(col, side): 0 for col in self.limits for side in ("lower", "upper")}
+        self._count = dict.fromkeys(self._longest, 0)
+        self._out_ns = dict.fromkeys(self._longest, 0)
+        self._total_ns = 0
+        self._mkt = np.zeros(4)   # Σw·e, Σw, Σe, n — последние два на случай нулевых весов
+        self._last_time = None
+        self.unsorted = False
+
+    # --- приём данных ---
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """Добавить очередную часть (столбцы time + параметры из limits)."""
+        if chunk.empty:
+            return
+        if len(self.preview) < self.preview_rows:
+            self.preview = pd.concat([self.preview, chunk.head(self.preview_rows - len(self.preview))],
+                                     ignore_index=True) if len(self.preview) else chunk.head(self.preview_rows).copy()
+        self.rows += len(chunk)
+        if self._kept is not None:
+            self._kept.append(chunk)
+            if self.rows > self.keep_rows:
+                self._kept = None
+
+        work = chunk if self._pending is None else pd.concat([self._pending, chunk], ignore_index=True)
+        ns = pd.to_datetime(work["time"]).to_numpy().astype("datetime64[ns]").view("i8")
+        w_ns = np.diff(ns)
+        if not self.unsorted and (w_ns < 0).any():
+            self.unsorted = True
+        if self.unsorted:
+            if self._kept is None:
+                raise ValueError(
+                    f"logger export is not in chronological order and has more than {self.keep_rows:,} rows; "
+                    "sort it by time before uploading"
+                )
+            # Статистика от порядка не зависит — её видно по ходу чтения; остальное считает finish()
+            self._update_stats({col: chunk[col].to_numpy(dtype=float) for col in self.limits})
+            return
+        self._pending = work.iloc[-1:].reset_index(drop=True)
+        # Вес строки — интервал до следующей
+        self._process(work.iloc[:-1], w_ns, ns[1:])
+
+    def _process(self, rows: pd.DataFrame, w_ns: np.ndarray, next_ns: np.ndarray) -> None:
+        if rows.empty:
+            return
+        times = rows["time"].to_numpy()
+        values = {col: rows[col].to_numpy(dtype=float) for col in self.limits}
+        self._total_ns += int(w_ns.sum())
+        self._last_time = pd.Timestamp(next_ns[-1])
+
+        self._update_stats(values)
+
+        # Пересечения: первая строка части сравнивается с последней строкой предыдущей
+        mask = np.zeros(len(rows), dtype=bool)
+        for i, (col, (lower, upper)) in enumerate(self.limits.items()):
+            v = values[col]
+            if self._prev_values is not None:
+                mask |= crossing_mask(np.concatenate(([self._prev_values[i]], v)), lower, upper)[1:]
+            else:
+                mask |= crossing_mask(v, lower, upper)
+        self._prev_values = np.array([values[col][-1] for col in self.limits])
+        self.crossing_count += int(mask.sum())
+        room = self.max_rows - sum(len(c) for c in self._crossings)
+        if room > 0 and mask.any():
+            self._crossings.append(rows.loc[mask, ["time", *self.limits]].head(room))
+
+        # События и время вне диапазона
+        for col, (lower, upper) in self.limits.items():
+            v = values[col]
+            for side, limit, out, reduce, fill in (
+                ("lower", lower, v < lower, np.minimum, np.inf),
+                ("upper", upper, v > upper, np.maximum, -np.inf),
+            ):
+                self._out_ns[(col, side)] += int(w_ns[out].sum())
+                self._track_events(col, side, limit, times, v, out, reduce, fill)
+
+        # MKT и почасовые суммы
+        w = w_ns / 1e9
+        a = _arrhenius(values.get("temperature", np.full(len(rows), np.nan)), self.delta_h_r)
+        ok = ~np.isnan(a)
+        e = np.exp(a[ok] - _mkt_shift(self.delta_h_r))
+        self._mkt += np.array([(w[ok] * e).sum(), w[ok].sum(), e.sum(), ok.sum()])
+        mkt_col = "temperature" if "temperature" in self.limits else None
+        self._bins.append(_bin_sums(rows, w, _period_key(times, self.bin_freq), self.limits, mkt_col, self.delta_h_r))
+        if len(self._bins) > 64:
+            self._bins = [_merge_bins(pd.concat(self._bins))]
+
+    def _update_stats(self, values: Dict[str, np.ndarray]) -> None:
+        for col, v in values.items():
+            v = v[~np.isnan(v)]
+            if v.size == 0:
+                continue
+            st = self._stats[col]
+            n_b, mean_b = v.size, v.mean()
+            m2_b = ((v - mean_b) ** 2).sum()
+            n = st[0] + n_b
+            delta = mean_b - st[1]
+            st[2] += m2_b + delta * delta * st[0] * n_b / n
+            st[1] += delta * n_b / n
+            st[0] = n
+            st[3], st[4] = min(st[3], v.min()), max(st[4], v.max())
+
+    def _track_events(self, col, side, limit, times, v, out, reduce, fill) -> None:
+        key = (col, side)
+        starts, stops = _runs(out)
+        current = self._open.pop(key, None)
+        if current is not None and (starts.size == 0 or starts[0] != 0):
+            # Событие из предыдущей части закончилось на первой строке этой части
+            self._emit(key, limit, [current["start"]], [times[0]], [current["points"]], [current["extreme"]])
+            current = None
+        if starts.size == 0:
+            return
+        extreme = reduce.reduceat(np.where(out, v, fill), starts)
+        points = stops - starts
+        begin = times[starts].copy()
+        if current is not None:
+            begin[0] = current["start"]
+            points[0] += current["points"]
+            extreme[0] = reduce(extreme[0], current["extreme"])
+        closed = stops < len(v)
+        if not closed[-1]:
+            # Событие продолжается в следующей части
+            self._open[key] = {"start": begin[-1], "points": int(points[-1]), "extreme": extreme[-1]}
+        self._emit(key, limit, begin[closed], times[stops[closed]], points[closed], extreme[closed])
+
+    def _emit(self, key, limit, start, end, points, extreme) -> None:
+        """Записать закрытые события (счётчики — все, строки таблицы — до max_rows)."""
+        if len(start) == 0:
+            return
+        start = np.asarray(start, dtype="datetime64[ns]")
+        end = np.asarray(end, dtype="datetime64[ns]")
+        duration = end - start
+        self.event_count += len(start)
+        self._count[key] += len(start)
+        self._longest[key] = max(self._longest[key], int(duration.max().astype(np.int64)))
+        room = self.max_rows - sum(len(e) for e in self._events)
+        if room > 0:
+            col, side = key
+            self._events.append(pd.DataFrame({
+                "parameter": col,
+                "limit": side,
+                "limit_value": limit,
+                "start": start,
+                "end": end,
+                "duration": duration,
+                "points": np.asarray(points, dtype=int),
+                "extreme": np.asarray(extreme, dtype=float),
+            }).head(room))
+
+    # --- результаты ---
+
+    def current_stats(self) -> Dict[str, dict]:
+        """n, mean, min, max, std (ddof=1), rsd по уже обработанным строкам — доступно до конца чтения."""
+        stats = {}
+        for col, (n, mean, m2, lo, hi) in self._stats.items():
+            std = float(np.sqrt(m2 / (n - 1))) if n > 1 else float("nan")
+            stats[col] = {"n": n, "mean": mean if n else float("nan"), "min": lo, "max": hi, "std": std,
+                          "rsd": std / mean * 100 if n and mean else None}
+        return stats
+
+    def finish(self) -> dict:
+        """
+        Обработать последнюю строку (вес 0) и вернуть результаты:
+        stats, crossings, events, time_out_of_range, mkt, bins, frame (если строк
+        не больше keep_rows, иначе None), preview, rows, unsorted.
+        """
+        if self.unsorted:
+            # Буфер строк в порядке файла -> сортировка по времени и расчёт заново
+            frame = pd.concat(self._kept, ignore_index=True).sort_values("time", kind="stable")
+            replay = LoggerAccumulator(self.limits, self.bin_freq, self.preview_rows, self.keep_rows,
+                                       self.max_rows, self.delta_h_r)
+            replay.update(frame.reset_index(drop=True))
+            result = replay.finish()
+            result["preview"] = self.preview
+            result["unsorted"] = True
+            return result
+        if self._pending is not None:
+            ns = self._pending["time"].to_numpy().astype("datetime64[ns]").view("i8")
+            self._process(self._pending, np.zeros(1, dtype=np.int64), ns)
+            self._pending = None
+        for (col, side), event in list(self._open.items()):
+            # Как в excursion_events: незакрытое событие кончается на последней точке
+            self._emit((col, side), self.limits[col][0 if side == "lower" else 1],
+                       [event["start"]], [self._last_time], [event["points"]], [event["extreme"]])
+        self._open.clear()
+
+        stats = self.current_stats()
+        rows = []
+        for (col, side), out_ns in self._out_ns.items():
+            rows.append({
+                "parameter": col,
+                "limit": side,
+                "limit_value": self.limits[col][0 if side == "lower" else 1],
+                "time_out": pd.Timedelta(out_ns, "ns"),
+                "percent": out_ns / self._total_ns * 100 if self._total_ns else 0.0,
+                "events": self._count[(col, side)],
+                "longest": pd.Timedelta(self._longest[(col, side)], "ns"),
+            })
+
+        events_cols = ["parameter", "limit", "limit_value", "start", "end", "duration", "points", "extreme"]
+        events = pd.concat(self._events, ignore_index=True) if self._events else pd.DataFrame(columns=events_cols)
+        events = events.sort_values("start", kind="stable").reset_index(drop=True)
+        crossings = (pd.concat(self._crossings, ignore_index=True) if self._crossings
+                     else pd.DataFrame(columns=["time", *self.limits]))
+        bins = _merge_bins(pd.concat(self._bins)) if self._bins else None
+        e, n = self._mkt[:2] if self._mkt[1] > 0 else self._mkt[2:]
+        mkt = float(_mkt_from_sums(e, n, _mkt_shift(self.delta_h_r), self.delta_h_r))
+        return {
+            "rows": self.rows,
+            "preview": self.preview,
+            "stats": stats,
+            "crossings": crossings,
+            "crossing_count": self.crossing_count,
+            "events": events,
+            "event_count": self.event_count,
+            "time_out_of_range": pd.DataFrame(rows),
+            "mkt": mkt,
+            "bins": bins,
+            "frame": pd.concat(self._kept, ignore_index=True) if self._kept else None,
+            "unsorted": False,
+        }
+
+
+def summarize_bins(bins: pd.DataFrame, limits: Limits, freq: str = "D", delta_h_r: float = DELTA_H_R) -> pd.DataFrame:
+    """period_summary по почасовым суммам LoggerAccumulator (дни/недели)."""
+    regrouped = bins.copy()
+    regrouped.index = _period_key(bins.index, freq)
+    return _summarize_bins(_merge_bins(regrouped), limits, delta_h_r)
+
+
+def rolling_mkt_bins(bins: pd.DataFrame, window: str = "30D", delta_h_r: float = DELTA_H_R) -> pd.Series:
+    """Скользящая MKT по почасовым суммам (точность — один интервал суммирования)."""
+    sums = bins[["_e", "_ew"]].rolling(window).sum()
+    return pd.Series(_mkt_from_sums(sums["_e"].to_numpy(), sums["_ew"].to_numpy(), _mkt_shift(delta_h_r), delta_h_r),
+                     index=bins.index, name="mkt")
@@ -0,0 +1,890 @@
+import os
+import unittest
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from utils.analysis import imr_analysis, stability_analysis
+from utils.cache import BoundedCache, hash_data
+from utils.capability import bootstrap_capability, capability_indices, capability_table, percentile_capability
+from utils.data_processing import describe_batch
+from utils.decimation import MAX_POINTS, decimate, decimate_indices
+from utils.distributions import FIT_CACHE, fit_distributions, select_fit
+from utils.figures import FIGURE_CACHE, figure_key, rasterize_figures, render_png
+from utils.i18n import catalog, load_section
+from utils.ingestion import WORKBOOK_CACHE, iter_table_chunks, read_excel_cached
+from utils.kde import bandwidth, kde
+from utils.memo import COMPUTE_CACHE, FUNCTION_STATS, cache_report, cached_call, memoize
+from utils.router import IMPORT_TIMES, load_page
+from utils.spc import (
+    compute_cusum,
+    compute_ewma,
+    compute_imr,
+    compute_imr_columns,
+    compute_xbar,
+    evaluate_rules,
+    imr_summary_table,
+    numeric_columns,
+    subgroup_stats,
+)
+from utils.spc.monitor import ImRMonitor
+from utils.stability import batch_linregress, fit_stability, stack_studies
+from utils.temp_humidity import (
+    LoggerAccumulator,
+    excursion_events,
+    find_threshold_crossings,
+    interval_weights,
+    mean_kinetic_temperature,
+    normalize_logger_frame,
+    period_summary,
+    summarize_bins,
+    time_out_of_range,
+)
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Example")
+
+
+class TestBoundedCache(unittest.TestCase):
+
+    def test_lru_eviction_by_entries(self):
+        """Лишняя запись вытесняет самую давно использованную"""
+        cache = BoundedCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_eviction_by_bytes(self):
+        """Ограничение по суммарному размеру"""
+        cache = BoundedCache(max_entries=10, max_bytes=10, sizeof=len)
+        cache.put("a", b"123456")
+        cache.put("b", b"123456")
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.stats()["bytes"], 6)
+
+    def test_get_or_compute_counts(self):
+        """Повторный запрос берётся из кэша"""
+        cache = BoundedCache()
+        calls = []
+        for _ in range(3):
+            cache.get_or_compute("k", lambda: calls.append(1) or 42)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_ttl_expiry(self):
+        """Просроченная запись — промах, и она удаляется из кэша"""
+        import time
+
+        cache = BoundedCache(ttl=0.01)
+        cache.put("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        time.sleep(0.02)
+        self.assertNotIn("a", cache)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "entries": 0, "bytes": 0})
+
+    def test_hash_nested_arrays(self):
+        """Массивы внутри списков хэшируются по содержимому, а не по сокращённому repr"""
+        a = np.zeros(5000)
+        b = a.copy()
+        b[2500] = 1.0
+        self.assertNotEqual(hash_data([a]), hash_data([b]))
+        self.assertEqual(hash_data((a, {"k": a})), hash_data((a.copy(), {"k": a.copy()})))
+
+
+class TestMemo(unittest.TestCase):
+
+    def setUp(self):
+        COMPUTE_CACHE.clear()
+        FUNCTION_STATS.clear()
+
+    def test_cached_call_reuses_result(self):
+        """Повторный вызов с теми же данными и параметрами не пересчитывается"""
+        x = np.random.default_rng(0).normal(size=200)
+        first = cached_call(compute_imr, x)
+        self.assertIs(cached_call(compute_imr, x.copy()), first)
+        self.assertIsNot(cached_call(compute_ewma, x, lam=0.1), cached_call(compute_ewma, x, lam=0.2))
+        report = cache_report().set_index("name")
+        self.assertEqual(report.at["utils.spc.imr.compute_imr", "hits"], 1)
+        self.assertEqual(report.at["utils.spc.imr.compute_imr", "misses"], 1)
+        self.assertEqual(report.at["compute", "entries"], 3)
+
+    def test_result_sizes_count_arrays(self):
+        """Размер кэшированного результата-dataclass учитывает его массивы"""
+        x = np.random.default_rng(1).normal(size=100_000)
+        cached_call(compute_imr, x)
+        self.assertGreater(COMPUTE_CACHE.stats()["bytes"], 2 * x.nbytes)   # values + скользящие размахи
+        cached_call(compute_imr_columns, pd.DataFrame({"a": x, "b": x[::-1]}))
+        self.assertGreater(COMPUTE_CACHE.stats()["bytes"], 3 * x.nbytes)
+        self.assertGreater(cache_report().set_index("name").at["compute", "bytes"], 3 * x.nbytes)
+
+    def test_memoize_and_errors(self):
+        """Декоратор кэширует результат; исключения не кэшируются"""
+        calls = []
+
+        @memoize
+        def mean_or_fail(values):
+            calls.append(1)
+            if len(values) == 0:
+                raise ValueError("empty")
+            return float(np.mean(values))
+
+        self.assertEqual(mean_or_fail([1.0, 2.0]), 1.5)
+        self.assertEqual(mean_or_fail([1.0, 2.0]), 1.5)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                mean_or_fail([])
+        self.assertEqual(len(calls), 3)
+
+
+class TestFigureCache(unittest.TestCase):
+
+    def test_render_once_and_close(self):
+        """График рендерится один раз на ключ, фигура закрывается после сохранения в PNG"""
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        FIGURE_CACHE.clear()
+        data = np.arange(10.0)
+        calls = []
+
+        def draw():
+            calls.append(1)
+            fig, ax = plt.subplots()
+            ax.plot(data)
+            return fig
+
+        before = len(plt.get_fignums())
+        png1 = render_png(figure_key("test", data, "en"), draw)
+        png2 = render_png(figure_key("test", data.copy(), "en"), draw)
+        self.assertTrue(png1.startswith(b"\x89PNG"))
+        self.assertEqual(png1, png2)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(plt.get_fignums()), before)
+
+        render_png(figure_key("test", data, "pl"), draw)
+        self.assertEqual(len(calls), 2)
+
+    def test_rasterize_parallel_matches_serial(self):
+        """Растеризация в пуле процессов даёт те же PNG; готовые PNG проходят без изменений"""
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        figs = []
+        for i in range(4):
+            fig, ax = plt.subplots(figsize=(3, 2))
+            ax.plot(np.arange(10) * i)
+            figs.append(fig)
+        try:
+            serial = rasterize_figures(figs, dpi=50, max_workers=1)
+            parallel = rasterize_figures(figs + [b"png"], dpi=50, max_workers=2)
+        finally:
+            for fig in figs:
+                plt.close(fig)
+        self.assertEqual(parallel[:4], serial)
+        self.assertEqual(parallel[4], b"png")
+
+
+class TestNumberedCanvas(unittest.TestCase):
+
+    def test_footer_form_per_page(self):
+        """Каждая страница ссылается на свою форму с «Страница X из Y»"""
+        import re
+        from utils.pdf_export import PdfSection, build_pdf
+
+        df = pd.DataFrame({"series": [f"S{i}" for i in range(100)], "value": range(100)})
+        pdf = build_pdf("t", [PdfSection("h", table_df=df)], []).getvalue()
+        pages = len(re.findall(rb"/Type /Page\b", pdf))
+        self.assertGreaterEqual(pages, 3)
+        self.assertEqual(len(re.findall(rb"/Subtype /Form", pdf)), pages)
+        self.assertIn(f"/FormXob.pageFooter{pages} ".encode(), pdf)
+
+
+class TestRouter(unittest.TestCase):
+
+    def test_first_import_timed_once(self):
+        """Модуль импортируется при первом обращении, повторно берётся из sys.modules"""
+        import sys
+        sys.modules.pop("STATANALYZE.analyzer", None)
+        IMPORT_TIMES.pop("STATANALYZE.analyzer", None)
+        module, _, first = load_page("STATANALYZE.analyzer")
+        self.assertTrue(first)
+        self.assertIn("STATANALYZE.analyzer", IMPORT_TIMES)
+        again, seconds, first = load_page("STATANALYZE.analyzer")
+        self.assertIs(again, module)
+        self.assertFalse(first)
+        self.assertEqual(seconds, 0.0)
+
+
+class TestTranslationCatalog(unittest.TestCase):
+
+    def test_catalog_up_to_date(self):
+        """catalog.json пересобран после правки переводов (python -m utils.i18n.build_catalog)"""
+        import json
+        from utils.i18n.build_catalog import build_catalog
+        fresh = json.loads(json.dumps(build_catalog()))
+        self.assertEqual(catalog(), fresh)
+
+    def test_fallbacks_resolved(self):
+        """Секции только из старых словарей доступны на всех языках, неизвестный код -> pl"""
+        for code in ("pl", "en", "ru"):
+            self.assertIn("title", load_section(code, "histogram_analysis"))
+        self.assertEqual(load_section("xx", "general"), load_section("pl", "general"))
+
+
+class TestReadExcelCached(unittest.TestCase):
+
+    def test_parse_once_and_copy(self):
+        """Книга парсится один раз, наружу отдаётся независимая копия"""
+        WORKBOOK_CACHE.clear()
+        with open(os.path.join(EXAMPLE_DIR, "DataBox.xlsx"), "rb") as fh:
+            data = fh.read()
+        df1 = read_excel_cached(data)
+        df1.iloc[0, 0] = "changed"
+        df2 = read_excel_cached(data)
+        self.assertEqual(len(WORKBOOK_CACHE), 1)
+        self.assertNotEqual(df2.iloc[0, 0], "changed")
+
+
+class TestThresholdCrossings(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 500
+        self.df = pd.DataFrame({
+            "time": pd.date_range("2024-01-01", periods=n, freq="min"),
+            "temperature": np.round(25 + rng.normal(0, 1.5, n)),
+            "humidity": np.round(60 + rng.normal(0, 4, n)),
+        })
+        self.limits = {"temperature": (23, 27), "humidity": (55, 65)}
+
+    def test_matches_row_loop(self):
+        """Векторный поиск даёт те же строки, что и прежний цикл"""
+        df = self.df
+        expected = []
+        for i in range(1, len(df)):
+            pt, ct = df["temperature"].iloc[i - 1], df["temperature"].iloc[i]
+            ph, ch = df["humidity"].iloc[i - 1], df["humidity"].iloc[i]
+            if ((pt < 23 <= ct) or (pt >= 23 > ct) or (pt < 27 <= ct) or (pt > 27 >= ct) or
+                    (ph < 55 <= ch) or (ph >= 55 > ch) or (ph < 65 <= ch) or (ph > 65 >= ch)):
+                expected.append(df["time"].iloc[i])
+        result = find_threshold_crossings(df, self.limits)
+        self.assertEqual(list(result["time"]), expected)
+        self.assertEqual(list(result.columns), ["time", "temperature", "humidity"])
+
+    def test_excursion_events(self):
+        """Начало, конец, длительность и экстремум события"""
+        df = pd.DataFrame({
+            "time": pd.date_range("2024-01-01", periods=6, freq="h"),
+            "temperature": [25, 28, 29, 26, 25, 30],
+        })
+        events = excursion_events(df, {"temperature": (23, 27)})
+        self.assertEqual(len(events), 2)
+        first = events.iloc[0]
+        self.assertEqual(first["points"], 2)
+        self.assertEqual(first["extreme"], 29)
+        self.assertEqual(first["duration"], pd.Timedelta(hours=2))
+        self.assertEqual(events.iloc[1]["duration"], pd.Timedelta(0))
+
+    def test_time_out_of_range_and_mkt(self):
+        """Время вне диапазона = сумма длительностей событий; MKT по формуле USP <1079>"""
+        df = self.df
+        out = time_out_of_range(df, self.limits)
+        events = excursion_events(df, self.limits)
+        for r in out.itertuples():
+            ev = events[(events["parameter"] == r.parameter) & (events["limit"] == r.limit)]
+            self.assertEqual(r.time_out, ev["duration"].sum())
+            self.assertEqual(r.longest, ev["duration"].max())
+
+        temps = df["temperature"].to_numpy()
+        expected = 10000 / -np.log(np.mean(np.exp(-10000 / (temps[:-1] + 273.15)))) - 273.15
+        self.assertAlmostEqual(mean_kinetic_temperature(temps, interval_weights(df["time"])), expected)
+
+        hourly = df.assign(time=pd.date_range("2024-01-01", periods=len(df), freq="h"))
+        daily = period_summary(hourly, self.limits)
+        self.assertEqual(len(daily), 21)
+        self.assertEqual(daily["points"].sum(), len(df))
+        temp_out = time_out_of_range(hourly, self.limits).query("parameter == 'temperature'")["time_out"].sum()
+        self.assertAlmostEqual(daily["temperature_out_h"].sum(), temp_out / pd.Timedelta(hours=1))
+
+
+class TestLoggerStreaming(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        n = 1500
+        self.df = pd.DataFrame({
+            "time": pd.date_range("2024-01-01", periods=n, freq="7min"),
+            "temperature": np.round(25 + rng.normal(0, 1.5, n), 1),
+            "humidity": np.round(60 + rng.normal(0, 4, n), 1),
+        })
+        self.limits = {"temperature": (23, 27), "humidity": (55, 65)}
+
+    def test_accumulator_matches_in_memory(self):
+        """Результат по частям любого размера = расчёт по всему DataFrame"""
+        df, limits = self.df, self.limits
+        for size in (61, 500, len(df)):
+            acc = LoggerAccumulator(limits, keep_rows=len(df))
+            for start in range(0, len(df), size):
+                acc.update(df.iloc[start:start + size].reset_index(drop=True))
+            res = acc.finish()
+            pd.testing.assert_frame_equal(res["events"], excursion_events(df, limits), check_dtype=False)
+            pd.testing.assert_frame_equal(res["crossings"], find_threshold_crossings(df, limits), check_dtype=False)
+            pd.testing.assert_frame_equal(res["time_out_of_range"], time_out_of_range(df, limits), check_dtype=False)
+            pd.testing.assert_frame_equal(summarize_bins(res["bins"], limits, "D"), period_summary(df, limits, "D"))
+            self.assertAlmostEqual(res["mkt"], mean_kinetic_temperature(df["temperature"], interval_weights(df["time"])))
+            self.assertAlmostEqual(res["stats"]["humidity"]["std"], df["humidity"].std())
+            self.assertEqual(len(res["frame"]), len(df))
+
+    def test_limits_on_kept_rows(self):
+        """Строки для графика и таблицы событий ограничены keep_rows / max_rows"""
+        acc = LoggerAccumulator(self.limits, keep_rows=1000, max_rows=5)
+        for start in range(0, len(self.df), 400):
+            acc.update(self.df.iloc[start:start + 400].reset_index(drop=True))
+        res = acc.finish()
+        self.assertIsNone(res["frame"])
+        self.assertEqual(len(res["events"]), 5)
+        self.assertEqual(res["event_count"], len(excursion_events(self.df, self.limits)))
+
+    def test_reversed_export(self):
+        """Выгрузка «сначала новые» сортируется по времени: результат как у хронологической"""
+        df, limits = self.df, self.limits
+        expected = LoggerAccumulator(limits, keep_rows=len(df))
+        expected.update(df)
+        expected = expected.finish()
+        reversed_df = df.iloc[::-1].reset_index(drop=True)
+        acc = LoggerAccumulator(limits, keep_rows=len(df))
+        for start in range(0, len(df), 400):
+            acc.update(reversed_df.iloc[start:start + 400].reset_index(drop=True))
+        res = acc.finish()
+        self.assertTrue(res["unsorted"])
+        self.assertFalse(expected["unsorted"])
+        for name in ("events", "crossings", "time_out_of_range"):
+            pd.testing.assert_frame_equal(res[name], expected[name])
+        pd.testing.assert_frame_equal(res["frame"], df)
+        self.assertAlmostEqual(res["mkt"], expected["mkt"])
+        self.assertGreater(res["time_out_of_range"]["time_out"].max(), pd.Timedelta(0))
+
+        # Файл-пример, перевёрнутый по времени, — как в пакетном анализе (там сортировка явная)
+        raw = pd.read_excel(os.path.join(EXAMPLE_DIR, "TemperatureHumidity.xlsx"), header=None, skiprows=1)
+        frame = normalize_logger_frame(raw.iloc[::-1])
+        acc = LoggerAccumulator(limits, keep_rows=len(frame))
+        acc.update(frame)
+        res = acc.finish()
+        work = frame.sort_values("time", kind="stable").reset_index(drop=True)
+        pd.testing.assert_frame_equal(res["time_out_of_range"], time_out_of_range(work, limits), check_dtype=False)
+        self.assertEqual(len(res["events"]), len(excursion_events(work, limits)))
+
+        # Больше keep_rows строк не в порядке времени — отказ, а не молча неверные числа
+        acc = LoggerAccumulator(limits, keep_rows=1000)
+        with self.assertRaises(ValueError):
+            for start in range(0, len(df), 400):
+                acc.update(reversed_df.iloc[start:start + 400].reset_index(drop=True))
+
+    def test_csv_chunks(self):
+        """CSV с `;` и десятичной запятой читается частями"""
+        data = self.df.to_csv(index=False, sep=";", decimal=",").encode("cp1250")
+        chunks = list(iter_table_chunks(data, name="logger.csv", chunk_rows=400))
+        self.assertEqual([len(c) for c in chunks], [400, 400, 400, 300])
+        out = pd.concat([normalize_logger_frame(c) for c in chunks], ignore_index=True)
+        pd.testing.assert_frame_equal(out, self.df)
+
+
+class TestCapability(unittest.TestCase):
+
+    def test_matches_textbook_formulas(self):
+        """Cp/Cpk по MR̄/d2 (как у I-MR), Pp/Ppk/Cpm по выборочному σ"""
+        rng = np.random.default_rng(21)
+        x = rng.normal(100.5, 1.5, 60)
+        row = capability_indices(x, 95, 105, 100).iloc[0]
+        sw, so, m = compute_imr(x).sigma, x.std(ddof=1), x.mean()
+        self.assertAlmostEqual(row["Cp"], 10 / (6 * sw))
+        self.assertAlmostEqual(row["Cpk"], min(105 - m, m - 95) / (3 * sw))
+        self.assertAlmostEqual(row["Ppk"], min(105 - m, m - 95) / (3 * so))
+        self.assertAlmostEqual(row["Cpm"], 10 / (6 * np.sqrt(so ** 2 + (m - 100) ** 2)))
+        from scipy.stats import norm
+        self.assertAlmostEqual(row["ppm_above"], norm.sf(105, m, so) * 1e6, places=6)
+
+    def test_columns_with_gaps_and_one_sided_specs(self):
+        """2-D расчёт с NaN и границами по столбцам = расчёт по каждому столбцу отдельно"""
+        rng = np.random.default_rng(22)
+        df = pd.DataFrame(rng.normal(50, 2, (40, 6)), columns=list("abcdef"))
+        df.iloc[::7, 2] = np.nan
+        df.iloc[30:, 4] = np.nan
+        lsl = {"a": 44, "b": 45, "c": 44, "d": 40, "e": 44}
+        table = capability_table(df, lsl, 56)
+        for col in df.columns:
+            single = capability_indices(df[col].dropna().to_numpy(), lsl.get(col), 56).iloc[0]
+            pd.testing.assert_series_equal(table.loc[col], single, check_names=False)
+        self.assertTrue(np.isnan(table.loc["f", "Cp"]))
+        self.assertAlmostEqual(table.loc["f", "Cpk"], table.loc["f", "Cpu"])
+
+
+    def test_bootstrap_intervals(self):
+        """Интервалы накрывают оценку, воспроизводимы по seed и не зависят от разбиения на части"""
+        import utils.capability as capability
+        x = np.random.default_rng(23).normal(100, 1, 400)
+        ci = bootstrap_capability(x, 96, 104, n_boot=3000, seed=5)
+        point = capability_indices(x, 96, 104).iloc[0]
+        for k in ("Cp", "Cpk", "Pp", "Ppk"):
+            self.assertAlmostEqual(ci.at[k, "estimate"], point[k])
+            self.assertLess(ci.at[k, "pct_lower"], ci.at[k, "estimate"])
+            self.assertLess(ci.at[k, "bca_lower"], ci.at[k, "bca_upper"])
+        # Pp ≥ Ppk в каждой выборке -> нижняя граница Pp не ниже, чем у Ppk
+        self.assertGreaterEqual(ci.at["Pp", "pct_lower"], ci.at["Ppk", "pct_lower"])
+        pd.testing.assert_frame_equal(ci, bootstrap_capability(x, 96, 104, n_boot=3000, seed=5))
+
+        old = capability.BOOTSTRAP_CHUNK_ELEMENTS
+        capability.BOOTSTRAP_CHUNK_ELEMENTS = 400 * 7
+        try:
+            chunked = bootstrap_capability(x, 96, 104, n_boot=3000, seed=5)
+        finally:
+            capability.BOOTSTRAP_CHUNK_ELEMENTS = old
+        self.assertEqual(chunked.shape, ci.shape)
+        self.assertAlmostEqual(chunked.at["Cpk", "se"], ci.at["Cpk", "se"], delta=0.01)
+
+    def test_grouped_jackknife(self):
+        """Группы джекнайфа покрывают все точки; при малом n это джекнайф без одной точки"""
+        from utils.capability import _acceleration, _index_matrix, _jackknife
+
+        rng = np.random.default_rng(24)
+        x = rng.gamma(2.0, 1.0, 60) + 98
+        loo = np.column_stack([_index_matrix(np.delete(x, i)[:, None], 96, 104)[:, 0] for i in range(len(x))])
+        jack = _jackknife(x, 96, 104)
+        np.testing.assert_allclose(jack, loo)
+        for i in range(4):
+            dev = loo[i].mean() - loo[i]
+            self.assertAlmostEqual(_acceleration(jack[i]), (dev ** 3).sum() / (6 * (dev ** 2).sum() ** 1.5))
+
+        # n = 1500, 1000 групп по 1–2 точки: хвост ряда тоже выпадает
+        x = rng.normal(100, 1, 1500)
+        groups = np.array_split(np.arange(len(x)), 1000)
+        expected = np.column_stack([_index_matrix(np.delete(x, g)[:, None], 96, 104)[:, 0] for g in groups])
+        np.testing.assert_allclose(_jackknife(x, 96, 104), expected)
+
+
+    def test_percentile_method_with_fitted_distribution(self):
+        """Скошенные данные: выбирается не нормальное; нормальная подгонка даёт классические Pp/Ppk"""
+        x = np.random.default_rng(24).lognormal(0, 0.5, 300) + 10
+        FIT_CACHE.clear()
+        fits = fit_distributions(x)
+        self.assertIs(fit_distributions(x), fits)             # повторный вызов — из кэша
+        self.assertNotEqual(select_fit(fits, "aic").name, "normal")
+        self.assertNotEqual(select_fit(fits, "ad").name, "normal")
+
+        normal = next(f for f in fits if f.name == "normal")
+        pc = percentile_capability(normal, 9, 16)
+        sigma = x.std()                                       # MLE σ (ddof=0)
+        self.assertAlmostEqual(pc["Pp"], 7 / (6 * sigma), places=4)
+        self.assertAlmostEqual(pc["Ppk"], min(16 - x.mean(), x.mean() - 9) / (3 * sigma), places=4)
+        self.assertTrue(np.isnan(percentile_capability(normal, None, 16)["Pp"]))
+
+
+class TestDescribeBatch(unittest.TestCase):
+
+    def test_matches_pandas_and_scipy(self):
+        """Пакетный расчёт совпадает с describe() и scipy skew/kurtosis"""
+        from scipy.stats import kurtosis, skew
+        rng = np.random.default_rng(4)
+        arr = rng.normal(5, 2, (120, 4))
+        arr[rng.random(arr.shape) < 0.25] = np.nan
+        df = pd.DataFrame(arr, columns=list("abcd"))
+        res = describe_batch(df)
+        expected = df.describe()
+        np.testing.assert_allclose(res.loc[expected.index].to_numpy(), expected.to_numpy())
+        for col in df:
+            data = df[col].dropna()
+            self.assertAlmostEqual(res.loc["skewness", col], skew(data))
+            self.assertAlmostEqual(res.loc["kurtosis", col], kurtosis(data))
+
+    def test_constant_columns(self):
+        """Постоянные дробные столбцы: std = 0, асимметрия и эксцесс — NaN, а не шум округления"""
+        df = pd.DataFrame({c: np.full(37, c) for c in (0.1, 1.23, 99.7)})
+        res = describe_batch(df)
+        np.testing.assert_allclose(res.loc["std"], 0.0, atol=1e-12)
+        self.assertTrue(res.loc[["skewness", "kurtosis"]].isna().all().all())
+
+
+class TestAnalysisFunctions(unittest.TestCase):
+
+    def test_stability_example(self):
+        """Регрессия по каждой серии примера стабильности"""
+        df = pd.read_excel(os.path.join(EXAMPLE_DIR, "StabExample.xlsx"))
+        res = stability_analysis(df)
+        self.assertEqual(res.summary["parameter"], "Assay")
+        self.assertEqual(len(res.tables["regression"]), df.shape[1] - 4)
+        self.assertIn(res.summary["ich_q1e"]["model"], ("separate", "common_slope", "pooled"))
+
+    def test_imr_default_column(self):
+        """Без указания столбца берётся второй, первый — идентификатор"""
+        df = pd.DataFrame({"id": list("abcdef"), "v": [1.0, 2.0, 1.5, None, 1.8, 1.2]})
+        res = imr_analysis(df)
+        self.assertEqual(res.summary["n"], 5)
+        self.assertEqual(list(res.tables["imr_points"]["id"]), list("abcef"))
+
+
+class TestStability(unittest.TestCase):
+
+    def _long_format(self, time, values):
+        rows = [(t, j, v) for i, t in enumerate(time) for j, v in enumerate(values[i]) if not np.isnan(v)]
+        t, b, y = (np.array(c, dtype=float) for c in zip(*rows))
+        return t, b.astype(int), y
+
+    def test_poolability_matches_ancova(self):
+        """p-значения тестов объединения совпадают с ANCOVA через lstsq"""
+        from scipy.stats import f as f_dist
+        rng = np.random.default_rng(5)
+        time = np.array([0, 3, 6, 9, 12, 18, 24.0])
+        values = np.column_stack([100 - s * time + rng.normal(0, 0.4, 7) for s in (0.10, 0.15, 0.30)])
+        values[5:, 2] = np.nan
+        res = fit_stability(time, values, lower=95)
+
+        t, b, y = self._long_format(time, values)
+        D = np.eye(3)[b]
+
+        def sse(X):
+            beta = np.linalg.lstsq(X, y, rcond=None)[0]
+            return ((y - X @ beta) ** 2).sum()
+
+        sse_full = sse(np.hstack([D, D * t[:, None]]))
+        sse_cs = sse(np.hstack([D, t[:, None]]))
+        F = ((sse_cs - sse_full) / 2) / (sse_full / (len(y) - 6))
+        self.assertAlmostEqual(res.p_slopes[0], f_dist.sf(F, 2, len(y) - 6))
+        if res.p_slopes[0] <= 0.25:
+            self.assertEqual(res.model[0], "separate")
+
+    def test_shelf_life_crossing(self):
+        """Срок годности — точка, где нижняя 95% граница равна Min"""
+        time = np.array([0, 3, 6, 9, 12, 18, 24.0])
+        values = (100 - 0.2 * time + np.array([0.3, -0.2, 0.1, -0.3, 0.2, 0.0, -0.1]))[:, None]
+        res = fit_stability(time, values, lower=95)
+        life = res.shelf_life[0]
+        _, low, _ = res.curves(np.array([life]))
+        self.assertAlmostEqual(low[0, 0], 95, places=6)
+        self.assertEqual(res.model[0], "pooled")
+
+    def test_portfolio_matches_single(self):
+        """Пакетный расчёт нескольких исследований разного размера = расчёт по одному"""
+        rng = np.random.default_rng(2)
+        studies = []
+        for k, n in ((3, 7), (2, 5), (4, 9)):
+            time = np.arange(n) * 3.0
+            studies.append((time, 100 - 0.25 * time[:, None] + rng.normal(0, 0.5, (n, k))))
+        T, V = stack_studies(studies)
+        batch = fit_stability(T, V, lower=95, horizon=100)
+        for i, (time, values) in enumerate(studies):
+            single = fit_stability(time, values, lower=95, horizon=100)
+            self.assertEqual(batch.model[i], single.model[0])
+            self.assertAlmostEqual(batch.shelf_life[i], single.shelf_life[0])
+
+    def test_no_batches(self):
+        """Пустой выбор серий — понятная ошибка, а не сбой редукции numpy"""
+        with self.assertRaisesRegex(ValueError, "at least one batch"):
+            fit_stability(np.arange(5.0), np.empty((5, 0)))
+
+    def test_batch_linregress_matches_scipy(self):
+        """batch_linregress по столбцам с пропусками = scipy.linregress по каждому столбцу"""
+        from scipy.stats import linregress
+        rng = np.random.default_rng(3)
+        time = np.array([0, 3, 6, 9, 12, 18, 24, 36.0])
+        Y = pd.DataFrame(1000 - 0.3 * time[:, None] + rng.normal(0, 0.5, (8, 5)), columns=list("ABCDE"))
+        Y.iloc[5:, 1] = np.nan
+        Y.iloc[[0, 2, 4, 6], 3] = np.nan
+        Y.iloc[1:, 4] = np.nan
+        Y["F"] = 99.5                                   # постоянный y: r и p — NaN, как в scipy
+        Y["G"] = np.where(np.arange(8) < 2, 99.5, np.nan)
+        reg = batch_linregress(time, Y)
+        self.assertEqual(list(reg.index), list("ABCDEFG"))
+        self.assertTrue(reg.loc["F", ["rvalue", "pvalue"]].isna().all())
+        self.assertTrue(reg.loc["E"].drop("n").isna().all())
+        for col in "ABCDFG":
+            ok = Y[col].notna().to_numpy()
+            ref = linregress(time[ok], Y[col][ok])
+            np.testing.assert_allclose(
+                reg.loc[col, ["slope", "intercept", "rvalue", "pvalue", "stderr"]].to_numpy(dtype=float),
+                [ref.slope, ref.intercept, ref.rvalue, ref.pvalue, ref.stderr], rtol=1e-9,
+            )
+
+
+class TestDecimation(unittest.TestCase):
+
+    def test_envelope_preserved(self):
+        """Не больше MAX_POINTS точек; глобальные и локальные экстремумы на месте"""
+        rng = np.random.default_rng(6)
+        y = rng.normal(0, 1, 100_000)
+        y[31_337], y[77_000] = 25.0, -25.0
+        time = pd.date_range("2024-01-01", periods=y.size, freq="min")
+        xs, ys = decimate(time, y)
+        self.assertLessEqual(len(ys), MAX_POINTS)
+        self.assertEqual((ys.max(), ys.min()), (25.0, -25.0))
+        self.assertEqual((xs[0], xs[-1]), (time[0].to_datetime64(), time[-1].to_datetime64()))
+        # Максимум каждого куска из 1000 точек попадает в выборку
+        idx = decimate_indices(None, y)
+        for block in np.array_split(np.arange(y.size), 100):
+            self.assertIn(block[np.argmax(y[block])], set(idx.tolist()))
+
+    def test_short_series_and_keep(self):
+        """Короткий ряд не меняется; точки из keep остаются всегда"""
+        np.testing.assert_array_equal(decimate_indices(None, np.arange(10.0)), np.arange(10))
+        y = np.sin(np.arange(50_000) / 50)
+        keep = np.zeros(y.size, dtype=bool)
+        keep[[101, 20_202]] = True
+        idx = decimate_indices(None, y, keep=keep)
+        self.assertTrue({101, 20_202} <= set(idx.tolist()))
+
+
+class TestKde(unittest.TestCase):
+
+    def test_matches_gaussian_kde(self):
+        """Бинированная БПФ-оценка совпадает с прямой суммой scipy (окно Скотта)"""
+        from scipy.stats import gaussian_kde
+        rng = np.random.default_rng(31)
+        x = np.r_[rng.normal(0, 1, 3000), rng.gamma(2, 1, 2000) + 4, [np.nan]]
+        grid, density = kde(x)
+        ref = gaussian_kde(x[~np.isnan(x)])(grid)
+        self.assertLess(np.abs(density - ref).max(), 1e-3 * ref.max())
+        self.assertAlmostEqual(float(np.sum(density) * (grid[1] - grid[0])), 1.0, places=3)
+        self.assertLess(bandwidth(x[~np.isnan(x)], "silverman"), bandwidth(x[~np.isnan(x)], "scott"))
+
+        # Длинный хвост (логнормальное): диапазон во много раз шире окна, сетка сгущается
+        y = rng.lognormal(0, 1, 30_000)
+        for bw in ("scott", "silverman"):
+            h = bandwidth(y, bw)
+            grid, density = kde(y, bw)
+            self.assertGreater(grid.size, 512)
+            self.assertLessEqual(grid[1] - grid[0], h / 8)
+            points = grid[::max(1, grid.size // 400)]
+            ref = gaussian_kde(y, bw_method=h / y.std(ddof=1))(points)
+            self.assertLess(np.abs(density[::max(1, grid.size // 400)] - ref).max(), 1e-3 * ref.max())
+
+    def test_degenerate_input(self):
+        for values in ([], [1.0], [2.0, 2.0, 2.0]):
+            grid, density = kde(values)
+            self.assertEqual(grid.size, 0)
+            self.assertEqual(density.size, 0)
+
+
+class TestImR(unittest.TestCase):
+
+    def test_limits(self):
+        """CL = среднее, UCL/LCL = CL ± 2.66·MR̄, UCL(MR) = 3.267·MR̄"""
+        x = [10.0, 12.0, 11.0, 13.0, 12.0]
+        res = compute_imr(x)
+        mr_bar = np.mean([2, 1, 2, 1])
+        self.assertAlmostEqual(res.i_cl, 11.6)
+        self.assertAlmostEqual(res.i_ucl, 11.6 + 3 * mr_bar / 1.128)
+        self.assertAlmostEqual(res.mr_ucl, 3.267 * mr_bar)
+        self.assertEqual(len(res.data(1)), 4)
+
+    def test_rules(self):
+        """Выброс — правило 1, девять точек по одну сторону — правило 2"""
+        rng = np.random.default_rng(1)
+        x = rng.normal(0, 1, 60)
+        x[30] = 15
+        res = compute_imr(x)
+        self.assertTrue(res.violations[30, 0])
+        self.assertFalse(res.stable())
+
+        x = np.r_[np.tile([1.0, -1.0], 10), np.full(9, 0.5)]
+        res = compute_imr(x)
+        self.assertEqual(np.flatnonzero(res.violations[:, 1]).tolist(), [len(x) - 1])
+
+    def test_rule_subset_and_indices(self):
+        """Матрица нарушений: неактивные правила пусты, индексы и счётчики согласованы"""
+        x = np.r_[np.zeros(10), 1, 2, 3, 4, 5, 6]
+        viol = evaluate_rules(x, cl=0.0, sigma=1.0, rules=[1, 3])
+        self.assertEqual(viol.matrix.shape, (16, 8))
+        self.assertFalse(viol.matrix[:, [1, 3, 4, 5, 6, 7]].any())
+        self.assertEqual(viol.indices(3).tolist(), [14, 15])
+        self.assertEqual(viol.counts(), {1: 3, 3: 2})
+        self.assertEqual(viol.fired(15), [1, 3])
+
+    def test_constant_series_shapiro(self):
+        """Постоянный ряд: p-значение Шапиро–Уилка — NaN, без предупреждений scipy"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            res = compute_imr(np.full(10, 5.0))
+            self.assertTrue(np.isnan(res.shapiro_pvalue()))
+
+
+class TestImRColumns(unittest.TestCase):
+
+    def test_all_columns_match_single(self):
+        """Параллельный расчёт по столбцам = compute_imr по каждому столбцу отдельно"""
+        rng = np.random.default_rng(8)
+        df = pd.DataFrame({f"A{j}": rng.normal(100, 1, 80) for j in range(12)})
+        df.insert(0, "id", [f"B{i}" for i in range(80)])
+        df.loc[[3, 9], "A4"] = np.nan
+        df["text"] = "n/a"
+        self.assertEqual(numeric_columns(df), [f"A{j}" for j in range(12)])
+
+        charts = compute_imr_columns(df, max_workers=4)
+        table = imr_summary_table(charts)
+        self.assertEqual(list(table["column"]), [f"A{j}" for j in range(12)])
+        for row in table.itertuples():
+            single = compute_imr(df[row.column].dropna())
+            self.assertEqual(row.n, single.n)
+            self.assertAlmostEqual(row.UCL, single.i_ucl)
+            self.assertEqual(row.stable, single.stable())
+            self.assertEqual([getattr(row, f"rule_{r}") for r in range(1, 9)], list(single.rules.counts().values()))
+
+
+class TestXbar(unittest.TestCase):
+
+    def test_textbook_limits(self):
+        """Равные подгруппы: X̄ ± A2·R̄, D4·R̄ и X̄ ± A3·S̄, B4·S̄ по табличным константам"""
+        rng = np.random.default_rng(11)
+        block = rng.normal(100, 1, (200, 5))
+        labels = np.repeat([f"T{i}" for i in range(200)], 5)
+        r_bar = np.ptp(block, axis=1).mean()
+        s_bar = block.std(axis=1, ddof=1).mean()
+        xr = compute_xbar(block.ravel(), labels, kind="R")
+        self.assertAlmostEqual(xr.center, block.mean())
+        self.assertAlmostEqual(xr.x_ucl[0], block.mean() + 0.577 * r_bar, places=2)
+        self.assertAlmostEqual(xr.spread_ucl[0], 2.114 * r_bar, places=2)
+        xs = compute_xbar(block.ravel(), size=5, kind="S")
+        self.assertAlmostEqual(xs.x_ucl[0], block.mean() + 1.427 * s_bar, places=3)
+        self.assertAlmostEqual(xs.spread_ucl[0], 2.089 * s_bar, places=3)
+        self.assertEqual(list(xs.constants().index), ["c4", "A3", "B3", "B4"])
+
+    def test_unordered_unequal_subgroups(self):
+        """Перемешанные подгруппы разного размера = groupby по меткам"""
+        rng = np.random.default_rng(12)
+        x = rng.normal(10, 2, 600)
+        labels = rng.integers(0, 100, 600).astype(str)
+        x[::37] = np.nan
+        stats = subgroup_stats(x, labels)
+        ref = pd.DataFrame({"x": x, "g": labels}).dropna().groupby("g", sort=False)["x"]
+        ref = ref.agg(["size", "mean", "std", "max", "min"]).reindex(stats.labels)
+        np.testing.assert_array_equal(stats.size, ref["size"])
+        np.testing.assert_allclose(stats.mean, ref["mean"])
+        np.testing.assert_allclose(stats.std, ref["std"])
+        np.testing.assert_allclose(stats.range, ref["max"] - ref["min"])
+
+        chart = compute_xbar(x, labels, kind="S")
+        self.assertFalse(chart.equal_sizes)
+        self.assertIsNone(chart.constants())
+        # Пределы X̄ сужаются с ростом n подгруппы
+        order = np.argsort(chart.stats.size)
+        self.assertTrue((np.diff(chart.x_ucl[order]) <= 1e-12).all())
+
+
+class TestEwmaCusum(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(13)
+        self.x = np.r_[rng.normal(0, 1, 150), rng.normal(1, 1, 50)]
+
+    def test_ewma_matches_recursion(self):
+        """lfilter = прямая рекурсия z_t = λx_t + (1−λ)z_{t−1}"""
+        chart = compute_ewma(self.x, lam=0.1, L=2.7, target=0.0, sigma=1.0)
+        z, expected = 0.0, []
+        for v in self.x:
+            z = 0.1 * v + 0.9 * z
+            expected.append(z)
+        np.testing.assert_allclose(chart.ewma, expected)
+        self.assertAlmostEqual(chart.ucl[-1], 2.7 * np.sqrt(0.1 / 1.9), places=6)
+        self.assertTrue(chart.signals[150:].any())
+
+    def test_cusum_matches_tabular(self):
+        """Замкнутая форма Линдли = табличный CUSUM с циклом, включая N+ и N−"""
+        chart = compute_cusum(self.x, k=0.5, h=4.0, target=0.0, sigma=1.0)
+        cp = cm = 0.0
+        np_ = nm = 0
+        rows = []
+        for v in self.x:
+            cp, cm = max(0.0, cp + v - 0.5), max(0.0, cm - 0.5 - v)
+            np_, nm = (np_ + 1 if cp > 0 else 0), (nm + 1 if cm > 0 else 0)
+            rows.append((cp, cm, np_, nm))
+        rows = np.array(rows)
+        np.testing.assert_allclose(chart.upper, rows[:, 0], atol=1e-12)
+        np.testing.assert_allclose(chart.lower, rows[:, 1], atol=1e-12)
+        np.testing.assert_array_equal(chart.n_upper, rows[:, 2])
+        np.testing.assert_array_equal(chart.n_lower, rows[:, 3])
+        np.testing.assert_array_equal(chart.signals, (rows[:, 0] > 4) | (rows[:, 1] > 4))
+
+
+class TestImRMonitor(unittest.TestCase):
+
+    def test_incremental_matches_batch(self):
+        """Потоковая проверка совпадает с пакетной при тех же замороженных пределах"""
+        rng = np.random.default_rng(2)
+        x = np.r_[rng.normal(0, 1, 50), rng.normal(1.5, 1, 40)]
+        mon = ImRMonitor.from_baseline(x[:50])
+        mon.extend(x[50:])
+        batch = evaluate_rules(x, mon.cl, mon.sigma)
+        expected = [i for i in range(50, len(x)) if batch.fired(i)]
+        got = [a["index"] for a in mon.alarms if a["rules"] != ["MR"]]
+        self.assertEqual(got, expected)
+
+    def test_save_and_resume(self):
+        """Состояние сохраняется на диск и продолжает работу с того же места"""
+        import tempfile
+        rng = np.random.default_rng(3)
+        x = rng.normal(0, 1, 40)
+        mon = ImRMonitor.from_baseline(x[:30])
+        mon.extend(x[30:35])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "state.json")
+            mon.save(path)
+            resumed = ImRMonitor.load(path)
+        self.assertEqual(resumed.n, 35)
+        self.assertEqual(list(resumed.buffer), list(mon.buffer))
+        self.assertEqual(resumed.extend(x[35:]), mon.extend(x[35:]))
+
+    def test_ingest_once_per_content(self):
+        """Повторный показ того же ряда ничего не дописывает, тревоги последнего приёма сохраняются"""
+        import tempfile
+        from utils.spc.monitor import find_monitor, monitor_path
+
+        rng = np.random.default_rng(5)
+        x = np.r_[rng.normal(0, 1, 30), [6.0, 0.1, 0.2]]
+        mon = ImRMonitor.from_baseline(x[:30])
+        self.assertTrue(mon.ingest(x[:31]))
+        self.assertEqual([a["index"] for a in mon.new_alarms], [30])
+        self.assertFalse(mon.ingest(x[:31]))
+        self.assertEqual(len(mon.new_alarms), 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = monitor_path("Wynik", mon.baseline_hash, directory=tmp)
+            mon.save(path)
+            ImRMonitor.from_baseline(rng.normal(0, 1, 30)).save(
+                monitor_path("Wynik", "other", directory=tmp))
+            self.assertEqual(find_monitor(x, "Wynik", directory=tmp), path)
+            self.assertIsNone(find_monitor(x, "Inny", directory=tmp))
+            self.assertIsNone(find_monitor(x[::-1], "Wynik", directory=tmp))
+            resumed = ImRMonitor.load(path)
+        self.assertEqual(len(resumed.new_alarms), 1)
+        self.assertFalse(resumed.ingest(x[:31]))
+        self.assertTrue(resumed.ingest(x))
+        self.assertEqual(resumed.n, len(x))
+        self.assertEqual(resumed.new_alarms, resumed.alarms[1:])
+
+    def test_edited_history_rejected(self):
+        """Исправленная задним числом точка не принимается молча: состояние не меняется"""
+        rng = np.random.default_rng(6)
+        x = rng.normal(0, 1, 40)
+        mon = ImRMonitor.from_baseline(x[:30])
+        mon.ingest(x[:35])
+        edited = x.copy()
+        edited[32] += 0.5
+        self.assertFalse(mon.matches(edited))
+        state = mon.to_dict()
+        with self.assertRaises(ValueError):
+            mon.ingest(edited)
+        self.assertEqual(mon.to_dict(), state)
+        edited = x.copy()
+        edited[3] = 7.0                                 # правка в базовом периоде
+        self.assertFalse(mon.matches(edited))
+        self.assertTrue(mon.matches(x))
+        self.assertTrue(mon.ingest(x))
+        self.assertEqual(mon.n, 40)
+
+
+if __name__ == "__main__":
+    unittest.main()